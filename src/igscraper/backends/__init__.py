@@ -1,5 +1,12 @@
 from .base_backend import Backend
-from .selenium_backend import SeleniumBackend
 
-# This makes the classes available for import from the 'backends' package
-__all__ = ["Backend", "SeleniumBackend"]
\ No newline at end of file
+# This makes the classes available for import from the 'backends' package.
+# SeleniumBackend is imported on first access, so importing the package does
+# not pull in selenium.
+__all__ = ["Backend", "SeleniumBackend"]
+
+def __getattr__(name):
+    if name == "SeleniumBackend":
+        from .selenium_backend import SeleniumBackend
+        return SeleniumBackend
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
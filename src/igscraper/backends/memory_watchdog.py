@@ -0,0 +1,87 @@
+from typing import Optional
+
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+MB = 1024 * 1024
+
+def browser_rss_mb(driver) -> Optional[float]:
+    """
+    Returns the resident memory (MB) of all browser processes started by the driver.
+
+    Sums the RSS of every process below the chromedriver service process
+    (the browser, its renderers, GPU and utility processes). Returns None if
+    psutil is not installed or the process tree cannot be read.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        service_process = psutil.Process(driver.service.process.pid)
+        total = 0
+        for child in service_process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / MB
+    except (AttributeError, psutil.Error):
+        return None
+
+def js_heap_mb(driver) -> Optional[float]:
+    """Returns the used JS heap (MB) of the driver's current tab, via CDP `Performance.getMetrics`."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+    except Exception as e:
+        logger.debug(f"Could not read performance metrics: {e}")
+        return None
+    heap = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), None)
+    return None if heap is None else heap / MB
+
+class MemoryWatchdog:
+    """
+    Decides when the browser has grown too large and should be restarted.
+
+    The total RSS of the browser processes is used when psutil is available.
+    Without it, the JS heap of the current tab (the profile page, which grows
+    with every scroll) is compared against `js_heap_limit_mb` instead.
+    """
+    def __init__(self, rss_limit_mb: int = 0, js_heap_limit_mb: int = 0):
+        """
+        Initializes the MemoryWatchdog.
+
+        Args:
+            rss_limit_mb: Browser RSS (MB) above which a restart is needed. 0 disables the check.
+            js_heap_limit_mb: JS heap (MB) of the current tab above which a restart is needed,
+                              used when RSS cannot be measured. 0 disables the check.
+        """
+        self.rss_limit_mb = rss_limit_mb
+        self.js_heap_limit_mb = js_heap_limit_mb
+        self._warned_no_rss = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rss_limit_mb or self.js_heap_limit_mb)
+
+    def over_limit(self, driver) -> bool:
+        """Samples the browser memory and returns True if a threshold is crossed."""
+        if self.rss_limit_mb:
+            rss = browser_rss_mb(driver)
+            if rss is not None:
+                logger.debug(f"Browser RSS: {rss:.0f} MB")
+                if rss > self.rss_limit_mb:
+                    logger.warning(f"Browser RSS {rss:.0f} MB exceeds {self.rss_limit_mb} MB.")
+                    return True
+                return False
+            if not self._warned_no_rss:
+                logger.warning("Cannot measure browser RSS (is psutil installed?); using the JS heap instead.")
+                self._warned_no_rss = True
+        if self.js_heap_limit_mb:
+            heap = js_heap_mb(driver)
+            if heap is not None and heap > self.js_heap_limit_mb:
+                logger.warning(f"JS heap {heap:.0f} MB exceeds {self.js_heap_limit_mb} MB.")
+                return True
+        return False
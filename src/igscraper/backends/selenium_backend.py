@@ -2,9 +2,10 @@ import os
 import sys
 import time
 import json
-import pickle
 import random
 import traceback
+from collections import defaultdict
+from itertools import islice
 from typing import Iterator, Dict, List, Any
 
 from selenium import webdriver
@@ -13,15 +14,28 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from .base_backend import Backend
+from .tab_pool import TabPool
+from .memory_watchdog import MemoryWatchdog
 from ..pages.profile_page import ProfilePage
 from ..logger import get_logger
-
-from src.igscraper.chrome import patch_driver
+from ..metrics import metrics, timer
+from ..progress import RunProgress
+from ..roundtrips import RoundTripProfiler
+from ..config import resolve_log_dir
+
+from src.igscraper.chrome import patch_driver, enable_cdp_event_log, blocked_url_patterns, apply_resource_policy, CdpEventLog, resolve_chromedriver
+from src.igscraper.network_capture import (
+    NetworkCapture,
+    comments_have_more_pages,
+    parse_comments_from_payloads,
+    parse_media_from_payloads,
+)
+from src.igscraper.urls import ShortcodeSet, filter_new_posts, post_shortcode
+from src.igscraper.cookies import load_cookies, CookieStoreError
+from src.igscraper.stats import load_cached_urls, load_processed_urls
 from src.igscraper.utils import (
     human_mouse_move,
     images_from_post,
@@ -31,12 +45,69 @@ from src.igscraper.utils import (
     save_scrape_results,
     clear_tmp_file,
     random_delay,
-    scrape_carousel_images
+    scrape_carousel_images,
+    wait_for_post_ready,
+    timing_histogram
 )
 
 
 logger = get_logger(__name__)
 
+# Finds the innermost div holding both the author link (arguments[0], e.g. "/natgeo/")
+# and a <time> element, and returns its data plus the texts of its siblings.
+POST_TITLE_JS = """
+    function getPostTitleData(variableA) {
+        const divs = Array.from(document.querySelectorAll('div'));
+        let innermostDiv = null;
+
+        for (const div of divs) {
+            const aEl = div.querySelector(`a[href="${variableA}"]`);
+            const timeEl = div.querySelector('time');
+
+            if (aEl && timeEl) {
+                const childDivs = div.querySelectorAll('div');
+                let hasNestedBoth = false;
+
+                for (const child of childDivs) {
+                    if (child.querySelector(`a[href="${variableA}"]`) && child.querySelector('time')) {
+                        hasNestedBoth = true;
+                        break;
+                    }
+                }
+
+                if (!hasNestedBoth) {
+                    innermostDiv = div;
+                }
+            }
+        }
+
+        if (!innermostDiv) return null;
+
+        const aEl = innermostDiv.querySelector(`a[href="${variableA}"]`);
+        const timeEl = innermostDiv.querySelector('time');
+
+        const data = {
+            topDivClass: innermostDiv.className,
+            aHref: aEl ? aEl.getAttribute('href') : null,
+            aSrc: aEl ? aEl.getAttribute('src') : null,
+            timeDatetime: timeEl ? timeEl.getAttribute('datetime') : null,
+            siblingTexts: []
+        };
+
+        const parent = innermostDiv.parentElement;
+        if (parent) {
+            const siblings = Array.from(parent.children).filter(el => el !== innermostDiv);
+            data.siblingTexts = siblings
+                .map(sib => sib.textContent.trim())
+                .filter(t => t.length > 0);
+        }
+
+        return data;
+    }
+
+    return getPostTitleData(arguments[0]);
+"""
+
 class SeleniumBackend(Backend):
     """
     A backend implementation using Selenium to control a web browser for scraping.
@@ -54,17 +125,44 @@ class SeleniumBackend(Backend):
         self.config = config
         self.driver = None
         self.profile_page = None
-
-    def start(self):
+        self.blocked_url_patterns = []
+        self.cdp_events = None
+        self.network_capture = None
+        self.startup_timings = {}
+        self.cookies = None
+        self.tab_pool = None
+        self.current_profile = None
+        self.roundtrips = None
+        self.restarts = 0
+        self.memory_watchdog = MemoryWatchdog(
+            config.main.memory_limit_mb, config.main.js_heap_limit_mb
+        )
+        self.tab_ready_timings = defaultdict(float)
+        # replaced by the pipeline with a live one when progress is shown
+        self.progress = RunProgress(enabled=False)
+
+    def start(self, reload_cookies: bool = True):
         """
         Starts the Selenium WebDriver, configures it for stealth, and logs in.
 
+        - Validates the cookie file, failing fast if the session has expired.
+          With `reload_cookies=False` the cookies loaded by the previous start
+          are used instead.
         - Sets up Chrome options to evade bot detection.
-        - Initializes the Chrome driver using webdriver-manager.
-        - Patches the driver to monitor for suspicious navigation.
-        - Logs in using cookies specified in the configuration.
+        - Initializes the Chrome driver from the cached chromedriver path,
+          re-resolving it with webdriver-manager only on a Chrome version change.
+        - Installs a navigation guard fed by CDP page events to detect
+          suspicious navigation.
+        - Applies the resource policy (`block_resources`, `block_images`).
+        - Reuses the session of the persistent profile (`user_data_dir`) if it is
+          still valid, otherwise logs in using the configured cookie file.
         - Initializes the ProfilePage object for page interactions.
+        - Creates the pool of reusable post tabs if `tab_pool_size` is set.
         """
+        # Validate the cookie file before spending time on a browser launch
+        if reload_cookies:
+            self.cookies = self._load_cookie_store()
+
         options = Options()
 
         # --- Anti-detection settings from test_sel.py ---
@@ -83,59 +181,181 @@ class SeleniumBackend(Backend):
         if self.config.main.headless:
             options.add_argument("--headless=new")
 
-        # Use WebDriver Manager for automatic driver management
+        # Persistent profile: cookies and cache survive between runs
+        if self.config.main.user_data_dir:
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.config.main.user_data_dir)}")
+
+        # CDP page events feed the navigation guard installed by patch_driver;
+        # network events are only recorded when API responses are captured
+        enable_cdp_event_log(options, network=self.config.main.capture_network)
+
+        # Resource policy: images are blocked browser-wide through a content setting,
+        # other resource types per tab through Network.setBlockedURLs.
+        if self.config.main.block_images:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        self.blocked_url_patterns = blocked_url_patterns(self.config.main.block_resources)
+
+        # Resolve chromedriver from the local cache; webdriver-manager is only
+        # consulted when the installed Chrome version changed
+        started = time.perf_counter()
+        driver_path = resolve_chromedriver(self.config.data.chromedriver_cache, offline=self.config.main.offline_driver)
+        self.startup_timings["resolve_driver"] = time.perf_counter() - started
+        started = time.perf_counter()
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            self.driver = patch_driver(self.driver)
+            if not driver_path:
+                raise RuntimeError("chromedriver could not be resolved")
+            self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
         except Exception as e:
-            logger.error(f"Failed to initialize Chrome driver with webdriver-manager: {e}")
+            logger.error(f"Failed to initialize Chrome driver with resolved chromedriver: {e}")
             logger.info("Falling back to default webdriver initialization.")
             self.driver = webdriver.Chrome(options=options)
-            ## Patch driver to stop the script if detection happens and we are rerouted to a captcha page
-            self.driver = patch_driver(self.driver)
+        self.startup_timings["launch_browser"] = time.perf_counter() - started
+        ## Patch driver to stop the script if detection happens and we are rerouted to a captcha page
+        if self.config.metrics.roundtrips:
+            self._attach_roundtrip_profiler()
+        self.cdp_events = CdpEventLog(self.driver)
+        self.driver = patch_driver(self.driver, self.cdp_events)
+        if self.config.main.capture_network:
+            self.network_capture = NetworkCapture(self.driver, self.cdp_events)
 
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.blocked_url_patterns:
+            apply_resource_policy(self.driver, self.blocked_url_patterns)
+        started = time.perf_counter()
+        self._login()
+        self.startup_timings["login"] = time.perf_counter() - started
+
+        if self.profile_page:
+            # Keep the page object (and any URL generator bound to it) across restarts
+            self.profile_page.attach(self.driver)
+        else:
+            self.profile_page = ProfilePage(self.driver, self.config)
+        if self.config.main.tab_pool_size > 0:
+            self.tab_pool = TabPool(
+                self,
+                self.config.main.tab_pool_size,
+                recycle_after=self.config.main.tab_recycle_after,
+                recycle_heap_mb=self.config.main.tab_recycle_heap_mb,
+            )
+        logger.info(
+            "Browser startup timings (s): "
+            + ", ".join(f"{stage}={seconds:.2f}" for stage, seconds in self.startup_timings.items())
+        )
+
+    def _attach_roundtrip_profiler(self) -> None:
+        """Records the WebDriver commands of the (new) driver, keeping earlier counts across restarts."""
+        if self.roundtrips is None:
+            log_dir = resolve_log_dir(self.config.logging.log_dir, self.config.data.output_dir)
+            self.roundtrips = RoundTripProfiler(log_dir)
+        self.roundtrips.attach(self.driver)
+
+    def _login(self):
+        """
+        Makes sure the browser session is logged in to Instagram.
+
+        With a persistent profile (`user_data_dir`) the existing session is probed
+        first and reused if valid, which skips the cookie file, the extra page
+        loads and the settle delay. Otherwise, or if the probe fails, cookies are
+        loaded from the configured cookie file.
+        """
+        if self.config.main.user_data_dir and self._has_valid_session():
+            logger.info(f"✅ Reusing logged-in session from profile {self.config.main.user_data_dir}.")
+            return
         self._login_with_cookies()
 
-        self.profile_page = ProfilePage(self.driver, self.config)
+    def _has_valid_session(self) -> bool:
+        """
+        Checks for an unexpired Instagram `sessionid` cookie in the browser profile.
+
+        Cookies are read through CDP, so no page has to be loaded for the check.
+        """
+        try:
+            cookies = self.driver.execute_cdp_cmd(
+                "Network.getCookies", {"urls": ["https://www.instagram.com/"]}
+            ).get("cookies", [])
+        except Exception as e:
+            logger.warning(f"Could not read cookies from the browser profile: {e}")
+            return False
+        now = time.time()
+        for cookie in cookies:
+            # Session cookies report expires == -1
+            if cookie.get("name") == "sessionid" and cookie.get("value") and (
+                cookie.get("expires", -1) < 0 or cookie["expires"] > now
+            ):
+                return True
+        return False
+
+    def _load_cookie_store(self):
+        """
+        Loads and validates the cookie file before the browser is started.
+
+        A missing, malformed or expired cookie file ends the program right away,
+        unless a persistent profile (`user_data_dir`) may still hold a session.
+
+        Returns:
+            The list of stored cookies, or None if they could not be loaded.
+        """
+        try:
+            return load_cookies(self.config.data.cookie_file)
+        except CookieStoreError as e:
+            if self.config.main.user_data_dir:
+                logger.warning(f"{e} Relying on the session in {self.config.main.user_data_dir}.")
+                return None
+            logger.error(f"{e} Exiting early.")
+            sys.exit(1)
 
     def _login_with_cookies(self):
         """
-        Loads cookies from a file to authenticate the browser session.
+        Authenticates the browser session with the cookies from the cookie file.
 
-        The browser must first navigate to the domain ('instagram.com') before
-        cookies can be added. The path to the cookie file is read from the
-        configuration. If the file doesn't exist, the program will exit.
+        All cookies are injected with a single CDP `Network.setCookies` call,
+        which works without visiting the domain first. If that fails, the
+        browser navigates to 'instagram.com' and adds them one by one. If no
+        valid cookies were loaded, the program will exit.
         """
-        if not self.config.data.cookie_file or not os.path.exists(self.config.data.cookie_file):
-            logger.info("No cookie file specified in config or cookie file does not exist. Exiting early.")
+        if not self.cookies:
+            logger.error("No valid session in the browser profile and no usable cookie file. Exiting early.")
             sys.exit(1)
 
         logger.info(f"Attempting to log in using cookies from {self.config.data.cookie_file}")
-        self.driver.get("https://www.instagram.com/")  # Must visit domain first
-
         try:
-            with open(self.config.data.cookie_file, "rb") as f:
-                cookies = pickle.load(f)
-        except (pickle.UnpicklingError, EOFError) as e:
-            logger.error(f"Could not load cookies from {self.config.data.cookie_file}. Error: {e}")
-            return
-
-        for cookie in cookies:
-            # Selenium expects 'expiry' to be int if present
-            if 'expiry' in cookie and isinstance(cookie['expiry'], float):
-                cookie['expiry'] = int(cookie['expiry'])
-            self.driver.add_cookie(cookie)
-
-        self.driver.refresh()  # Apply cookies
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [c.to_cdp() for c in self.cookies]})
+        except Exception as e:
+            logger.warning(f"Bulk cookie injection failed, falling back to add_cookie: {e}")
+            self.driver.get("https://www.instagram.com/")  # Must visit domain first
+            for cookie in self.cookies:
+                self.driver.add_cookie(cookie.model_dump(exclude_none=True))
+            self.driver.refresh()  # Apply cookies
         logger.info("✅ Successfully logged in using cookies.")
-        time.sleep(3) # Wait a bit for page to settle
 
     def stop(self):
         """Quits the WebDriver and closes all associated browser windows."""
+        if self.tab_pool:
+            logger.info(
+                f"Tab pool stats: {self.tab_pool.tabs_created} tabs created, "
+                f"{self.tab_pool.tabs_recycled} recycled."
+            )
         if self.driver:
             self.driver.quit()
+            self.driver = None
+
+    def restart(self) -> None:
+        """
+        Quits the browser and starts a new one with the same session.
+
+        The ProfilePage object is kept and bound to the new driver, and the
+        current profile is opened again, so a post URL generator that is still
+        scrolling the profile continues where it left off (already yielded
+        posts are skipped). The cookies loaded at startup are reused, so a
+        cookie file that changed or expired during the run cannot end the
+        program in the middle of a restart.
+        """
+        logger.info("Restarting the browser.")
+        self.stop()
+        self.start(reload_cookies=False)
+        self.restarts += 1
+        if self.current_profile:
+            self.open_profile(self.current_profile)
 
     def open_profile(self, profile_handle: str) -> None:
         """
@@ -144,6 +364,7 @@ class SeleniumBackend(Backend):
         Args:
             profile_handle: The Instagram username of the profile to open.
         """
+        self.current_profile = profile_handle
         self.profile_page.navigate_to_profile(profile_handle)
 
     def _load_cached_urls(self, file_path: str) -> list[str] | None:
@@ -156,12 +377,10 @@ class SeleniumBackend(Backend):
         Returns:
             A list of URL strings if the file is found and loaded, otherwise None.
         """
-        if os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                urls = json.load(f)
+        urls = load_cached_urls(file_path)
+        if urls is not None:
             logger.info(f"Loaded {len(urls)} post URLs from {file_path}.")
-            return urls
-        return None
+        return urls
 
     def _save_urls(self, profile: str, urls: list[str], file_path: str) -> None:
         """
@@ -177,67 +396,136 @@ class SeleniumBackend(Backend):
             json.dump(urls, f, ensure_ascii=False, indent=2)
         logger.info(f"Saved {len(urls)} post URLs to {file_path}.")
 
-    def _load_processed_urls(self, file_path: str) -> set[str]:
+    def _refresh_cached_urls(self, profile: str, cached: list[str], limit: int, file_path: str) -> list[str]:
+        """
+        Collects posts newer than the cached ones and prepends them to the cache.
+
+        The profile grid is ordered newest first, so scrolling stops as soon as a
+        shortcode that is already in the cache shows up.
+
+        Args:
+            profile: The target profile name (used for logging).
+            cached: The URLs currently stored in the cache file.
+            limit: The maximum number of new post URLs to collect.
+            file_path: The path of the cache file to update.
+
+        Returns:
+            The refreshed list of URLs, newest first.
+        """
+        known = ShortcodeSet(cached)
+        collected = self.profile_page.scroll_and_collect_(limit, stop_at=known)
+        new_urls = [u for u in collected if u not in known]
+        logger.info(f"Incremental refresh found {len(new_urls)} new post URLs for {profile}.")
+        if not new_urls:
+            return cached
+        urls = new_urls + cached
+        self._save_urls(profile, urls, file_path)
+        return urls
+
+    def _load_processed_urls(self, file_path: str) -> ShortcodeSet:
         """
         Loads URLs of already scraped posts from the output metadata file.
 
         This is used to avoid re-scraping posts that have already been processed
-        in previous runs.
+        in previous runs. Posts are keyed by shortcode, so any URL variant of a
+        processed post is recognised.
 
         Args:
             file_path: The path to the JSONL metadata output file.
 
         Returns:
-            A set of post URL strings that have already been processed.
+            A ShortcodeSet of the posts that have already been processed.
         """
-        processed = set()
-        if os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        record = json.loads(line)
-                        if "post_url" in record:
-                            processed.add(record["post_url"])
-                    except json.JSONDecodeError:
-                        continue
+        processed = load_processed_urls(file_path)
+        if processed:
             logger.info(f"Loaded {len(processed)} processed post URLs from {file_path}.")
         return processed
 
-    def get_post_elements(self, limit: int) -> Iterator[Any]:
+    def _collect_and_cache_urls(self, profile: str, limit: int, file_path: str, processed: ShortcodeSet) -> Iterator[str]:
         """
-        Retrieves a list of post URLs to be scraped for a given profile.
+        Scrolls the profile grid and yields unprocessed post URLs as they are found.
+
+        Every collected URL, processed or not, is written to the cache file once
+        the scroll has finished, so the next run can resume from `posts_path`.
+        The cache is not written if the consumer stops early, because a partial
+        cache would hide the posts that were never reached.
 
-        This function implements a caching and filtering logic:
-        1. It first tries to load post URLs from a cached file (`posts_path`).
-        2. If no cache exists, it scrapes the profile page to collect the URLs and
-           saves them to the cache file for future runs.
-        3. It then loads the list of URLs that have already been processed from
+        Args:
+            profile: The target profile name (used for logging).
+            limit: The maximum number of post URLs to collect.
+            file_path: The path where the cache file will be saved.
+            processed: URLs already present in the metadata output file.
+
+        Yields:
+            Post URL strings that still need to be scraped.
+        """
+        collected = []
+        yielded = 0
+        for url in self.profile_page.iter_post_urls(
+            limit,
+            processed=processed,
+            stop_after_processed=self.config.main.stop_after_processed,
+        ):
+            collected.append(url)
+            if url not in processed:
+                yielded += 1
+                # the total is only known once the scroll ends, so it grows per URL
+                self.progress.add_total(1)
+                yield url
+        self._save_urls(profile, collected, file_path)
+        logger.info(f"Streamed {yielded} post URLs after filtering out {len(collected) - yielded} processed ones.")
+
+    def get_post_elements(self, limit: int) -> Iterator[str]:
+        """
+        Lazily yields the post URLs to be scraped for a given profile.
+
+        This generator implements a caching and filtering logic:
+        1. It first loads the list of URLs that have already been processed from
            the final metadata output file.
-        4. It filters the collected URLs, removing any that have already been processed.
+        2. It tries to load post URLs from a cached file (`posts_path`).
+        3. If no cache exists, it scrolls the profile page and yields each new URL
+           as soon as it is found, so scraping can start with the first batch.
+           The scroll stops early once `stop_after_processed` consecutive posts
+           were already processed, and all collected URLs are saved to the cache
+           file for future runs.
+        4. If a cache exists and `incremental_refresh` is enabled, it scrolls from
+           the top of the grid only until it reaches a cached shortcode, and
+           prepends the newly found URLs to the cache.
+        5. It filters the URLs, skipping any that have already been processed.
+
+        The URLs to be scraped are added to the progress total: all at once from
+        a cache, one by one while scrolling.
 
         Args:
             limit: The maximum number of post URLs to collect if scraping from scratch.
+
+        Yields:
+            Post URL strings that still need to be scraped.
         """
         profile = self.config.main.target_profile
         posts_path = self.config.data.posts_path
 
+        # Load already processed urls first so a fresh scroll can stop early
+        processed_data_path = self.config.data.metadata_path
+        processed = self._load_processed_urls(processed_data_path)
+
         # Load cached urls
         cached = self._load_cached_urls(posts_path)
         if cached is None:
-            # Scrape fresh if no cache
-            elements = self.profile_page.scroll_and_collect_(limit)
-            urls = [elem for elem in elements]
-            self._save_urls(profile, urls, posts_path)
+            # Scrape fresh if no cache, streaming urls to the caller as they appear
+            yield from self._collect_and_cache_urls(profile, limit, posts_path, processed)
+            return
+        elif self.config.main.incremental_refresh:
+            urls = self._refresh_cached_urls(profile, cached, limit, posts_path)
         else:
             urls = cached
 
-        # Filter out already processed urls
-        processed_data_path = self.config.data.metadata_path
-        processed = self._load_processed_urls(processed_data_path)
-        urls = [u for u in urls if u not in processed]
+        # Filter out already processed urls and duplicate variants of the same post
+        urls = filter_new_posts(urls, processed)
 
         logger.info(f"Returning {len(urls)} post URLs after filtering out {len(processed)} processed ones.")
-        return urls
+        self.progress.add_total(len(urls))
+        yield from urls
 
 
     def extract_comments(self, steps:int = None):
@@ -264,6 +552,10 @@ class SeleniumBackend(Backend):
         This method encapsulates the entire lifecycle for one post, including
         switching to the tab, data extraction with individual error handling,
         and robustly closing the tab and switching back to the main window.
+        With a tab pool, the tab is returned to the pool instead of closed.
+        If the tab navigated away from the allowed pages while the post was
+        scraped (e.g. a login redirect after a click), the post is reported as
+        failed instead of returned, so the other page is never saved.
 
         Args:
             post_index: The index of the post.
@@ -278,17 +570,27 @@ class SeleniumBackend(Backend):
             - (None, error_dict) on failure.
             - (None, None) if no browser windows are left.
         """
+        if self.roundtrips:
+            self.roundtrips.begin_post(post_url)
         try:
             # switch to the new tab
             self.driver.switch_to.window(tab_handle)
+            # a pooled tab may still hold the redirects of its previous post
+            guard = self.driver.navigation_guard
+            target_id = guard.current_target()
+            guard.reset(target_id)
             # Anti Bot measure
             human_mouse_move(self.driver,duration=self.config.main.human_mouse_move_duration)
-            logger.info(f"Switched to tab {tab_handle} for post {post_index} ({post_url})")
-            # optional short wait for page to start loading
-            try:
+            logger.info("Switched to tab %s for post %s (%s)", tab_handle, post_index, post_url)
+            # wait for the page to be ready before extracting
+            wait_started = time.perf_counter()
+            if self._event_driven_readiness():
+                wait_for_post_ready(self.driver, timeout=self.config.main.tab_ready_timeout)
+            else:
                 time.sleep(random.uniform(0.6, 1.2))
-            except Exception:
-                logger.debug("Page load wait did not find expected element, continuing.")
+            waited = time.perf_counter() - wait_started
+            self.tab_ready_timings[post_index] += waited
+            metrics.observe("tab_wait", waited)
 
             post_id = f"post_{post_index}"
             post_data = {
@@ -302,8 +604,9 @@ class SeleniumBackend(Backend):
             # Title / metadata
             try:
                 handle_slug = f"/{self.config.main.target_profile}/"
-                logger.info(f"Extracting title data for {post_url} with handle {handle_slug}")
-                post_data["post_title"] = self.get_post_title_data(handle_slug) or ""
+                logger.info("Extracting title data for %s with handle %s", post_url, handle_slug)
+                with timer("title"):
+                    post_data["post_title"] = self.get_post_title_data(handle_slug) or ""
             except Exception as e:
                 logger.error(f"Title extraction failed for {post_url}: {e}")
                 logger.debug(traceback.format_exc())
@@ -311,35 +614,74 @@ class SeleniumBackend(Backend):
             # Images
             try:
                 # post_data["post_images"] = scrape_carousel_images(self.driver, images_from_post) or []
-                post_data["post_images"] = images_from_post(self.driver) or []
-                logger.info(f"Images extraction successful for {post_url}")
+                with timer("images"):
+                    post_data["post_images"] = images_from_post(self.driver) or []
+                logger.info("Images extraction successful for %s", post_url)
             except Exception as e:
                 logger.error(f"Images extraction failed for {post_url}: {e}")
                 logger.debug(traceback.format_exc())
 
+            # API payloads about this post fetched by this tab so far (comments, media)
+            payloads = []
+            shortcode = post_shortcode(post_url)
+            if self.network_capture:
+                try:
+                    with timer("network_capture"):
+                        payloads = self.network_capture.collect(shortcode)
+                    if not post_data["post_images"]:
+                        post_data["post_images"] = parse_media_from_payloads(payloads, shortcode)
+                except Exception as e:
+                    logger.error(f"Network capture failed for {post_url}: {e}")
+                    logger.debug(traceback.format_exc())
+
             # Likes / other sections
             try:
-                post_data["likes"] = get_section_with_highest_likes(self.driver) or {}
-                logger.info(f"Likes extraction successful for {post_url}")
+                with timer("likes"):
+                    post_data["likes"] = get_section_with_highest_likes(self.driver) or {}
+                logger.info("Likes extraction successful for %s", post_url)
             except Exception as e:
                 logger.error(f"Likes extraction failed for {post_url}: {e}")
                 logger.debug(traceback.format_exc())
             
-            # comments
+            # comments, from the captured payloads if they hold all of them, otherwise
+            # by scrolling the comments in the DOM (which loads the further pages)
             try:
-                post_data["post_comments_gif"] = scrape_comments_with_gif(self.driver,self.config) or []
+                with timer("comments"):
+                    comments = parse_comments_from_payloads(payloads, shortcode)
+                    if comments and not comments_have_more_pages(payloads):
+                        post_data["post_comments_gif"] = comments
+                        logger.info("Parsed %s comments from API payloads for %s", len(comments), post_url)
+                    else:
+                        post_data["post_comments_gif"] = scrape_comments_with_gif(self.driver,self.config) or []
             except Exception as e:
                 logger.error(f"Comments extraction with gif failed for {post_url}: {e}")
                 logger.debug(traceback.format_exc())
 
+            # validate any navigation that happened in this tab (one round trip);
+            # a redirected tab holds some other page, which must not be saved
+            suspicious = guard.check(target_id)
+            if suspicious:
+                raise RuntimeError(f"left the post page for {suspicious[-1]}")
+
             return post_data, None
 
         except Exception as e:
             logger.exception(f"Unexpected error while scraping post {post_index} ({post_url}): {e}")
-            error_data = {"index": post_index, "reason": str(e), "profile": self.config.main.target_profile}
+            error_data = {
+                "index": post_index,
+                "reason": str(e),
+                "error_type": type(e).__name__,
+                "profile": self.config.main.target_profile,
+            }
             return None, error_data
         finally:
-            self._close_tab_and_switch_back(tab_handle, main_window_handle, debug)
+            if self.tab_pool:
+                self.tab_pool.release(tab_handle, main_window_handle)
+            else:
+                self._discard_captured_responses()
+                self._close_tab_and_switch_back(tab_handle, main_window_handle, debug)
+            if self.roundtrips:
+                self.roundtrips.end_post()
             # Check if any windows are left open after closing.
             if not self.driver.window_handles:
                 return None, None
@@ -352,15 +694,18 @@ class SeleniumBackend(Backend):
         debug=False
     ):
         """
-        Scrapes a list of post URLs in batches, saving results periodically.
+        Scrapes post URLs in batches, saving results periodically.
 
-        This method iterates through the provided post URLs, opening each one in a
-        new browser tab to scrape its content. It is designed to be robust,
+        This method consumes the provided post URLs batch by batch, opening each
+        one in a new browser tab (or an idle tab of the tab pool) to scrape its
+        content. Any iterable is accepted,
+        so a generator such as `get_post_elements` lets scraping start as soon as
+        the first batch of URLs has been found. It is designed to be robust,
         handling tab management, data extraction, and intermittent saving to
         prevent data loss.
 
         Args:
-            post_elements (list[str]): A list of post URLs to scrape.
+            post_elements (Iterable[str]): The post URLs to scrape.
             batch_size (int): The number of posts to open in tabs at a time.
             save_every (int): The number of posts to scrape before saving the
                               collected data to the output files.
@@ -373,14 +718,24 @@ class SeleniumBackend(Backend):
         """
         results = {"scraped_posts": [], "skipped_posts": []}
         total_scraped = 0
+        # per-post time spent waiting for tabs to open and become ready
+        self.tab_ready_timings = defaultdict(float)
 
         main_handle = self.driver.current_window_handle
         tmp_file = self.config.data.tmp_path
-
-        # main loop over batches
-        for batch_start in range(0, len(post_elements), batch_size):
-            batch = post_elements[batch_start: batch_start + batch_size]
+        if self.tab_pool and batch_size > self.tab_pool.size:
+            logger.info(f"Limiting batch size to the tab pool size ({self.tab_pool.size}).")
+            batch_size = self.tab_pool.size
+
+        # main loop over batches, pulling each batch lazily from the iterable
+        post_iter = iter(post_elements)
+        batch_start = 0
+        while True:
+            batch = list(islice(post_iter, batch_size))
+            if not batch:
+                break
             opened = []  # list of tuples (index, href, handle)
+            self.progress.set_batch(batch_start // batch_size + 1)
 
             # --- open all posts in batch (in new tabs) ---
             for i, post_element in enumerate(batch, start=batch_start):
@@ -396,14 +751,20 @@ class SeleniumBackend(Backend):
                             "reason": "missing href",
                             "profile": self.config.target_profile
                         })
+                        self.progress.post_skipped("missing href")
                         continue
 
                     try:
-                        new_handle = self.open_href_in_new_tab(href, tab_open_retries)
-                        # optionally give the new tab a moment to start loading
-                        time.sleep(random.uniform(0.8, 1.5))
+                        wait_started = time.perf_counter()
+                        new_handle = self.open_post_tab(href, tab_open_retries)
+                        if not self._event_driven_readiness():
+                            # give the new tab a moment to start loading
+                            time.sleep(random.uniform(0.8, 1.5))
+                        opened_in = time.perf_counter() - wait_started
+                        self.tab_ready_timings[i] += opened_in
+                        metrics.observe("tab_open", opened_in)
                         opened.append((i, href, new_handle))
-                        logger.info(f"Opened post {i+1} in new tab: {href} -> handle {new_handle}")
+                        logger.info("Opened post %s in new tab: %s -> handle %s", i+1, href, new_handle)
                     except Exception as e:
                         logger.error(f"Failed to open new tab for post {i+1}: {e}")
                         results["skipped_posts"].append({
@@ -411,6 +772,7 @@ class SeleniumBackend(Backend):
                             "reason": f"failed to open tab: {str(e)}",
                             "profile": self.config.target_profile
                         })
+                        self.progress.post_skipped("failed to open tab")
                 except Exception as e:
                     logger.exception(f"Unexpected error when preparing post {i+1}: {e}")
                     results["skipped_posts"].append({
@@ -418,9 +780,11 @@ class SeleniumBackend(Backend):
                         "reason": f"error extracting href: {str(e)}",
                         "profile": self.config.target_profile
                     })
+                    self.progress.post_skipped("error extracting href")
 
             # --- scrape each opened tab, one-by-one, ensuring closure ---
             for post_index, post_url, tab_handle in opened:
+                scrape_started = time.perf_counter()
                 post_data, error_data = self._scrape_and_close_tab(post_index, post_url, tab_handle, main_handle, debug)
 
                 if post_data is None and error_data is None:
@@ -430,34 +794,73 @@ class SeleniumBackend(Backend):
 
                 if error_data:
                     results["skipped_posts"].append(error_data)
+                    self.progress.post_skipped(error_data.get("error_type") or error_data.get("reason"))
                     continue
 
                 if post_data:
                     results["scraped_posts"].append(post_data)
                     total_scraped += 1
-                    logger.info(f"Scraped post {post_index} ({post_url}). Total scraped: {total_scraped}")
+                    self.progress.post_scraped(
+                        time.perf_counter() - scrape_started + self.tab_ready_timings.get(post_index, 0.0)
+                    )
+                    logger.info("Scraped post %s (%s). Total scraped: %s", post_index, post_url, total_scraped)
 
                     try:
-                        save_intermediate(post_data, tmp_file)
+                        with timer("serialization"):
+                            save_intermediate(post_data, tmp_file)
                     except Exception as e:
-                        logger.warning(f"Failed to write tmp result for {post_url}: {e}")
+                        logger.warning("Failed to write tmp result for %s: %s", post_url, e)
 
                     if total_scraped > 0 and total_scraped % save_every == 0:
-                        save_scrape_results(results, self.config.data.output_dir, self.config)
+                        self._flush_results(results)
                         clear_tmp_file(tmp_file)
-                        logger.info(f"Saved results after {total_scraped} scraped posts.")
+                        logger.info("Saved results after %s scraped posts.", total_scraped)
+
+            batch_start += len(batch)
+
+            # restart a bloated browser before the next batch, keeping what was scraped
+            if self.memory_watchdog.enabled and self.memory_watchdog.over_limit(self.driver):
+                self._flush_results(results)
+                clear_tmp_file(tmp_file)
+                self.restart()
+                main_handle = self.driver.current_window_handle
+                logger.info(f"Browser restarted; resuming after post {batch_start}.")
 
             # optional: jittered wait between batches to mimic human rate-limits
             random_delay(self.config.main.rate_limit_seconds_min, self.config.main.rate_limit_seconds_max)
 
+        if batch_start == 0:
+            logger.warning(f"No new posts to scrape for profile {self.config.main.target_profile}.")
+        else:
+            summary = timing_histogram(list(self.tab_ready_timings.values()))
+            logger.info(f"Tab readiness wait ({self.config.main.tab_ready_mode} mode): {json.dumps(summary)}")
+
         # final save
         if results["scraped_posts"] or results["skipped_posts"]:
-            save_scrape_results(results, self.config.data.output_dir, self.config)
+            self._flush_results(results)
             clear_tmp_file(tmp_file)
             logger.info("Saved final scrape results.")
 
         return results
 
+    @timer("flush")
+    def _flush_results(self, results: dict) -> None:
+        """Appends the collected results to the output files and clears them."""
+        self.progress.add_bytes(save_scrape_results(results, self.config.data.output_dir, self.config))
+
+    def _event_driven_readiness(self) -> bool:
+        """Returns True if tab readiness is driven by page signals instead of fixed sleeps."""
+        return self.config.main.tab_ready_mode == "event"
+
+    def _discard_captured_responses(self) -> None:
+        """Drops the uncollected API responses of the current tab, before it is closed or reused."""
+        if not self.network_capture:
+            return
+        try:
+            self.network_capture.discard()
+        except Exception as e:
+            logger.debug("Could not discard captured responses: %s", e)
+
     def _close_tab_and_switch_back(self, tab_handle_to_close: str, main_window_handle: str, debug: bool):
         """
         Closes the specified tab and switches the driver's focus back.
@@ -469,51 +872,103 @@ class SeleniumBackend(Backend):
         """
         try:
             if debug:
-                logger.info(f"DEBUG mode: leaving tab {tab_handle_to_close} open.")
+                logger.info("DEBUG mode: leaving tab %s open.", tab_handle_to_close)
             else:
                 self.driver.close()
-                logger.debug(f"Closed tab {tab_handle_to_close}")
+                logger.debug("Closed tab %s", tab_handle_to_close)
         except Exception as e:
-            logger.warning(f"Error closing tab {tab_handle_to_close}: {e}")
+            logger.warning("Error closing tab %s: %s", tab_handle_to_close, e)
 
         handles = self.driver.window_handles
-        if main_window_handle in handles:
-            self.driver.switch_to.window(main_window_handle)
-        elif handles:
-            self.driver.switch_to.window(handles[0])
-        logger.debug(f"Switched back to handle {self.driver.current_window_handle}")
+        target = main_window_handle if main_window_handle in handles else (handles[0] if handles else None)
+        if target:
+            self.driver.switch_to.window(target)
+            # the target handle is already known; asking the driver would cost a round trip
+            logger.debug("Switched back to handle %s", target)
+
+    def open_post_tab(self, href: str, tab_open_retries: int = 4) -> str:
+        """
+        Starts loading a post in a tab that `_scrape_and_close_tab` can finish with.
+
+        With a tab pool the post goes into a pooled tab, which is released (not
+        closed) after scraping; otherwise a new tab is opened.
 
-    def open_href_in_new_tab(self, href,tab_open_retries):
+        Returns:
+            The window handle of the tab the post is loading in.
+        """
+        if self.tab_pool:
+            return self.tab_pool.open(href, tab_open_retries)
+        return self.open_href_in_new_tab(href, tab_open_retries)
+
+    def open_href_in_new_tab(self, href, tab_open_retries, window_name: str = "_blank"):
         """
         Opens a URL in a new browser tab and returns the new window handle.
 
         It works by recording the set of window handles before opening the new
-        tab, and then finding the handle that was added.
+        tab, and then finding the handle that was added. If a resource policy is
+        configured, the tab is opened blank and the policy applied before the
+        URL is loaded. In "event" readiness mode the handles are polled at a
+        short interval up to `tab_ready_timeout` instead of with jittered sleeps.
 
         Args:
             href (str): The URL to open.
-            tab_open_retries (int): The number of times to check for a new handle.
+            tab_open_retries (int): The number of times to check for a new handle
+                                    in "sleep" readiness mode.
+            window_name (str): The name of the new window. Named windows can be
+                               navigated again later with `window.open(url, name)`.
 
         Returns:
             The window handle (string) of the newly opened tab.
         """
         before_handles = set(self.driver.window_handles)
-        # Open new tab with specified href - this opens a new tab in most browsers
-        self.driver.execute_script("window.open(arguments[0], '_blank');", href)
+        if self.blocked_url_patterns:
+            # Open a blank tab first so the resource policy is in place before the post loads
+            self.driver.execute_script("window.open('about:blank', arguments[0]);", window_name)
+        else:
+            # Open new tab with specified href - this opens a new tab in most browsers
+            self.driver.execute_script("window.open(arguments[0], arguments[1]);", href, window_name)
 
         # Wait for the new handle to appear
         new_handle = None
-        for _ in range(tab_open_retries):
-            after_handles = set(self.driver.window_handles)
-            diff = after_handles - before_handles
-            if diff:
+        if self._event_driven_readiness():
+            try:
+                diff = WebDriverWait(self.driver, self.config.main.tab_ready_timeout, poll_frequency=0.05).until(
+                    lambda d: set(d.window_handles) - before_handles
+                )
                 new_handle = diff.pop()
-                break
-            time.sleep(0.5 + random.random() * 0.5)  # jittered wait
+            except TimeoutException:
+                pass
+        else:
+            for _ in range(tab_open_retries):
+                after_handles = set(self.driver.window_handles)
+                diff = after_handles - before_handles
+                if diff:
+                    new_handle = diff.pop()
+                    break
+                time.sleep(0.5 + random.random() * 0.5)  # jittered wait
         if not new_handle:
             raise RuntimeError(f"New tab did not appear for href={href}")
+        if self.blocked_url_patterns:
+            self._navigate_with_resource_policy(new_handle, href)
         return new_handle
 
+    def _navigate_with_resource_policy(self, tab_handle: str, href: str) -> None:
+        """
+        Applies the resource policy to a blank tab and starts loading `href` in it.
+
+        The navigation is started from JavaScript so this does not block on the
+        page load; focus is returned to the previously active tab.
+
+        Args:
+            tab_handle: The window handle of the blank tab.
+            href: The URL to load in the tab.
+        """
+        previous_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(tab_handle)
+        apply_resource_policy(self.driver, self.blocked_url_patterns)
+        self.driver.execute_script("window.location.href = arguments[0];", href)
+        self.driver.switch_to.window(previous_handle)
+
     def get_post_title_data(self, href_string, timeout=5):
         """
         Executes a JavaScript snippet to extract post title, timestamp, and author data.
@@ -529,61 +984,8 @@ class SeleniumBackend(Backend):
         Returns:
             A dictionary containing the extracted data, or None if not found.
         """
-        random_delay(2, 4.5)  # small wait to ensure content is fully loaded
-        href_string_js = json.dumps(href_string)  # safely quote special characters
-        
-        js_code = f"""
-        function getPostTitleData(variableA) {{
-            const divs = Array.from(document.querySelectorAll('div'));
-            let innermostDiv = null;
-
-            for (const div of divs) {{
-                const aEl = div.querySelector(`a[href="${{variableA}}"]`);
-                const timeEl = div.querySelector('time');
-
-                if (aEl && timeEl) {{
-                    const childDivs = div.querySelectorAll('div');
-                    let hasNestedBoth = false;
-
-                    for (const child of childDivs) {{
-                        if (child.querySelector(`a[href="${{variableA}}"]`) && child.querySelector('time')) {{
-                            hasNestedBoth = true;
-                            break;
-                        }}
-                    }}
-
-                    if (!hasNestedBoth) {{
-                        innermostDiv = div;
-                    }}
-                }}
-            }}
-
-            if (!innermostDiv) return null;
-
-            const aEl = innermostDiv.querySelector(`a[href="${{variableA}}"]`);
-            const timeEl = innermostDiv.querySelector('time');
-
-            const data = {{
-                topDivClass: innermostDiv.className,
-                aHref: aEl ? aEl.getAttribute('href') : null,
-                aSrc: aEl ? aEl.getAttribute('src') : null,
-                timeDatetime: timeEl ? timeEl.getAttribute('datetime') : null,
-                siblingTexts: []
-            }};
-
-            const parent = innermostDiv.parentElement;
-            if (parent) {{
-                const siblings = Array.from(parent.children).filter(el => el !== innermostDiv);
-                data.siblingTexts = siblings
-                    .map(sib => sib.textContent.trim())
-                    .filter(t => t.length > 0);
-            }}
-
-            return data;
-        }}
-
-        return getPostTitleData({href_string_js});
-        """
-
-        logger.debug(f"Executing JS - {js_code} to get post title data for href: {href_string}")
-        return self.driver.execute_script(js_code)
+        # In "event" mode the tab already waited for wait_for_post_ready
+        if not self._event_driven_readiness():
+            random_delay(2, 4.5)  # small wait to ensure content is fully loaded
+        logger.debug("Executing JS to get post title data for href: %s", href_string)
+        return self.driver.execute_script(POST_TITLE_JS, href_string)
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class PooledTab:
+    """A reusable browser tab, addressed by its window name."""
+    name: str
+    handle: str
+    uses: int = 0
+    in_use: bool = False
+
+class TabPool:
+    """
+    A fixed set of reusable post tabs.
+
+    Instead of opening a new tab for every post and closing it afterwards, each
+    post is loaded into an idle tab of the pool. Tabs are opened with a window
+    name, so `window.open(url, name)` from the main window navigates the existing
+    tab in place without switching to it. A tab is closed and replaced only after
+    `recycle_after` posts, or when its JS heap grows beyond `recycle_heap_mb`.
+    """
+    def __init__(self, backend, size: int, recycle_after: int = 50, recycle_heap_mb: int = 0):
+        """
+        Initializes the TabPool.
+
+        Args:
+            backend: The SeleniumBackend owning the driver.
+            size: The maximum number of tabs in the pool.
+            recycle_after: Number of posts after which a tab is replaced.
+            recycle_heap_mb: JS heap size (MB) above which a tab is replaced. 0 disables the check.
+        """
+        self.backend = backend
+        self.size = size
+        self.recycle_after = recycle_after
+        self.recycle_heap_mb = recycle_heap_mb
+        self.tabs: list[PooledTab] = []
+        self.tabs_created = 0
+        self.tabs_recycled = 0
+
+    @property
+    def driver(self):
+        return self.backend.driver
+
+    def open(self, href: str, tab_open_retries: int = 4) -> str:
+        """
+        Starts loading `href` in an idle tab, creating one if the pool is not full.
+
+        Must be called while the main window is the current window.
+
+        Returns:
+            The window handle of the tab the post is loading in.
+        """
+        tab = next((t for t in self.tabs if not t.in_use), None)
+        if tab is None:
+            if len(self.tabs) >= self.size:
+                raise RuntimeError(f"All {self.size} pooled tabs are in use")
+            name = f"igscraper_tab_{self.tabs_created}"
+            handle = self.backend.open_href_in_new_tab(href, tab_open_retries, window_name=name)
+            tab = PooledTab(name=name, handle=handle)
+            self.tabs.append(tab)
+            self.tabs_created += 1
+        else:
+            # Navigates the named tab in place; the resource policy of the tab is kept
+            self.driver.execute_script("window.open(arguments[0], arguments[1]);", href, tab.name)
+        tab.in_use = True
+        return tab.handle
+
+    def release(self, handle: str, main_window_handle: str) -> None:
+        """
+        Returns a tab to the pool after its post was scraped, recycling it if needed.
+
+        Must be called while the tab is the current window; focus is moved back
+        to the main window. API responses captured in the tab and not collected
+        are dropped, so they are never attributed to the next post loaded in it.
+        """
+        tab = next((t for t in self.tabs if t.handle == handle), None)
+        try:
+            if tab is not None:
+                tab.uses += 1
+                tab.in_use = False
+                if self._needs_recycling(tab):
+                    self.backend._discard_captured_responses()
+                    self._recycle(tab)
+                else:
+                    # Unload the post so its memory is freed and readiness checks
+                    # never see the previous post
+                    self.driver.execute_script("window.location.replace('about:blank');")
+                    self.backend._discard_captured_responses()
+        except Exception as e:
+            logger.warning("Error releasing pooled tab %s: %s", handle, e)
+            if tab in self.tabs:
+                self.tabs.remove(tab)
+        finally:
+            handles = self.driver.window_handles
+            if main_window_handle in handles:
+                self.driver.switch_to.window(main_window_handle)
+            elif handles:
+                self.driver.switch_to.window(handles[0])
+
+    def _needs_recycling(self, tab: PooledTab) -> bool:
+        if tab.uses >= self.recycle_after:
+            return True
+        if self.recycle_heap_mb:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+            heap = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), 0)
+            if heap > self.recycle_heap_mb * 1024 * 1024:
+                logger.info("Pooled tab %s uses %.0f MB of JS heap, recycling it.", tab.name, heap / 1024 / 1024)
+                return True
+        return False
+
+    def _recycle(self, tab: PooledTab) -> None:
+        """Closes the (current) tab; a fresh one is created on the next `open`."""
+        self.tabs.remove(tab)
+        self.driver.close()
+        self.tabs_recycled += 1
+        logger.debug("Recycled pooled tab %s after %s posts", tab.name, tab.uses)
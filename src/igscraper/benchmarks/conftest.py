@@ -0,0 +1,157 @@
+"""
+Shared fixtures for the benchmarks.
+
+The benchmarks need pytest-benchmark and a local Chrome; without either they
+are skipped. Each result is compared with `baselines.json`: a mean slower than
+`threshold` x the stored baseline fails the test, and a benchmark without a
+baseline emits a `MissingBaselineWarning`, since it cannot catch regressions
+(with `IGSCRAPER_BENCH_STRICT=1` it fails instead).
+Run with `IGSCRAPER_BENCH_UPDATE=1` (and `IGSCRAPER_BENCH_SCALES=10000` to
+include the I/O benchmarks) to record new baselines on the current machine;
+only the benchmarks that ran are updated. The committed baselines cover the
+benchmarks that run without Chrome.
+
+The I/O benchmarks need no browser and only run when `IGSCRAPER_BENCH_SCALES`
+lists the corpus sizes to run at (e.g. "10000,1000000,10000000").
+"""
+import json
+import os
+import warnings
+from pathlib import Path
+
+import pytest
+
+from .fixtures import PROFILE, write_fixtures
+
+BASELINES_FILE = Path(__file__).with_name("baselines.json")
+
+SIZES = {
+    "grid": [12, 120, 1200],
+    "carousel": [1, 10, 20],
+    "comments": [10, 100, 1000],
+}
+
+@pytest.fixture(scope="session")
+def fixture_paths(tmp_path_factory):
+    return write_fixtures(tmp_path_factory.mktemp("ig_fixtures"), SIZES)
+
+@pytest.fixture(scope="session")
+def chrome():
+    """A headless Chrome shared by all benchmarks."""
+    webdriver = pytest.importorskip("selenium.webdriver")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1920,1080")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        pytest.skip(f"Chrome is not available: {e}")
+    yield driver
+    driver.quit()
+
+@pytest.fixture
+def open_fixture(chrome, fixture_paths):
+    """Loads the fixture page of a kind and size in the shared browser."""
+    def load(kind: str, size: int):
+        chrome.get(fixture_paths[kind][size].as_uri())
+        return chrome
+    return load
+
+@pytest.fixture
+def make_backend(tmp_path):
+    """
+    Builds a `SeleniumBackend` on a config with its outputs under `tmp_path`,
+    without starting a browser; `driver` (e.g. the shared Chrome) is attached as is.
+    """
+    from src.igscraper.backends.selenium_backend import SeleniumBackend
+    from src.igscraper.config import Config
+
+    def build(driver=None, **main):
+        config = Config(
+            main={"target_profiles": [{"name": PROFILE, "num_posts": 10}], **main},
+            data={
+                "output_dir": str(tmp_path),
+                "posts_path": str(tmp_path / "posts_{target_profile}.txt"),
+                "metadata_path": str(tmp_path / "metadata_{target_profile}.jsonl"),
+                "skipped_path": str(tmp_path / "skipped_{target_profile}.txt"),
+                "tmp_path": str(tmp_path / "tmp_{target_profile}.jsonl"),
+                "cookie_file": str(tmp_path / "cookies.json"),
+                "chromedriver_cache": str(tmp_path / "chromedriver_cache.json"),
+            },
+            logging={"level": "INFO", "log_dir": str(tmp_path / "logs")},
+        )
+        backend = SeleniumBackend(config)
+        backend.driver = driver
+        return backend
+    return build
+
+class MissingBaselineWarning(UserWarning):
+    """A benchmark ran without a stored baseline, so it was not checked for regressions."""
+
+class Baselines:
+    def __init__(self, path: Path):
+        self.path = path
+        data = json.loads(path.read_text(encoding="utf-8"))
+        self.threshold = data["threshold"]
+        self.means = data["baselines"]
+        self.update = os.environ.get("IGSCRAPER_BENCH_UPDATE") == "1"
+        self.strict = os.environ.get("IGSCRAPER_BENCH_STRICT") == "1"
+        self.dirty = False
+
+    def check(self, name: str, mean: float) -> None:
+        if self.update:
+            self.means[name] = round(mean, 6)
+            self.dirty = True
+            return
+        baseline = self.means.get(name)
+        if baseline is None:
+            message = (
+                f"{name}: no baseline in {self.path.name}, regressions are not detected; "
+                "record one with IGSCRAPER_BENCH_UPDATE=1"
+            )
+            if self.strict:
+                pytest.fail(message)
+            warnings.warn(message, MissingBaselineWarning)
+        else:
+            assert mean <= baseline * self.threshold, (
+                f"{name}: mean {mean * 1000:.2f} ms regressed beyond "
+                f"{self.threshold}x the baseline of {baseline * 1000:.2f} ms"
+            )
+
+    def save(self) -> None:
+        if self.dirty:
+            data = {"threshold": self.threshold, "baselines": dict(sorted(self.means.items()))}
+            self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+@pytest.fixture(scope="session")
+def baselines():
+    store = Baselines(BASELINES_FILE)
+    yield store
+    store.save()
+
+def bench_scales():
+    """Corpus sizes for the I/O benchmarks, from `IGSCRAPER_BENCH_SCALES` (10000 if unset)."""
+    value = os.environ.get("IGSCRAPER_BENCH_SCALES", "10000")
+    return [int(v) for v in value.split(",") if v.strip()]
+
+@pytest.fixture
+def bench(benchmark, baselines, request):
+    """Runs `benchmark` and checks the mean against the stored baseline."""
+    def run(func, *args):
+        result = benchmark(func, *args)
+        baselines.check(request.node.name, benchmark.stats.stats.mean)
+        return result
+    return run
+
+@pytest.fixture
+def bench_once(benchmark, baselines, request):
+    """
+    Like `bench`, for slow operations: `setup()` runs before each of `rounds`
+    single calls and returns the call's `(args, kwargs)`.
+    """
+    def run(func, setup=None, rounds=3):
+        result = benchmark.pedantic(func, setup=setup, rounds=rounds, iterations=1)
+        baselines.check(request.node.name, benchmark.stats.stats.mean)
+        return result
+    return run
@@ -0,0 +1,134 @@
+"""
+Synthetic metadata corpus generator.
+
+Emits JSONL records with the schema of `metadata_{target_profile}.jsonl`
+(`post_url`, `post_id`, `post_title`, `post_images`, `likes`,
+`post_comments_gif`), at any scale, for tuning the result writers and the
+resume scan:
+
+    python -m src.igscraper.benchmarks.corpus --posts 1000000 -o outputs/corpus.jsonl
+"""
+import argparse
+import json
+import math
+import random
+import string
+from pathlib import Path
+from typing import Dict, Iterator
+
+COMMENT_LENGTHS = ("lognormal", "uniform", "fixed")
+
+_WORDS = [
+    "love", "this", "amazing", "wow", "so", "good", "the", "best", "photo", "ever",
+    "can't", "wait", "for", "more", "🔥", "😍", "beautiful", "place", "trip", "goals",
+]
+
+def _comment_length(rng: random.Random, distribution: str, mean: int) -> int:
+    if distribution == "fixed":
+        return mean
+    if distribution == "uniform":
+        return rng.randint(1, 2 * mean)
+    # Most comments are short, a few are very long
+    sigma = 1.0
+    return max(1, int(rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)))
+
+def _text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+def _shortcode(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits + "_-", k=11))
+
+def generate_posts(
+    posts: int,
+    comments_per_post: int = 15,
+    comment_length: str = "lognormal",
+    mean_comment_chars: int = 60,
+    slides_per_post: int = 3,
+    seed: int = 0,
+) -> Iterator[Dict]:
+    """
+    Yields `posts` metadata records.
+
+    Args:
+        posts: Number of records.
+        comments_per_post: Mean number of comments per post (drawn uniformly from 0 to 2x).
+        comment_length: Distribution of comment lengths: "lognormal", "uniform" or "fixed".
+        mean_comment_chars: Mean comment length in characters.
+        slides_per_post: Maximum number of images per post.
+        seed: Random seed; the same arguments always produce the same corpus.
+    """
+    if comment_length not in COMMENT_LENGTHS:
+        raise ValueError(f"comment_length must be one of {COMMENT_LENGTHS}")
+    rng = random.Random(seed)
+    profile = "corpusprofile"
+    for i in range(posts):
+        shortcode = _shortcode(rng)
+        likes = int(rng.paretovariate(1.2) * 100)
+        comments = []
+        for _ in range(rng.randint(0, 2 * comments_per_post)):
+            handle = f"user{rng.randint(0, 10 ** 6)}"
+            gif = [f"https://media.giphy.com/media/{_shortcode(rng)}/giphy.gif"] if rng.random() < 0.05 else []
+            comments.append({
+                "likes": f"{rng.randint(1, 500)} likes" if rng.random() < 0.3 else None,
+                "handle": handle,
+                "date": f"{rng.randint(1, 52)}w",
+                "comment": _text(rng, _comment_length(rng, comment_length, mean_comment_chars)),
+                "commentImgs": gif,
+            })
+        yield {
+            "post_url": f"https://www.instagram.com/{profile}/p/{shortcode}/",
+            "post_id": f"post_{i}",
+            "post_title": {
+                "topDivClass": "x1iyjqo2 xs83m0k",
+                "aHref": f"/{profile}/",
+                "aSrc": None,
+                "timeDatetime": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00.000Z",
+                "siblingTexts": [_text(rng, rng.randint(20, 400))],
+            },
+            "post_images": [
+                {
+                    "src": f"https://scontent.cdninstagram.com/v/t51/{shortcode}_{s}.jpg?stp=dst-jpg_e35",
+                    "alt": f"Photo by {profile}. May be an image of {_text(rng, 40)}.",
+                }
+                for s in range(rng.randint(1, slides_per_post))
+            ],
+            "likes": {"likesText": f"{likes:,} likes", "likesNumber": likes},
+            "post_comments_gif": comments,
+        }
+
+def write_corpus(path: Path, posts: int, **kwargs) -> Path:
+    """Writes a generated corpus to `path` as JSONL. Keyword arguments go to `generate_posts`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for record in generate_posts(posts, **kwargs):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic metadata JSONL corpus")
+    parser.add_argument("--posts", type=int, default=10_000, help="Number of posts")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL file")
+    parser.add_argument("--comments-per-post", type=int, default=15)
+    parser.add_argument("--comment-length", choices=COMMENT_LENGTHS, default="lognormal")
+    parser.add_argument("--mean-comment-chars", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    path = write_corpus(
+        args.output,
+        args.posts,
+        comments_per_post=args.comments_per_post,
+        comment_length=args.comment_length,
+        mean_comment_chars=args.mean_comment_chars,
+        seed=args.seed,
+    )
+    print(f"✅ Wrote {args.posts} posts to {path}")
+
+if __name__ == "__main__":
+    main()
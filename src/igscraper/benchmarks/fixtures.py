@@ -0,0 +1,92 @@
+"""
+Generators for synthetic Instagram-like HTML pages.
+
+The markup only reproduces the structure the extractors rely on (class names,
+nesting, attributes), not the look of the real pages.
+"""
+from pathlib import Path
+from typing import Dict
+
+PROFILE = "benchprofile"
+
+def _page(body: str) -> str:
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>{body}</body></html>"
+
+def profile_grid_html(posts: int) -> str:
+    """A profile page with `posts` posts in `_ac7v` rows of three."""
+    rows = []
+    for start in range(0, posts, 3):
+        links = "".join(
+            f'<div><a href="/{PROFILE}/p/SC{i:07d}/"><img src="https://cdn.example/{i}.jpg" alt="post {i}"></a></div>'
+            for i in range(start, min(start + 3, posts))
+        )
+        rows.append(f'<div class="_ac7v">{links}</div>')
+    return _page(f"<main><header><h2>{PROFILE}</h2></header><div>{''.join(rows)}</div></main>")
+
+def _post_header() -> str:
+    return (
+        f'<div class="x1"><div class="x2"><span><a href="/{PROFILE}/">{PROFILE}</a></span>'
+        f'<time datetime="2024-05-01T10:00:00.000Z">May 1</time></div>'
+        f"<div>A caption with #hashtags and some text</div></div>"
+    )
+
+def _likes_section(likes: int) -> str:
+    return f'<section><span>{likes:,} likes</span><a href="/p/liked_by/">others</a></section>'
+
+def _comment(i: int) -> str:
+    gif = f'<img class="gif" src="https://media.giphy.com/{i}.gif">' if i % 10 == 0 else ""
+    return (
+        '<div class="html-div">'
+        '<div><div class="html-div">'
+        f'<div class="html-div"><span><a href="/user{i}/">user{i}</a></span><span><time>{i % 52 + 1}w</time></span></div>'
+        f'<div class="html-div"><span>Comment number {i} with a few words of text</span>{gif}</div>'
+        "</div></div>"
+        f"<span>{i % 300} likes</span>"
+        "</div>"
+    )
+
+def carousel_html(slides: int) -> str:
+    """A post page with a carousel of `slides` images."""
+    items = "".join(
+        f'<li class="_acaz"><img src="https://cdn.example/slide_{i}.jpg" alt="slide {i}"></li>'
+        for i in range(slides)
+    )
+    return _page(f"<main><article>{_post_header()}<ul class=\"_acay\">{items}</ul>{_likes_section(1234)}</article></main>")
+
+def comment_thread_html(comments: int) -> str:
+    """A post page with `comments` rendered comments."""
+    thread = "".join(_comment(i) for i in range(comments))
+    return _page(f"<main><article>{_post_header()}{_likes_section(98765)}<div>{thread}</div></article></main>")
+
+def post_with_media_html(slides: int) -> str:
+    """
+    A carousel post that also plays a video and uses a web font, both served
+    next to the page (`clip.mp4`, `font.woff2`), for the resource policy checks.
+    """
+    media = (
+        "<style>@font-face { font-family: PostFont; src: url('font.woff2'); } body { font-family: PostFont; }</style>"
+        '<video src="clip.mp4" preload="auto" autoplay muted></video>'
+    )
+    return carousel_html(slides).replace("<main>", f"<main>{media}", 1)
+
+def write_fixtures(directory: Path, sizes: Dict[str, list]) -> Dict[str, Dict[int, Path]]:
+    """
+    Writes one fixture file per kind and size.
+
+    Args:
+        directory: Where to write the files.
+        sizes: `{"grid": [...], "carousel": [...], "comments": [...]}`.
+
+    Returns:
+        `{kind: {size: path}}`.
+    """
+    generators = {"grid": profile_grid_html, "carousel": carousel_html, "comments": comment_thread_html}
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for kind, kind_sizes in sizes.items():
+        paths[kind] = {}
+        for size in kind_sizes:
+            path = directory / f"{kind}_{size}.html"
+            path.write_text(generators[kind](size), encoding="utf-8")
+            paths[kind][size] = path
+    return paths
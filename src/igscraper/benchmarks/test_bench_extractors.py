@@ -0,0 +1,49 @@
+"""
+Benchmarks of the DOM extractors against generated `file://` fixtures.
+
+    pip install pytest-benchmark
+    python -m pytest src/igscraper/benchmarks
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.igscraper.backends.selenium_backend import POST_TITLE_JS
+from src.igscraper.pages.profile_page import GRID_HREFS_JS
+from src.igscraper.utils import (
+    get_all_post_images_data,
+    get_section_with_highest_likes,
+    parse_visible_comments,
+)
+from .conftest import SIZES
+from .fixtures import PROFILE
+
+@pytest.mark.parametrize("posts", SIZES["grid"])
+def test_grid_hrefs(bench, open_fixture, posts):
+    driver = open_fixture("grid", posts)
+    hrefs = bench(driver.execute_script, GRID_HREFS_JS)
+    assert len(hrefs) == posts
+
+@pytest.mark.parametrize("slides", SIZES["carousel"])
+def test_carousel_images(bench, open_fixture, slides):
+    driver = open_fixture("carousel", slides)
+    images = bench(get_all_post_images_data, driver)
+    assert len(images) == slides
+
+@pytest.mark.parametrize("comments", SIZES["comments"])
+def test_comment_parser(bench, open_fixture, comments):
+    driver = open_fixture("comments", comments)
+    parsed = bench(parse_visible_comments, driver)
+    assert len(parsed) == comments
+
+@pytest.mark.parametrize("comments", SIZES["comments"])
+def test_likes_section(bench, open_fixture, comments):
+    driver = open_fixture("comments", comments)
+    likes = bench(get_section_with_highest_likes, driver)
+    assert likes["likesText"] == "98,765 likes"
+
+@pytest.mark.parametrize("comments", SIZES["comments"])
+def test_title_finder(bench, open_fixture, comments):
+    driver = open_fixture("comments", comments)
+    title = bench(driver.execute_script, POST_TITLE_JS, f"/{PROFILE}/")
+    assert title["timeDatetime"] == "2024-05-01T10:00:00.000Z"
@@ -0,0 +1,106 @@
+"""
+Throughput benchmarks of the result writers and the resume scan on a synthetic corpus.
+
+    pip install pytest-benchmark
+    IGSCRAPER_BENCH_SCALES=10000,1000000 python -m pytest src/igscraper/benchmarks/test_bench_io.py
+"""
+import itertools
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+if not os.environ.get("IGSCRAPER_BENCH_SCALES"):
+    pytest.skip("set IGSCRAPER_BENCH_SCALES to run the I/O benchmarks", allow_module_level=True)
+
+from src.igscraper.utils import save_intermediate, save_scrape_results
+from .conftest import bench_scales
+from .corpus import generate_posts, write_corpus
+
+SCALES = bench_scales()
+SAVE_EVERY = 5
+
+@pytest.fixture(scope="module")
+def sample_records():
+    """A pool of records the write benchmarks cycle through, so generation is not timed."""
+    return list(generate_posts(1000, seed=1))
+
+@pytest.fixture(scope="module")
+def corpora(tmp_path_factory):
+    """Generated metadata files, one per scale, created on first use."""
+    directory = tmp_path_factory.mktemp("corpus")
+    paths = {}
+    def get(scale):
+        if scale not in paths:
+            paths[scale] = write_corpus(directory / f"metadata_{scale}.jsonl", scale)
+        return paths[scale]
+    return get
+
+def _rounds(scale):
+    return 3 if scale <= 10_000 else 1
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_write_results(bench_once, benchmark, sample_records, tmp_path, scale):
+    """save_scrape_results every SAVE_EVERY posts, as scrape_posts_in_batches does."""
+    outputs = itertools.count()
+
+    def setup():
+        n = next(outputs)
+        config = SimpleNamespace(data=SimpleNamespace(
+            metadata_path=str(tmp_path / f"metadata_{n}.jsonl"),
+            skipped_path=str(tmp_path / f"skipped_{n}.jsonl"),
+        ))
+        return (config,), {}
+
+    def write(config):
+        results = {"scraped_posts": [], "skipped_posts": []}
+        for record in itertools.islice(itertools.cycle(sample_records), scale):
+            results["scraped_posts"].append(record)
+            if len(results["scraped_posts"]) == SAVE_EVERY:
+                save_scrape_results(results, str(tmp_path), config)
+        save_scrape_results(results, str(tmp_path), config)
+
+    bench_once(write, setup=setup, rounds=_rounds(scale))
+    benchmark.extra_info["posts_per_second"] = round(scale / benchmark.stats.stats.mean)
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_write_intermediate(bench_once, benchmark, sample_records, tmp_path, scale):
+    """save_intermediate for every post (the crash-recovery tmp file)."""
+    outputs = itertools.count()
+
+    def setup():
+        return (str(tmp_path / f"tmp_{next(outputs)}.jsonl"),), {}
+
+    def write(tmp_file):
+        for record in itertools.islice(itertools.cycle(sample_records), scale):
+            save_intermediate(record, tmp_file)
+
+    bench_once(write, setup=setup, rounds=_rounds(scale))
+    benchmark.extra_info["posts_per_second"] = round(scale / benchmark.stats.stats.mean)
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_resume_scan(bench_once, benchmark, corpora, make_backend, scale):
+    """_load_processed_urls over a metadata file of `scale` posts."""
+    path = str(corpora(scale))
+    backend = make_backend()
+    processed = bench_once(backend._load_processed_urls, setup=lambda: ((path,), {}), rounds=_rounds(scale))
+    assert len(processed) == scale
+    benchmark.extra_info["posts_per_second"] = round(scale / benchmark.stats.stats.mean)
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_export_scan(bench_once, benchmark, corpora, scale):
+    """Decoding every record of a metadata file, the floor for any export of it."""
+    path = corpora(scale)
+
+    def read_all(path):
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                json.loads(line)
+                count += 1
+        return count
+
+    assert bench_once(read_all, setup=lambda: ((path,), {}), rounds=_rounds(scale)) == scale
+    benchmark.extra_info["posts_per_second"] = round(scale / benchmark.stats.stats.mean)
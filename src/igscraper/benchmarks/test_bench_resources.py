@@ -0,0 +1,81 @@
+"""
+The resource policy (`block_resources`) against a post page with a video and a web font.
+
+The page is served from a local HTTP server that records every request, so the
+test checks which resources the browser fetched with and without the policy,
+and that the post extraction returns the same data either way. The page load
+time of both is benchmarked.
+
+    pip install pytest-benchmark
+    python -m pytest src/igscraper/benchmarks/test_bench_resources.py
+"""
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.igscraper.chrome import apply_resource_policy, blocked_url_patterns
+from src.igscraper.utils import get_all_post_images_data, get_section_with_highest_likes
+from .fixtures import post_with_media_html
+
+SLIDES = 10
+MEDIA_FILES = {"clip.mp4", "font.woff2"}
+
+class RecordingHandler(SimpleHTTPRequestHandler):
+    """Serves the fixture directory and records the requested file names."""
+    def __init__(self, *args, requested, **kwargs):
+        self.requested = requested
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self.requested.append(self.path.lstrip("/").split("?")[0])
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def media_server(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("media_post")
+    (directory / "post.html").write_text(post_with_media_html(SLIDES), encoding="utf-8")
+    (directory / "clip.mp4").write_bytes(bytes(2 * 1024 * 1024))
+    (directory / "font.woff2").write_bytes(bytes(64 * 1024))
+    requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(RecordingHandler, directory=str(directory), requested=requested))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requested
+    server.shutdown()
+
+def _fetched_media(requested, wait):
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline and not MEDIA_FILES <= set(requested):
+        time.sleep(0.05)
+    return MEDIA_FILES & set(requested)
+
+@pytest.mark.parametrize("blocked", [[], ["media", "font"]], ids=["none", "media_font"])
+def test_post_with_resource_policy(bench_once, benchmark, chrome, media_server, blocked):
+    base_url, requested = media_server
+    counter = iter(range(1_000_000))
+    try:
+        apply_resource_policy(chrome, blocked_url_patterns(blocked))
+
+        def setup():
+            requested.clear()
+            return (f"{base_url}/post.html?round={next(counter)}",), {}
+
+        bench_once(chrome.get, setup=setup, rounds=3)
+
+        # the resources of the policy are never requested; everything else is
+        assert _fetched_media(requested, wait=5) == (set() if blocked else MEDIA_FILES)
+        assert "post.html" in requested
+        benchmark.extra_info["fetched"] = sorted(set(requested))
+
+        # extraction only reads the DOM, so it is unaffected
+        assert len(get_all_post_images_data(chrome)) == SLIDES
+        assert get_section_with_highest_likes(chrome)["likesText"] == "1,234 likes"
+    finally:
+        apply_resource_policy(chrome, [])
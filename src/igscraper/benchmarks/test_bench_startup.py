@@ -0,0 +1,59 @@
+"""
+Browser startup: chromedriver resolution and launch, without logging in.
+
+`test_resolve_driver_cached` times `resolve_chromedriver` on a cache hit, the
+path every start takes while the installed Chrome version is unchanged.
+`test_backend_start` times `SeleniumBackend.start` with the login skipped; the
+first start resolves the driver with webdriver-manager (network) and fills the
+cache, the timed ones reuse it. The per-stage `startup_timings` of the first
+start and the mean of the timed ones are kept in `extra_info`.
+
+    pip install pytest-benchmark
+    python -m pytest src/igscraper/benchmarks/test_bench_startup.py
+"""
+import json
+from collections import defaultdict
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.igscraper.chrome import installed_chrome_version, resolve_chromedriver
+
+def test_resolve_driver_cached(bench, tmp_path):
+    driver_binary = tmp_path / "chromedriver"
+    driver_binary.write_text("")
+    cache_file = tmp_path / "chromedriver_cache.json"
+    cache_file.write_text(json.dumps({"chrome_version": installed_chrome_version(), "driver_path": str(driver_binary)}))
+    assert bench(resolve_chromedriver, str(cache_file)) == str(driver_binary)
+
+def test_backend_start(bench_once, benchmark, make_backend):
+    if installed_chrome_version() is None:
+        pytest.skip("Chrome is not installed")
+    running = []
+    stages = defaultdict(list)
+
+    def setup():
+        while running:
+            running.pop().driver.quit()
+        backend = make_backend(headless=True)
+        backend._load_cookie_store = lambda: None
+        backend._login = lambda: None
+        return (backend,), {}
+
+    def start(backend):
+        backend.start()
+        running.append(backend)
+        for stage, seconds in backend.startup_timings.items():
+            stages[stage].append(seconds)
+
+    try:
+        (first,), _ = setup()
+        start(first)
+        benchmark.extra_info["first_start"] = {stage: round(s[0], 3) for stage, s in stages.items()}
+        stages.clear()
+        bench_once(start, setup=setup, rounds=3)
+        benchmark.extra_info["cached_start"] = {stage: round(sum(s) / len(s), 3) for stage, s in stages.items()}
+    finally:
+        for backend in running:
+            backend.driver.quit()
@@ -0,0 +1,65 @@
+"""
+Post tab handling: the tab pool against opening and closing a tab per post.
+
+Each round loads `POSTS` carousel fixture pages the way the batch scraper does,
+either in pooled tabs (`TabPool.open` / `release`) or in a new tab per post
+(`open_href_in_new_tab` / `_close_tab_and_switch_back`). Besides the timing,
+`extra_info` holds the posts per second and the Chrome RSS after the round and
+its growth during it (None without psutil).
+
+    pip install pytest-benchmark psutil
+    python -m pytest src/igscraper/benchmarks/test_bench_tabs.py
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.igscraper.backends.memory_watchdog import browser_rss_mb
+from src.igscraper.backends.tab_pool import TabPool
+
+POSTS = 20
+POOL_SIZE = 3
+
+def _wait_loaded(driver, handle, url):
+    driver.switch_to.window(handle)
+    WebDriverWait(driver, 10, poll_frequency=0.05).until(
+        lambda d: d.execute_script("return location.href === arguments[0] && document.readyState === 'complete';", url)
+    )
+
+def _scrape_pooled(backend, urls):
+    pool = TabPool(backend, POOL_SIZE, recycle_after=POSTS)
+    main = backend.driver.current_window_handle
+    for url in urls:
+        handle = pool.open(url)
+        _wait_loaded(backend.driver, handle, url)
+        pool.release(handle, main)
+    for tab in pool.tabs:
+        backend.driver.switch_to.window(tab.handle)
+        backend.driver.close()
+    backend.driver.switch_to.window(main)
+
+def _scrape_open_close(backend, urls):
+    main = backend.driver.current_window_handle
+    for url in urls:
+        handle = backend.open_href_in_new_tab(url, 4)
+        _wait_loaded(backend.driver, handle, url)
+        backend._close_tab_and_switch_back(handle, main, debug=False)
+
+@pytest.mark.parametrize("mode", ["pool", "open_close"])
+def test_post_tabs(bench_once, benchmark, chrome, fixture_paths, make_backend, mode):
+    backend = make_backend(chrome, tab_pool_size=POOL_SIZE if mode == "pool" else 0)
+    urls = [f"{fixture_paths['carousel'][10].as_uri()}?post={i}" for i in range(POSTS)]
+    scrape = _scrape_pooled if mode == "pool" else _scrape_open_close
+
+    rss_before = browser_rss_mb(chrome)
+    bench_once(scrape, setup=lambda: ((backend, urls), {}), rounds=3)
+    rss_after = browser_rss_mb(chrome)
+
+    benchmark.extra_info["posts_per_second"] = round(POSTS / benchmark.stats.stats.mean, 2)
+    benchmark.extra_info["chrome_rss_mb"] = rss_after
+    benchmark.extra_info["chrome_rss_growth_mb"] = (
+        round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None
+    )
+    assert chrome.window_handles == [chrome.current_window_handle]
@@ -1,88 +1,248 @@
-from selenium import webdriver
-from urllib.parse import urlparse
-import time
-import threading
+import json
+import os
+import re
+import shutil
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .urls import classify_url
 
 # ---------------------------
 # URL validator
 # ---------------------------
-from urllib.parse import urlparse
 
 def is_allowed_instagram_url(url: str) -> bool:
-    # Allow blank/empty tabs
-    if url in ("about:blank", "data:,"):
-        return True
+    # Blank tabs, the homepage, profiles and (nested) post pages are allowed
+    return classify_url(url).allowed
+
+def _check_page(url):
+    if not is_allowed_instagram_url(url):
+        print(f"⚠️ Suspicious navigation: {url}")
+        input("Press Enter to continue after checking...")
 
-    parsed = urlparse(url)
-    if parsed.netloc != "www.instagram.com":
-        return False
-    
-    path_parts = [p for p in parsed.path.strip("/").split("/") if p]
+# ---------------------------
+# Chromedriver resolution
+# ---------------------------
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
 
-    # Case 1: homepage (/)
-    if not path_parts:
-        return True
+def installed_chrome_version() -> Optional[str]:
+    """Returns the locally installed Chrome version (e.g. "117.0.5938.150"), or None if unknown."""
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not path:
+            continue
+        try:
+            output = subprocess.run(
+                [path, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"\d+(?:\.\d+){1,3}", output)
+        if match:
+            return match.group(0)
+    return None
 
-    # Case 2: post page (/p/{id}/)
-    if len(path_parts) == 2 and path_parts[0] == "p":
-        return True
+def resolve_chromedriver(cache_file: str, offline: bool = True) -> Optional[str]:
+    """
+    Returns the path of a chromedriver binary matching the installed Chrome.
 
-    # Case 3: profile page (/{username}/)
-    if len(path_parts) == 1:
-        return True
+    The resolved path is cached in `cache_file`, keyed by the Chrome version.
+    While the installed Chrome version matches the cached one (or cannot be
+    determined) and the binary still exists, no network access happens.
+    Otherwise, or when `offline` is False, the driver is resolved again with
+    webdriver-manager and the cache is updated.
 
-    # Case 4: nested post under profile (/{username}/p/{id}/)
-    if len(path_parts) == 3 and path_parts[1] == "p":
-        return True
+    Returns:
+        The chromedriver path, or None if it could not be resolved.
+    """
+    chrome_version = installed_chrome_version()
+    cache_path = Path(cache_file)
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = {}
 
-    return False
+    driver_path = cached.get("driver_path")
+    if (
+        offline
+        and driver_path
+        and os.path.isfile(driver_path)
+        and chrome_version in (None, cached.get("chrome_version"))
+    ):
+        return driver_path
 
-def _check_page(url):
-    if not is_allowed_instagram_url(url):
-        print(f"⚠️ Suspicious navigation: {url}")
-        input("Press Enter to continue after checking...")
+    from webdriver_manager.chrome import ChromeDriverManager
+    try:
+        driver_path = ChromeDriverManager().install()
+    except Exception:
+        return None
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"chrome_version": chrome_version, "driver_path": driver_path}),
+        encoding="utf-8",
+    )
+    return driver_path
+
+# ---------------------------
+# CDP events via the performance log
+# ---------------------------
+def enable_cdp_event_log(options, network: bool = False):
+    """
+    Makes chromedriver record CDP events in the "performance" log.
+
+    Page events are always recorded. Network events are only recorded when
+    `network` is True, since they make up the bulk of the log.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option(
+        "perfLoggingPrefs", {"enableNetwork": network, "enablePage": True}
+    )
+    return options
+
+class CdpEventLog:
+    """
+    Drains the performance log of one driver and dispatches CDP events.
+
+    Chrome buffers the events, so a single `poll()` round trip delivers every
+    event since the previous poll to the listeners subscribed to its method.
+    Listeners are called with the event params and the id of the tab (CDP
+    target) the event came from.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        self.listeners = defaultdict(list)
+
+    def subscribe(self, method: str, callback: Callable[[dict, Optional[str]], None]) -> None:
+        """Calls `callback(params, target_id)` for every event named `method` (e.g. "Page.frameNavigated")."""
+        self.listeners[method].append(callback)
+
+    def poll(self) -> int:
+        """Fetches and dispatches the buffered events. Returns the number of events read."""
+        entries = self.driver.get_log("performance")
+        for entry in entries:
+            try:
+                record = json.loads(entry["message"])
+                message = record["message"]
+            except (KeyError, ValueError):
+                continue
+            for callback in self.listeners.get(message.get("method"), ()):
+                callback(message.get("params", {}), record.get("webview"))
+        return len(entries)
+
+# ---------------------------
+# Resource policy
+# ---------------------------
+# URL patterns passed to Network.setBlockedURLs for each blockable resource type.
+# Extraction only reads DOM attributes (src, alt, ...), so the bytes behind them
+# are never needed.
+BLOCKED_URL_PATTERNS = {
+    "media": ["*.mp4*", "*.m4s*", "*.m4a*", "*.m4v*", "*.webm*", "*.mp3*", "*.m3u8*", "*.mpd*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.heic*"],
+}
+
+def blocked_url_patterns(resource_types) -> list:
+    """Returns the URL patterns for the given resource types (e.g. ["media", "font"])."""
+    unknown = set(resource_types) - set(BLOCKED_URL_PATTERNS)
+    if unknown:
+        raise ValueError(f"Unknown resource types to block: {sorted(unknown)}")
+    return [p for t in resource_types for p in BLOCKED_URL_PATTERNS[t]]
+
+def apply_resource_policy(driver, patterns: list) -> None:
+    """
+    Blocks requests matching `patterns` in the driver's current tab.
+
+    CDP network settings are per target, so this has to run once for every tab,
+    before the tab navigates to the page whose resources should be skipped.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+# ---------------------------
+# Navigation guard
+# ---------------------------
+class NavigationGuard:
+    """
+    Checks every top-level navigation of a driver against the URL allowlist.
+
+    Navigations are observed through CDP `Page.frameNavigated` (and
+    `Page.navigatedWithinDocument` for in-app route changes) instead of asking
+    the driver for `current_url` after every command. Navigations to pages
+    outside the allowlist are remembered per tab (CDP target) until `reset()`,
+    so a post whose tab was redirected can be discarded instead of saved.
+    """
+    def __init__(self, event_log: CdpEventLog):
+        self.event_log = event_log
+        self.suspicious = defaultdict(list)  # target id -> suspicious URLs
+        event_log.subscribe("Page.frameNavigated", self._on_frame_navigated)
+        event_log.subscribe("Page.navigatedWithinDocument", self._on_navigated_within_document)
+
+    def _on_frame_navigated(self, params: dict, target_id: Optional[str] = None) -> None:
+        frame = params.get("frame", {})
+        # Only the top-level frame matters; iframes carry a parentId
+        if not frame.get("parentId"):
+            self._check(frame.get("url", ""), target_id)
+
+    def _on_navigated_within_document(self, params: dict, target_id: Optional[str] = None) -> None:
+        self._check(params.get("url", ""), target_id)
+
+    def _check(self, url: str, target_id: Optional[str]) -> None:
+        if not is_allowed_instagram_url(url):
+            self.suspicious[target_id].append(url)
+        _check_page(url)
+
+    def current_target(self) -> str:
+        """The CDP target id of the driver's current tab."""
+        return self.event_log.driver.execute_cdp_cmd("Target.getTargetInfo", {})["targetInfo"]["targetId"]
+
+    def check(self, target_id: Optional[str] = None) -> List[str]:
+        """
+        Validates every navigation recorded since the last check.
+
+        Returns:
+            The suspicious URLs navigated to since the last `reset()`, in the tab
+            `target_id`, or in any tab if it is None (empty if there were none).
+        """
+        self.event_log.poll()
+        if target_id is not None:
+            return list(self.suspicious.get(target_id, ()))
+        return [url for urls in self.suspicious.values() for url in urls]
+
+    def reset(self, target_id: Optional[str] = None) -> None:
+        """Forgets the suspicious navigations of a tab (or of all tabs), e.g. before it loads the next post."""
+        if target_id is None:
+            self.suspicious.clear()
+        else:
+            self.suspicious.pop(target_id, None)
 
 # ---------------------------
 # Patch WebDriver.get
 # ---------------------------
-def patch_driver(driver):
+def patch_driver(driver, event_log: CdpEventLog = None):
+    """
+    Installs a navigation guard on this driver instance.
+
+    Only the instance's `get` is wrapped; other navigations (clicks, scripts)
+    are picked up from the event log on the next `driver.navigation_guard.check()`.
+    The driver must have been created with `enable_cdp_event_log` options.
+    """
+    guard = NavigationGuard(event_log or CdpEventLog(driver))
+
     original_get = driver.get
     def safe_get(url, *args, **kwargs):
         result = original_get(url, *args, **kwargs)
-        _check_page(driver.current_url)
+        guard.check()
         return result
     driver.get = safe_get
+    driver.navigation_guard = guard
 
-    # ---------------------------
-    # Patch WebElement.click
-    # ---------------------------
-    original_click = webdriver.remote.webelement.WebElement.click
-    def safe_click(self, *args, **kwargs):
-        result = original_click(self, *args, **kwargs)
-        _check_page(self.parent.current_url)
-        return result
-    webdriver.remote.webelement.WebElement.click = safe_click
-
-    # ---------------------------
-    # Patch execute_script
-    # ---------------------------
-    original_exec = driver.execute_script
-    def safe_exec(script, *args, **kwargs):
-        result = original_exec(script, *args, **kwargs)
-        _check_page(driver.current_url)
-        return result
-    driver.execute_script = safe_exec
-
-    # ---------------------------
-    # Background watchdog thread
-    # ---------------------------
-    def watchdog():
-        while True:
-            try:
-                _check_page(driver.current_url)
-                time.sleep(1)
-            except Exception:
-                break
-    threading.Thread(target=watchdog, daemon=True).start()
-
-    return driver
\ No newline at end of file
+    return driver
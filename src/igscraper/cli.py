@@ -4,6 +4,9 @@ Command-line interface for the Instagram Profile Scraper.
 This script serves as the main entry point for running the scraper from the
 command line. It handles parsing command-line arguments and initiating the
 scraping pipeline.
+
+Heavy modules (the pipeline, selenium) are imported only by the commands that
+scrape, so `--help`, `validate` and `stats` start quickly.
 """
 import argparse
 import sys
@@ -16,7 +19,7 @@ src_path = Path(__file__).resolve().parent.parent
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
-from igscraper.pipeline import Pipeline
+from igscraper.profiling import PROFILERS
 
 def main():
     """
@@ -28,15 +31,101 @@ def main():
 
     Arguments:
         --config (str): Required. Path to the configuration file (e.g., 'config.toml').
-        --dry-run (bool): Optional. If present, runs the pipeline in a test mode.
+        --dry-run (bool): Optional. If present, prints the work plan (posts left to
+            scrape, estimated time and output size) without starting the browser.
+        --profile (str): Optional. Runs the pipeline (or the --profile-post extraction)
+            under "cprofile", "pyinstrument" or "tracemalloc" and writes the report
+            to the log directory.
+        --profile-post (int): Optional. Scrapes only the post at this 0-based index
+            (of the URL file, or of the first target profile) without saving it.
+
+    Commands (optional, after the options):
+        validate: Checks the config and cookie file, then exits.
+        stats: Prints the cached, scraped and skipped post counts per profile.
     """
     parser = argparse.ArgumentParser(description='Instagram Profile Scraper')
     parser.add_argument('--config', required=True, help='Path to config file')
-    parser.add_argument('--dry-run', action='store_true', help='Test without downloading')
+    parser.add_argument('--dry-run', action='store_true', help='Print the work plan without starting the browser')
+    parser.add_argument('--profile', choices=PROFILERS, help='Profile the run with this profiler')
+    parser.add_argument('--profile-post', type=int, metavar='N',
+                        help='Scrape only post N (0-based), profiling just its extraction')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('validate', help='Check the config and cookie file, then exit')
+    commands.add_parser('stats', help='Print cached, scraped and skipped post counts per profile')
     args = parser.parse_args()
 
+    if args.command == 'validate':
+        sys.exit(validate(args.config))
+    if args.command == 'stats':
+        sys.exit(stats(args.config))
+    if args.dry_run:
+        sys.exit(dry_run(args.config))
+
+    from igscraper.pipeline import Pipeline
+    from igscraper.config import resolve_log_dir
+    from igscraper.profiling import profile_call, profile_output_base
+
     pipeline = Pipeline(config_path=args.config, dry_run=args.dry_run)
-    pipeline.run()
+    if not args.profile and args.profile_post is None:
+        pipeline.run()
+        return
+
+    kind = args.profile or "cprofile"
+    log_dir = resolve_log_dir(pipeline.config.logging.log_dir, pipeline.config.data.output_dir)
+    run_name = pipeline.run_name if args.profile_post is None else f"{pipeline.run_name}_post{args.profile_post}"
+    output_base = profile_output_base(log_dir, kind, run_name)
+    try:
+        if args.profile_post is None:
+            profile_call(kind, output_base, pipeline.run)
+        else:
+            runner = lambda func, *func_args: profile_call(kind, output_base, func, *func_args)
+            pipeline.scrape_post(args.profile_post, runner=runner)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def validate(config_path: str) -> int:
+    """Loads the config and the cookie file; returns the exit code."""
+    from pydantic import ValidationError
+    from igscraper.config import load_config
+    from igscraper.cookies import load_cookies, CookieStoreError
+
+    try:
+        config = load_config(config_path)
+    except (OSError, ValidationError, ValueError) as e:
+        print(f"❌ Invalid config {config_path}: {e}")
+        return 1
+    try:
+        cookies = load_cookies(config.data.cookie_file)
+    except CookieStoreError as e:
+        if not config.main.user_data_dir:
+            print(f"❌ {e}")
+            return 1
+        print(f"⚠️ {e} The session in {config.main.user_data_dir} will be used instead.")
+    else:
+        print(f"✅ Cookie file {config.data.cookie_file}: {len(cookies)} cookies.")
+    print(f"✅ Config {config_path} is valid.")
+    return 0
+
+def stats(config_path: str) -> int:
+    """Prints the post counts of each profile from its output files; returns the exit code."""
+    from igscraper.config import load_config
+    from igscraper.stats import output_stats
+
+    for row in output_stats(load_config(config_path)):
+        print(
+            f"{row['name']}: {row['cached_urls']} cached URLs, {row['scraped']} scraped, "
+            f"{row['skipped']} skipped, {row['metadata_bytes'] / 1024 / 1024:.1f} MiB of metadata"
+        )
+    return 0
+
+def dry_run(config_path: str) -> int:
+    """Prints the work plan of the config; returns the exit code."""
+    from igscraper.config import load_config
+    from igscraper.planner import plan, format_plan
+
+    print(format_plan(plan(load_config(config_path))))
+    return 0
 
 if __name__ == '__main__':
     main()
@@ -1,7 +1,7 @@
 import toml
-from pydantic import Field, ValidationError, BaseModel
+from pydantic import Field, ValidationError, BaseModel, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Callable, Any, List
+from typing import Optional, Callable, Any, List, Literal
 from src.igscraper.logger import configure_root_logger, get_logger
 from pathlib import Path
 import logging
@@ -28,30 +28,75 @@ def resolve_path(path_str: str) -> Path:
         path = PROJECT_ROOT / path
     return path.resolve()
 
-def expand_paths(section, substitutions: dict) -> None:
+class PathTemplate:
     """
-    Recursively expands placeholders and resolves paths for string fields in a config section.
+    A config path with placeholders (e.g. "outputs/{target_profile}/posts.txt").
 
-    This function modifies the Pydantic model object in-place. It iterates through
-    the fields of a settings object. If a field is a string containing placeholders
-    (e.g., "{target_profile}"), it formats the string using the `substitutions`
-    dictionary and then resolves it to an absolute path. It also recurses into
-    nested Pydantic models.
+    The path is made absolute once, when the config is loaded, so expanding it
+    for a profile is a plain `str.format` without touching the filesystem.
+    """
+    __slots__ = ("template",)
 
-    Args:
-        section: A Pydantic BaseSettings object to process.
-        substitutions: A dictionary of key-value pairs for placeholder expansion.
-    """
-    for field, value in section.__dict__.items():
-        if isinstance(value, str):
-            # Expand placeholders if present
-            if "{" in value and "}" in value:
-                expanded = value.format(**substitutions)
-                # Make it absolute
-                setattr(section, field, str(resolve_path(expanded)))
-        elif isinstance(value, BaseSettings):
-            # Recurse into nested models (like DataConfig, MainConfig)
-            expand_paths(value, substitutions)
+    def __init__(self, value: str):
+        self.template = str(resolve_path(value))
+
+    def expand(self, substitutions: dict) -> str:
+        return self.template.format(**substitutions)
+
+def compile_path_templates(section) -> dict:
+    """Returns a `PathTemplate` for each string field of a config section that holds placeholders."""
+    return {
+        field: PathTemplate(value)
+        for field, value in section.__dict__.items()
+        if isinstance(value, str) and "{" in value and "}" in value
+    }
+
+class SectionView:
+    """
+    A read-only view of a config section with some fields replaced.
+
+    Other fields are read from the shared section, so a view costs one small
+    dict however large the section is.
+    """
+    __slots__ = ("_section", "_overrides")
+
+    def __init__(self, section, overrides: dict):
+        object.__setattr__(self, "_section", section)
+        object.__setattr__(self, "_overrides", overrides)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        overrides = object.__getattribute__(self, "_overrides")
+        if name in overrides:
+            return overrides[name]
+        return getattr(object.__getattribute__(self, "_section"), name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Config views are read-only (tried to set {name!r})")
+
+class ProfileConfig:
+    """
+    The config of one profile (or URL-file run), as returned by `Config.for_profile`.
+
+    `main.target_profile` is set to the profile and the path placeholders are
+    expanded; everything else is read from the shared config. Read-only.
+    """
+    __slots__ = ("_config", "target_profile", "main", "data", "logging", "metrics")
+
+    def __init__(self, config: "Config", name: str, sections: dict):
+        object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "target_profile", name)
+        for section, view in sections.items():
+            object.__setattr__(self, section, view)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(object.__getattribute__(self, "_config"), name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Config views are read-only (tried to set {name!r})")
 
 class ProfileTarget(BaseModel):
     """Represents a single profile to be scraped."""
@@ -81,12 +126,59 @@ class MainConfig(BaseSettings):
     batch_size: int = 4
     # If True, the batch size will be randomized slightly to appear more human.
     randomize_batch: bool = False
+    # If True (default), the cached chromedriver is used without any network access
+    # as long as the installed Chrome version is unchanged. False re-resolves it on
+    # every start.
+    offline_driver: bool = True
+    # Optional Chrome user-data-dir. If set, the browser profile (and its login
+    # session) persists between runs and cookie loading is skipped while valid.
+    user_data_dir: Optional[str] = None
     # Optional user-agent string for the browser.
     user_agent: Optional[str] = None
+    # How a newly opened post tab is considered ready for extraction:
+    # "event" waits for page signals (rendered post and readyState), "sleep" uses
+    # the legacy fixed random sleeps, including the 2-4.5 s pause before reading
+    # the post title, which "event" mode skips.
+    tab_ready_mode: Literal["event", "sleep"] = "event"
+    # Maximum time (in seconds) to wait for a post tab to become ready in "event" mode.
+    tab_ready_timeout: float = 10.0
+    # Resource types whose requests are blocked in post tabs ("media", "font", "image").
+    # Empty (default) blocks nothing and opens post tabs directly at their URL.
+    block_resources: List[str] = []
+    # If True, images are not downloaded at all. Image URLs and alt texts are still
+    # read from the DOM, so this only matters if the image bytes are never needed.
+    block_images: bool = False
+    # If True, JSON API responses received by post tabs are captured and comments
+    # (and media, if the DOM yields none) are parsed from them instead of the DOM,
+    # unless the payloads show more comment pages than were captured.
+    capture_network: bool = False
+    # Number of reusable post tabs kept open for the whole session. Posts are loaded
+    # into idle tabs in place instead of opening and closing a tab per post.
+    # 0 keeps the one-tab-per-post model.
+    tab_pool_size: int = 0
+    # A pooled tab is closed and replaced after this many posts.
+    tab_recycle_after: int = 50
+    # A pooled tab is also replaced when its JS heap exceeds this many MB (0 disables the check).
+    tab_recycle_heap_mb: int = 0
+    # Browser memory (RSS of all Chrome processes, in MB; needs psutil) above which the
+    # driver is restarted between batches. 0 disables the watchdog.
+    memory_limit_mb: int = 0
+    # JS heap of the profile page (in MB) above which the driver is restarted. Used
+    # when the RSS cannot be measured. 0 disables the check.
+    js_heap_limit_mb: int = 0
+    # If True, a live progress display (throughput, latency, skips) is shown while
+    # scraping. It is always off when stdout is not a terminal.
+    progress: bool = True
     # Duration (in seconds) for the simulated human mouse movement.
     human_mouse_move_duration: float = 0.5
     # Number of retries when scrolling the main profile page if no new content loads.
     page_scroll_retries: int = 3
+    # If True, an existing posts cache is refreshed by collecting only posts newer
+    # than the cached ones instead of being reused as-is.
+    incremental_refresh: bool = False
+    # Stop scrolling the profile once this many consecutive posts were already
+    # scraped in a previous run. 0 disables the early stop.
+    stop_after_processed: int = 0
     # Save scraped data to the final file after every N posts.
     save_every: int = 5
     # Number of retries when scrolling comments if no new content loads.
@@ -115,6 +207,8 @@ class DataConfig(BaseSettings):
     tmp_path: str
     # Path to the browser cookie file for authentication.
     cookie_file: str
+    # Path to the file caching the resolved chromedriver binary per Chrome version.
+    chromedriver_cache: str = "outputs/chromedriver_cache.json"
 
 class LoggingConfig(BaseSettings):
     """Configuration settings for logging."""
@@ -122,6 +216,20 @@ class LoggingConfig(BaseSettings):
     level: str
     # Optional: Directory to save log files.
     log_dir: Optional[str] = None
+    # If true, the log file is written as JSON lines (scraper_log_<ts>.jsonl).
+    json_lines: bool = False
+    # If true, records are handed to a background thread that formats and writes them.
+    async_logging: bool = True
+
+class MetricsConfig(BaseSettings):
+    """Configuration settings for per-stage timing metrics."""
+    # If True, scrape stages are timed and a summary is written at the end of a run.
+    enabled: bool = False
+    # If True, the summary is also written in Prometheus text format.
+    prometheus: bool = False
+    # If True, every WebDriver command is counted and timed by type and call site,
+    # and per-post and per-run round-trip reports are written.
+    roundtrips: bool = False
 
 class Config(BaseSettings):
     """
@@ -134,6 +242,40 @@ class Config(BaseSettings):
     main: MainConfig
     data: DataConfig
     logging: LoggingConfig
+    metrics: MetricsConfig = MetricsConfig()
+
+    # {section: {field: PathTemplate}}, compiled once by `compile_path_templates`
+    _path_templates: Optional[dict] = PrivateAttr(default=None)
+
+    def compile_path_templates(self) -> None:
+        """Compiles the path placeholders of all sections; `load_config` calls this once."""
+        self._path_templates = {
+            section: compile_path_templates(getattr(self, section)) for section in type(self).model_fields
+        }
+
+    def for_profile(self, name: str) -> ProfileConfig:
+        """
+        Returns the read-only config of one profile (or URL-file run) with its
+        path placeholders expanded. The config is not copied.
+        """
+        if self._path_templates is None:
+            self.compile_path_templates()
+        substitutions = {"target_profile": name}
+        sections = {}
+        for section, templates in self._path_templates.items():
+            overrides = {field: template.expand(substitutions) for field, template in templates.items()}
+            if section == "main":
+                overrides["target_profile"] = name
+            sections[section] = SectionView(getattr(self, section), overrides)
+        return ProfileConfig(self, name, sections)
+
+def resolve_log_dir(log_dir: Optional[str], output_dir: str = "outputs") -> Path:
+    """
+    Returns the absolute log directory: `log_dir` if set, otherwise `<output_dir>/logs`.
+    """
+    if log_dir:
+        return resolve_path(log_dir)
+    return resolve_path(output_dir) / "logs"
 
 def load_config(path: str) -> Config:
     """
@@ -149,23 +291,27 @@ def load_config(path: str) -> Config:
         data = toml.load(f)
 
     # Determine logging configuration from the raw TOML data
-    log_level = data.get("logging", {}).get("level", "INFO")
-    log_dir_path_str = data.get("logging", {}).get("log_dir")
-
-    if log_dir_path_str:
-        log_dir = resolve_path(log_dir_path_str)
-    else:
-        # Fallback to the 'outputs/logs' directory if not specified
-        output_dir = data.get("data", {}).get("output_dir", "outputs")
-        log_dir = resolve_path(output_dir) / "logs"
+    logging_data = data.get("logging", {})
+    log_level = logging_data.get("level", "INFO")
+    log_dir = resolve_log_dir(
+        logging_data.get("log_dir"),
+        data.get("data", {}).get("output_dir", "outputs"),
+    )
 
     # Configure logging once, using logging level from TOML
     # and placing logs in the specified directory.
-    configure_root_logger(level=log_level, log_dir=log_dir)
+    configure_root_logger(
+        level=log_level,
+        log_dir=log_dir,
+        json_lines=logging_data.get("json_lines", False),
+        async_logging=logging_data.get("async_logging", True),
+    )
 
     logger = get_logger("config")
     logger.debug("Configuration loaded successfully")
     
-    # Return the config object without path expansion.
-    # Path expansion will be handled per-profile in the pipeline.
-    return Config(**data)
+    # Path placeholders are compiled here and expanded per profile by
+    # `Config.for_profile` in the pipeline.
+    config = Config(**data)
+    config.compile_path_templates()
+    return config
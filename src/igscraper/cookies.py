@@ -0,0 +1,167 @@
+"""
+JSON cookie store for the browser login session.
+
+Cookies are saved by `login_Save_cookie.py` as a JSON document:
+
+    {"version": 1, "saved_at": <unix time>, "cookies": [{"name": ..., "value": ..., ...}]}
+
+Every cookie is validated on load, and the Instagram `sessionid` cookie is
+checked for expiry so an expired login fails before the browser is started.
+Legacy pickle files can be converted once with:
+
+    python -m src.igscraper.cookies migrate cookies_1758028035.025856.pkl
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, ValidationError, field_validator
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+COOKIE_STORE_VERSION = 1
+SESSION_COOKIE = "sessionid"
+
+class CookieStoreError(Exception):
+    """Raised when a cookie file is missing, malformed or holds an expired session."""
+
+class StoredCookie(BaseModel):
+    """One browser cookie, in the shape returned by Selenium's `get_cookies()`."""
+    name: str
+    value: str
+    domain: str
+    path: str = "/"
+    secure: bool = False
+    httpOnly: bool = False
+    # Unix timestamp; None for session cookies
+    expiry: Optional[int] = None
+    sameSite: Optional[str] = None
+
+    @field_validator("expiry", mode="before")
+    @classmethod
+    def _int_expiry(cls, value):
+        # Selenium sometimes reports expiry as a float
+        return int(value) if isinstance(value, float) else value
+
+    def is_expired(self, now: float) -> bool:
+        return self.expiry is not None and self.expiry <= now
+
+    def to_cdp(self) -> dict:
+        """Converts the cookie to a CDP `Network.CookieParam`."""
+        param = {
+            "name": self.name,
+            "value": self.value,
+            "domain": self.domain,
+            "path": self.path,
+            "secure": self.secure,
+            "httpOnly": self.httpOnly,
+        }
+        if self.expiry is not None:
+            param["expires"] = self.expiry
+        if self.sameSite in ("Strict", "Lax", "None"):
+            param["sameSite"] = self.sameSite
+        return param
+
+def load_cookies(path: str, now: Optional[float] = None) -> List[StoredCookie]:
+    """
+    Loads and validates a JSON cookie file.
+
+    Args:
+        path: The path to the cookie file.
+        now: The reference time for the expiry check (defaults to the current time).
+
+    Returns:
+        The unexpired cookies.
+
+    Raises:
+        CookieStoreError: If the file is missing, is not a valid cookie store, or
+            its `sessionid` cookie is missing or expired.
+    """
+    now = time.time() if now is None else now
+    if Path(path).suffix == ".pkl":
+        raise CookieStoreError(
+            f"{path} is a legacy pickle cookie file. Convert it with: "
+            f"python -m src.igscraper.cookies migrate {path}"
+        )
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise CookieStoreError(f"Cookie file {path} does not exist.")
+    except json.JSONDecodeError as e:
+        raise CookieStoreError(f"Cookie file {path} is not valid JSON: {e}")
+
+    if not isinstance(data, dict) or data.get("version") != COOKIE_STORE_VERSION:
+        raise CookieStoreError(f"Cookie file {path} is not a version {COOKIE_STORE_VERSION} cookie store.")
+    try:
+        cookies = [StoredCookie(**c) for c in data.get("cookies", [])]
+    except (TypeError, ValidationError) as e:
+        raise CookieStoreError(f"Cookie file {path} contains an invalid cookie: {e}")
+
+    session = next((c for c in cookies if c.name == SESSION_COOKIE), None)
+    if session is None:
+        raise CookieStoreError(f"Cookie file {path} has no '{SESSION_COOKIE}' cookie; log in again.")
+    if session.is_expired(now):
+        raise CookieStoreError(f"The session in {path} expired; log in again with login_Save_cookie.py.")
+
+    return [c for c in cookies if not c.is_expired(now)]
+
+def save_cookies(cookies: List[dict], path: str) -> None:
+    """
+    Validates browser cookies (as returned by `driver.get_cookies()`) and saves them as JSON.
+
+    Raises:
+        CookieStoreError: If a cookie does not match the schema.
+    """
+    try:
+        validated = [StoredCookie(**c) for c in cookies]
+    except (TypeError, ValidationError) as e:
+        raise CookieStoreError(f"Invalid cookie: {e}")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": COOKIE_STORE_VERSION,
+                "saved_at": int(time.time()),
+                "cookies": [c.model_dump() for c in validated],
+            },
+            f,
+            indent=2,
+        )
+
+def migrate_pickle(pkl_path: str, json_path: Optional[str] = None) -> str:
+    """
+    Converts a legacy pickle cookie file to the JSON cookie store.
+
+    Only run this on files you created yourself: unpickling executes code.
+
+    Returns:
+        The path of the written JSON file.
+    """
+    import pickle
+
+    json_path = json_path or str(Path(pkl_path).with_suffix(".json"))
+    with open(pkl_path, "rb") as f:
+        cookies = pickle.load(f)
+    save_cookies(cookies, json_path)
+    return json_path
+
+def main():
+    """Command-line entry point: `python -m src.igscraper.cookies migrate <file.pkl> [-o <file.json>]`."""
+    parser = argparse.ArgumentParser(description="Instagram scraper cookie store tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Convert a legacy .pkl cookie file to JSON")
+    migrate.add_argument("pkl_path", help="Path to the .pkl cookie file")
+    migrate.add_argument("-o", "--output", help="Path of the JSON file (default: same name, .json)")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        json_path = migrate_pickle(args.pkl_path, args.output)
+        print(f"✅ Cookies migrated to {json_path}. Update cookie_file in your config.")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,77 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
 import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-def configure_root_logger(level: str = "INFO", log_dir: Path = None) -> None:
-    """Configure the root logger with handlers and formatting."""
+_listener = None
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # traceback already rendered by _QueueHandler.prepare
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class _QueueHandler(QueueHandler):
+    """
+    Queues records with only the work that must happen on the logging thread.
+
+    The stock `prepare` runs the full formatter on the caller's thread. Here the
+    message is merged with its args and a traceback is rendered (both depend on
+    objects that may change or go away later); formatting is left to the
+    listener's handlers.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever `sys.stdout` is at the time, so a live progress display redirecting it stays below the logs."""
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def configure_root_logger(
+    level: str = "INFO",
+    log_dir: Path = None,
+    json_lines: bool = False,
+    async_logging: bool = True,
+) -> None:
+    """
+    Configure the root logger with handlers and formatting.
+
+    With `async_logging`, the root logger only puts records on a queue; a
+    background listener thread formats them and writes to stdout and the log
+    file, so the scraping thread never waits on I/O or formatting. With `json_lines`, the log
+    file is written as JSON lines (`.jsonl`) instead of plain text.
+    """
+    global _listener
     root = logging.getLogger()
 
     # Set level first, so handlers respect it
@@ -17,21 +84,37 @@ def configure_root_logger(level: str = "INFO", log_dir: Path = None) -> None:
         )
 
         # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = _StdoutHandler()
         console_handler.setFormatter(formatter)
-        root.addHandler(console_handler)
 
         # File handler
         if log_dir is None:
             log_dir = Path.cwd()
-        
+
         # Ensure the log directory exists
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / f"scraper_log_{int(time.time())}.log"
+        suffix = "jsonl" if json_lines else "log"
+        log_file = log_dir / f"scraper_log_{int(time.time())}.{suffix}"
         file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        root.addHandler(file_handler)
-        root.info(f"Logging to file: {log_file}")
+        file_handler.setFormatter(JsonLinesFormatter() if json_lines else formatter)
+
+        if async_logging:
+            log_queue = queue.SimpleQueue()
+            root.addHandler(_QueueHandler(log_queue))
+            _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop_logging)
+        else:
+            root.addHandler(console_handler)
+            root.addHandler(file_handler)
+        root.info("Logging to file: %s", log_file)
+
+def stop_logging() -> None:
+    """Flushes queued records and stops the background log listener, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 def get_logger(name: str = "igscraper") -> logging.Logger:
     """Get a named logger that inherits settings from root."""
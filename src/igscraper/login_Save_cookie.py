@@ -1,7 +1,16 @@
-import pickle
+import sys
+from pathlib import Path
 from time import time
 from selenium import webdriver
 
+# Add the project root to the Python path so the script can be run directly
+# (python3.11 src/igscraper/login_Save_cookie.py).
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.igscraper.cookies import save_cookies
+
 driver = webdriver.Chrome()
 driver.get("https://www.instagram.com/accounts/login/")
 
@@ -9,7 +18,7 @@ driver.get("https://www.instagram.com/accounts/login/")
 input("👉 After logging in successfully, press Enter here...")
 
 # Save cookies
-filename = f"src/igscraper/cookies_{time()}.pkl"
-pickle.dump(driver.get_cookies(), open(filename, "wb"))
+filename = f"src/igscraper/cookies_{time()}.json"
+save_cookies(driver.get_cookies(), filename)
 print(f"✅ Cookies saved to {filename}")
-
+driver.quit()
@@ -0,0 +1,175 @@
+"""
+Per-stage timing metrics for the scrape pipeline.
+
+Stages are timed with `timer`, either as a context manager or as a decorator:
+
+    with timer("title"):
+        ...
+
+    @timer("flush")
+    def save(...):
+        ...
+
+Timings are grouped by the current profile (see `Metrics.set_profile`) and
+summarized as histograms at the end of a run. While metrics are disabled, a
+timer only checks one flag and never reads the clock, so instrumentation can
+stay in the hot path.
+"""
+import functools
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (in seconds) of the exported Prometheus histogram buckets
+PROMETHEUS_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10)
+
+class _NullTimer:
+    """The timer handed out while metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class _StageTimer:
+    """Times one `with` block and records it under a stage name."""
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _TimerFactory:
+    """What `timer(stage)` returns: usable both in a `with` statement and as a decorator."""
+    __slots__ = ("metrics", "stage", "active")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+        self.active = None
+
+    def __enter__(self):
+        self.active = _StageTimer(self.metrics, self.stage) if self.metrics.enabled else _NULL_TIMER
+        return self.active.__enter__()
+
+    def __exit__(self, *exc):
+        return self.active.__exit__(*exc)
+
+    def __call__(self, func):
+        metrics, stage = self.metrics, self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with _StageTimer(metrics, stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+class Metrics:
+    """A registry of stage timings, grouped by profile."""
+    def __init__(self):
+        self.enabled = False
+        self.profile = "default"
+        self.timings: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    def configure(self, enabled: bool) -> None:
+        """Enables or disables recording. Recorded timings are kept."""
+        self.enabled = enabled
+
+    def set_profile(self, profile: str) -> None:
+        """Groups the following timings under `profile`."""
+        self.profile = profile
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self.profile = "default"
+
+    def timer(self, stage: str) -> "_TimerFactory":
+        """Returns a timer for `stage`, usable as a context manager or a decorator."""
+        return _TimerFactory(self, stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Records one duration (in seconds) for `stage` under the current profile."""
+        if self.enabled:
+            self.timings[self.profile][stage].append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, dict]]:
+        """Returns `{profile: {stage: histogram}}`, plus the total time per stage."""
+        # utils pulls in selenium; keep it out of the import path of the CLI
+        from .utils import timing_histogram
+
+        return {
+            profile: {stage: dict(timing_histogram(values), total=round(sum(values), 4))
+                      for stage, values in stages.items()}
+            for profile, stages in self.timings.items()
+        }
+
+    def slowest_stage(self, profile: str) -> Optional[str]:
+        """Returns the stage with the largest total time for `profile`."""
+        stages = self.timings.get(profile)
+        if not stages:
+            return None
+        return max(stages, key=lambda stage: sum(stages[stage]))
+
+    def to_prometheus(self) -> str:
+        """Renders the timings as Prometheus text-format histograms."""
+        lines = [
+            "# HELP igscraper_stage_seconds Time spent per scrape stage.",
+            "# TYPE igscraper_stage_seconds histogram",
+        ]
+        for profile, stages in self.timings.items():
+            for stage, values in stages.items():
+                labels = f'profile="{profile}",stage="{stage}"'
+                for le in PROMETHEUS_BUCKETS:
+                    count = sum(1 for v in values if v <= le)
+                    lines.append(f'igscraper_stage_seconds_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'igscraper_stage_seconds_bucket{{{labels},le="+Inf"}} {len(values)}')
+                lines.append(f"igscraper_stage_seconds_sum{{{labels}}} {sum(values):.6f}")
+                lines.append(f"igscraper_stage_seconds_count{{{labels}}} {len(values)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: Path, prometheus: bool = False) -> Optional[Path]:
+        """
+        Writes the summary to `output_dir` as JSON (and Prometheus text if requested).
+
+        Returns:
+            The path of the JSON summary, or None if nothing was recorded.
+        """
+        if not self.timings:
+            return None
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = int(time.time())
+        json_path = output_dir / f"metrics_{stamp}.json"
+        json_path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+        if prometheus:
+            (output_dir / f"metrics_{stamp}.prom").write_text(self.to_prometheus(), encoding="utf-8")
+        for profile in self.timings:
+            logger.info(f"Slowest stage for {profile}: {self.slowest_stage(profile)}")
+        logger.info(f"Stage timings written to {json_path}")
+        return json_path
+
+metrics = Metrics()
+
+def timer(stage: str):
+    """Times a stage on the global metrics registry (context manager or decorator)."""
+    return metrics.timer(stage)
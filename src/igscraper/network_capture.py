@@ -0,0 +1,284 @@
+"""
+Capture of the JSON API responses a post page fetches while it renders.
+
+Instagram loads comments, likes and media as structured JSON. When network
+capture is enabled, chromedriver records `Network.responseReceived` events in
+its performance log; `NetworkCapture` picks out the JSON API responses and
+reads their bodies with `Network.getResponseBody`. The parsers below turn those
+payloads into the same records the DOM scrapers produce.
+
+Only payloads about the post being scraped are used: a response must name its
+shortcode or media id (in the request URL or body, or in the payload), and the
+pending responses of a tab are dropped whenever the tab is closed or released,
+so late responses of one post never end up in the next post loaded in that tab.
+"""
+import base64
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .chrome import CdpEventLog
+from .logger import get_logger
+from .urls import shortcode_to_media_pk
+
+logger = get_logger(__name__)
+
+# Endpoints that carry post, comment and like data
+API_URL_RE = re.compile(r"/(?:api/v1|graphql|api/graphql)/")
+
+class NetworkCapture:
+    """
+    Collects the JSON API payloads received by each tab of a driver.
+
+    Response events are tracked per tab (CDP target) because post tabs load in
+    parallel; `collect()` only returns payloads fetched by the current tab, and
+    `discard()` drops what is left of a tab before it is closed or reused.
+    """
+    def __init__(self, driver, event_log: CdpEventLog, url_pattern: re.Pattern = API_URL_RE):
+        self.driver = driver
+        self.event_log = event_log
+        self.url_pattern = url_pattern
+        self.pending = defaultdict(list)  # target id -> [(request id, url, request body)]
+        # request id -> (target id, POST body of an API request, e.g. GraphQL variables)
+        self.request_bodies = {}
+        event_log.subscribe("Network.requestWillBeSent", self._on_request_will_be_sent)
+        event_log.subscribe("Network.responseReceived", self._on_response_received)
+        event_log.subscribe("Network.loadingFailed", self._on_loading_failed)
+
+    def _on_request_will_be_sent(self, params: dict, target_id: Optional[str] = None) -> None:
+        request = params.get("request", {})
+        if request.get("postData") and self.url_pattern.search(request.get("url", "")):
+            self.request_bodies[params.get("requestId")] = (target_id, request["postData"])
+
+    def _on_loading_failed(self, params: dict, target_id: Optional[str] = None) -> None:
+        # failed and cancelled requests never get a response
+        self.request_bodies.pop(params.get("requestId"), None)
+
+    def _on_response_received(self, params: dict, target_id: Optional[str] = None) -> None:
+        _, request_body = self.request_bodies.pop(params.get("requestId"), (None, ""))
+        response = params.get("response", {})
+        if "json" not in response.get("mimeType", "") and params.get("type") not in ("XHR", "Fetch"):
+            return
+        if not self.url_pattern.search(response.get("url", "")):
+            return
+        self.pending[target_id].append((params.get("requestId"), response.get("url"), request_body))
+
+    def _current_target(self) -> str:
+        return self.driver.execute_cdp_cmd("Target.getTargetInfo", {})["targetInfo"]["targetId"]
+
+    def collect(self, shortcode: Optional[str] = None) -> List[Any]:
+        """
+        Returns the decoded JSON payloads fetched by the current tab so far.
+
+        Each response is returned once; bodies that are no longer available or
+        are not JSON are skipped. Requests of the tab still in flight are
+        forgotten, since the post's data is read right after. With `shortcode`, only payloads about that post
+        are returned (see `payload_matches_post`).
+        """
+        self.event_log.poll()
+        target_id = self._current_target()
+        self._drop_request_bodies(target_id)
+        payloads = []
+        for request_id, url, request_body in self.pending.pop(target_id, []):
+            try:
+                result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                body = result.get("body", "")
+                if result.get("base64Encoded"):
+                    body = base64.b64decode(body).decode("utf-8")
+                payload = json.loads(body)
+            except Exception as e:
+                logger.debug("Could not read response body for %s: %s", url, e)
+                continue
+            if shortcode and not payload_matches_post(payload, shortcode, f"{url} {request_body}"):
+                logger.debug("Ignoring payload of %s: not about post %s", url, shortcode)
+                continue
+            payloads.append(payload)
+        logger.debug("Captured %s JSON payloads for target %s", len(payloads), target_id)
+        return payloads
+
+    def discard(self, target_id: Optional[str] = None) -> None:
+        """
+        Drops the pending responses of a tab (by default the current one).
+
+        Call it before the tab is closed or released to the tab pool; responses
+        still on their way would otherwise be kept for the whole run, or be
+        attributed to the next post loaded in the same tab.
+        """
+        self.event_log.poll()
+        target_id = target_id or self._current_target()
+        self._drop_request_bodies(target_id)
+        dropped = self.pending.pop(target_id, [])
+        if dropped:
+            logger.debug("Dropped %s uncollected responses", len(dropped))
+
+    def _drop_request_bodies(self, target_id: str) -> None:
+        """Forgets the bodies of a tab's requests that are still waiting for a response."""
+        for request_id in [r for r, (target, _) in self.request_bodies.items() if target == target_id]:
+            del self.request_bodies[request_id]
+
+def _walk(node: Any, key: Optional[str] = None) -> Iterator[Tuple[Optional[str], dict]]:
+    """Yields `(key, dict)` for every dict nested anywhere inside `node`, depth first."""
+    if isinstance(node, dict):
+        yield key, node
+        for child_key, value in node.items():
+            yield from _walk(value, child_key)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value, key)
+
+def _node_media_pk(node: dict) -> Optional[str]:
+    media_id = node.get("media_id")
+    return str(media_id).split("_")[0] if media_id else None
+
+def payload_matches_post(payload: Any, shortcode: str, request_text: str = "") -> bool:
+    """
+    Returns True if a payload is about the post `shortcode`.
+
+    It is if its request (URL or POST body, e.g. GraphQL variables) holds the
+    post's media id, or if the payload contains the post itself (by `code` /
+    `shortcode`) or objects of it (by `media_id`).
+    """
+    media_pk = shortcode_to_media_pk(shortcode)
+    if media_pk and media_pk in request_text:
+        return True
+    for _, node in _walk(payload):
+        if shortcode in (node.get("code"), node.get("shortcode")):
+            return True
+        if media_pk and _node_media_pk(node) == media_pk:
+            return True
+    return False
+
+def references_other_post(payload: Any, shortcode: str) -> bool:
+    """Returns True if a payload names a post (by shortcode or media id) other than `shortcode`."""
+    media_pk = shortcode_to_media_pk(shortcode)
+    for _, node in _walk(payload):
+        code = node.get("code") or node.get("shortcode")
+        if isinstance(code, str) and code != shortcode:
+            return True
+        node_pk = _node_media_pk(node)
+        if media_pk and node_pk and node_pk != media_pk:
+            return True
+    return False
+
+def comments_have_more_pages(payloads: List[Any]) -> bool:
+    """
+    Returns True if a captured comments payload says more comments can be loaded
+    (`page_info.has_next_page`, `has_more_comments` or a `next_max_id` cursor).
+    """
+    for payload in payloads:
+        for key, node in _walk(payload):
+            if key == "page_info" and node.get("has_next_page"):
+                return True
+            if node.get("has_more_comments") or node.get("has_more_headload_comments"):
+                return True
+            if node.get("next_max_id") or node.get("next_min_id"):
+                return True
+    return False
+
+def _is_comment(node: dict) -> bool:
+    author = node.get("user") or node.get("owner")
+    return (
+        isinstance(node.get("text"), str)
+        and isinstance(author, dict)
+        and "username" in author
+        and isinstance(node.get("created_at"), (int, float))
+    )
+
+def _format_likes(count: Optional[int]) -> Optional[str]:
+    if not count:
+        return None
+    return f"{count:,} like" + ("" if count == 1 else "s")
+
+# Units of the relative comment age Instagram renders in <time> (e.g. "5h", "2w")
+_AGE_UNITS = (("w", 7 * 24 * 3600), ("d", 24 * 3600), ("h", 3600), ("m", 60))
+
+def relative_age(created_at: float, now: float) -> str:
+    """Formats a comment timestamp the way the post page shows it: "30s", "5m", "3h", "2d", "12w"."""
+    seconds = max(int(now - created_at), 0)
+    for unit, length in _AGE_UNITS:
+        if seconds >= length:
+            return f"{seconds // length}{unit}"
+    return f"{seconds}s"
+
+def _comment_images(node: dict) -> List[str]:
+    gif = node.get("giphy_media_info") or {}
+    images = gif.get("images") or {}
+    for rendition in ("fixed_height", "original", "downsized"):
+        url = (images.get(rendition) or {}).get("url")
+        if url:
+            return [url]
+    return []
+
+def parse_comments_from_payloads(
+    payloads: List[Any], shortcode: Optional[str] = None, now: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extracts comments from captured API payloads.
+
+    Any object that has `text`, `created_at` and an author with a `username` is
+    treated as a comment, which covers both the REST (`comments[]`) and GraphQL
+    (`edges[].node`) shapes, including nested replies. With `shortcode`,
+    payloads that name another post are skipped.
+
+    Returns:
+        A list of comment dicts with the same keys and formats as
+        `scrape_comments_with_gif`: `handle`, `date` (the relative age shown on
+        the page, e.g. "2w", as of `now`, default the current time), `comment`,
+        `likes` and `commentImgs`. The exact time is added as `date_iso`
+        (ISO 8601, UTC), which the DOM scraper cannot provide.
+    """
+    now = time.time() if now is None else now
+    comments = []
+    seen = set()
+    for payload in payloads:
+        if shortcode and references_other_post(payload, shortcode):
+            continue
+        for key, node in _walk(payload):
+            # A post caption has the same shape as a comment
+            if key == "caption" or not _is_comment(node):
+                continue
+            author = node.get("user") or node.get("owner")
+            dedupe_key = (author["username"], node["text"], node["created_at"])
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+            likes = node.get("comment_like_count")
+            if likes is None:
+                likes = (node.get("edge_liked_by") or {}).get("count")
+            comments.append({
+                "handle": author["username"],
+                "date": relative_age(node["created_at"], now),
+                "date_iso": datetime.fromtimestamp(node["created_at"], tz=timezone.utc).isoformat(),
+                "comment": node["text"],
+                "likes": _format_likes(likes),
+                "commentImgs": _comment_images(node),
+            })
+    return comments
+
+def parse_media_from_payloads(payloads: List[Any], shortcode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Extracts post images from captured API payloads. With `shortcode`, payloads
+    that name another post are skipped.
+
+    Returns:
+        A list of `{"src", "alt"}` dicts, one per image (carousel slides
+        included), using the largest rendition of each.
+    """
+    images = []
+    seen = set()
+    for payload in payloads:
+        if shortcode and references_other_post(payload, shortcode):
+            continue
+        for _, node in _walk(payload):
+            candidates = (node.get("image_versions2") or {}).get("candidates")
+            if not candidates:
+                continue
+            src = candidates[0].get("url")
+            if not src or src in seen:
+                continue
+            seen.add(src)
+            images.append({"src": src, "alt": node.get("accessibility_caption")})
+    return images
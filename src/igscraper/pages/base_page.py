@@ -9,6 +9,11 @@ class BasePage:
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
 
+    def attach(self, driver: WebDriver) -> None:
+        """Rebinds the page object to a new driver, e.g. after a browser restart."""
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 10)
+
     def find(self, locator: tuple) -> WebElement:
         return self.wait.until(EC.presence_of_element_located(locator))
 
@@ -3,10 +3,11 @@ from .base_page import BasePage
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 import time, logging
-from typing import List
+from typing import Iterator, List, Optional
 from selenium.webdriver.support.ui import WebDriverWait
 
 from src.igscraper.utils import scrape_comments_with_gif,scroll_with_mouse,random_delay
+from src.igscraper.urls import ShortcodeSet
 from src.igscraper.logger import get_logger
 from typing import List
 from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
@@ -18,6 +19,18 @@ logger = get_logger(__name__)
 POST_SELECTOR = (By.CSS_SELECTOR, "main a[href^='/p/']")
 POST_MODAL_SELECTOR = (By.CSS_SELECTOR, "div[role='dialog']")
 
+# Collects the hrefs of every post link inside the `_ac7v` grid rows (3 posts per
+# row) in one round trip. `a.href` is already resolved to an absolute URL.
+GRID_HREFS_JS = """
+return Array.from(
+    document.querySelectorAll("._ac7v a[href]"),
+    a => a.href
+);
+"""
+# Pinned posts occupy the first grid row regardless of age, so a known shortcode
+# there does not mean the rest of the grid is already cached.
+PINNED_SLOTS = 3
+
 class ProfilePage(BasePage):
     """
     Represents an Instagram profile page and provides methods for interacting with it.
@@ -58,47 +71,97 @@ class ProfilePage(BasePage):
         # Instagram has posts in groups of 3 on the handle page.
         # each elements_with_class_xpath has 3 posts inside it
         elements_with_class_xpath = self.driver.find_elements(By.XPATH, xpath_for_class)
-        logging.info(f"Found {len(elements_with_class_xpath)} elements with class _ac7v")
+        logging.info("Found %s elements with class _ac7v", len(elements_with_class_xpath))
         ## flatten to get all posts
         all_href_elem = [row.find_elements(By.CSS_SELECTOR, "a") for row in elements_with_class_xpath]
         all_href_elem = [elem for sublist in all_href_elem for elem in sublist]  # flatten the list
         return all_href_elem
 
-    def scroll_and_collect_(self, limit: int) -> List[str]:
+    def get_visible_post_hrefs(self) -> List[str]:
         """
-        Scrolls down the profile page and collects unique post URLs.
+        Returns the hrefs of all post links currently rendered in the profile grid.
+
+        Unlike `get_visible_post_elements`, this harvests every href in a single
+        `execute_script` call instead of one `get_attribute` round trip per post,
+        so the cost per scroll step stays constant regardless of grid size.
+
+        Returns:
+            A list of absolute post URL strings in document order.
+        """
+        return self.driver.execute_script(GRID_HREFS_JS) or []
+
+    def iter_post_urls(
+        self,
+        limit: int,
+        stop_at: Optional[ShortcodeSet] = None,
+        processed: Optional[ShortcodeSet] = None,
+        stop_after_processed: int = 0,
+    ) -> Iterator[str]:
+        """
+        Scrolls down the profile page and yields unique post URLs as they are found.
 
         This method repeatedly scrolls the page to trigger the loading of more posts.
-        After each scroll, it collects the URLs of the visible posts, ensuring no
-        duplicates are added. The process stops when the desired limit is reached
-        or when no new posts are loaded after several retries.
+        After each scroll, it validates the navigations the scroll caused with the
+        driver's navigation guard, harvests the URLs of the visible posts in one
+        script call and yields the ones not seen before, so callers can start
+        working on them while the scroll continues. The process stops when:
+        - the desired limit is reached,
+        - no new posts are loaded after several retries,
+        - `stop_at` is given and a post whose shortcode is already known is
+          reached outside the pinned slots, or
+        - `processed` and `stop_after_processed` are given and that many
+          consecutive posts have already been processed.
 
         Args:
             limit: The target number of post URLs to collect.
-
-        Returns:
-            A list of unique post URL strings.
+            stop_at: Optional set of already-known posts. Collection stops at
+                     the first one found, since everything below it is older.
+            processed: Optional set of posts that were already scraped.
+            stop_after_processed: Length of the run of consecutive processed posts
+                                  after which the scroll stops. 0 disables it.
+
+        Yields:
+            Unique post URL strings, in grid order.
         """
-        posts = []
+        # keyed by shortcode, so /p/X/ and /user/p/X/ count as one post
+        seen = ShortcodeSet()
+        # every distinct post of the grid (reels included) and the first
+        # PINNED_SLOTS of them; the rendered rows shift as the grid is scrolled,
+        # so positions are counted across scroll steps
+        grid = ShortcodeSet()
+        pinned = ShortcodeSet()
+        processed_run = 0
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         retries = 0
 
         try:
-            while len(posts) < limit:
+            while len(seen) < limit:
                 try:
-                    new_posts = self.get_visible_post_elements()
-                    for post in new_posts:
-                        try:
-                            href = post.get_attribute("href")
-                            if href and "reel" not in href and href not in posts:
-                                posts.append(href)
-                                if len(posts) >= limit:
-                                    break
-                        except StaleElementReferenceException:
-                            logger.debug("Skipped stale element while extracting href.")
+                    for href in self.get_visible_post_hrefs():
+                        if href and href not in grid:
+                            if len(grid) < PINNED_SLOTS:
+                                pinned.add(href)
+                            grid.add(href)
+                        if stop_at and href in stop_at and href not in pinned:
+                            logger.info("Reached already cached post %s, stopping scroll.", href)
+                            return
+                        if not href or "reel" in href or href in seen:
                             continue
+                        seen.add(href)
+                        yield href
+                        if len(seen) >= limit:
+                            return
+                        if processed is not None and stop_after_processed:
+                            processed_run = processed_run + 1 if href in processed else 0
+                            if processed_run >= stop_after_processed:
+                                logger.info(
+                                    "Saw %s consecutive already processed posts, stopping scroll.", processed_run
+                                )
+                                return
 
                     scroll_with_mouse(self, steps=4)
+                    # validate any navigation the scroll triggered (one round trip)
+                    self.driver.navigation_guard.check()
 
                     new_height = self.driver.execute_script("return document.body.scrollHeight")
                     if new_height == last_height:
@@ -112,15 +175,31 @@ class ProfilePage(BasePage):
                     last_height = new_height
 
                 except WebDriverException as e:
-                    logger.error(f"Selenium error during scroll: {e}")
+                    logger.error("Selenium error during scroll: %s", e)
                     break
 
         except Exception as e:
-            logger.exception(f"Unexpected error in scroll_and_collect: {e}")
+            logger.exception("Unexpected error in scroll_and_collect: %s", e)
 
         finally:
-            logger.info(f"Collected {len(posts)} post URLs.")
-            return posts
+            logger.info("Collected %s post URLs.", len(seen))
+
+    def scroll_and_collect_(self, limit: int, stop_at: Optional[ShortcodeSet] = None) -> List[str]:
+        """
+        Scrolls down the profile page and collects unique post URLs.
+
+        A list-returning wrapper around `iter_post_urls`, which checks the
+        navigation guard after every scroll step.
+
+        Args:
+            limit: The target number of post URLs to collect.
+            stop_at: Optional set of already-known posts. Collection stops at
+                     the first one found, since everything below it is older.
+
+        Returns:
+            A list of unique post URL strings.
+        """
+        return list(self.iter_post_urls(limit, stop_at=stop_at))
 
     
     # def scroll_and_collect(self, limit: int) -> List[WebElement]:
@@ -5,12 +5,15 @@ This module orchestrates the entire scraping process, from loading the configura
 to initializing the backend, collecting post URLs, and scraping them in batches.
 """
 import os
-import copy
 import sys
 import random
 import traceback
-from .config import load_config, expand_paths, Config, ProfileTarget
-from .backends import SeleniumBackend
+from itertools import islice
+from typing import Callable, Optional
+from .config import load_config, resolve_log_dir, ProfileConfig, ProfileTarget
+from .urls import filter_new_posts
+from .metrics import metrics
+from .progress import RunProgress
 from .logger import get_logger
 from pathlib import Path
 
@@ -30,12 +33,38 @@ class Pipeline:
 
         Args:
             config_path: The file path to the TOML configuration file.
-            dry_run: A boolean flag for test runs (not currently implemented).
+            dry_run: If True, `run` only computes the work plan; no browser is
+                created.
         """
         self.config = load_config(config_path)
         self.dry_run = dry_run
-        self.backend = SeleniumBackend(self.config)
+        self.backend = None
         self.all_results = {}
+        metrics.configure(self.config.metrics.enabled)
+        self.progress = RunProgress(enabled=self.config.main.progress and not dry_run)
+        if not dry_run:
+            from .backends import SeleniumBackend
+            self.backend = SeleniumBackend(self.config)
+            self.backend.progress = self.progress
+
+    @property
+    def run_name(self) -> str:
+        """A name for this run: the URL-file run name, or the target profiles."""
+        if self._url_file_mode():
+            return self.config.main.run_name_for_url_file
+        return "+".join(t.name for t in self.config.main.target_profiles) or "run"
+
+    def _url_file_mode(self) -> bool:
+        return bool(self.config.data.urls_filepath and os.path.exists(self.config.data.urls_filepath))
+
+    def _run_config(self, name: str) -> ProfileConfig:
+        """
+        Returns the read-only config view of one profile (or URL-file run) with
+        its path placeholders expanded, and makes it the backend's config.
+        """
+        run_config = self.config.for_profile(name)
+        self.backend.config = run_config
+        return run_config
 
     def _scrape_single_profile(self, profile_target: ProfileTarget) -> dict:
         """
@@ -51,22 +80,15 @@ class Pipeline:
         num_posts_to_scrape = profile_target.num_posts
         results = {"scraped_posts": [], "skipped_posts": []}
 
+        metrics.set_profile(profile_name)
         try:
-            # Create a profile-specific config by copying the base and updating it
-            profile_config = copy.deepcopy(self.config)
-            profile_config.main.target_profile = profile_name # Needed for path expansion
-
-            # Update the backend's config and expand paths for the current profile
-            self.backend.config = profile_config 
-            substitutions = {"target_profile": profile_name}
-            expand_paths(profile_config, substitutions)
+            # Create a profile-specific config with its paths expanded
+            profile_config = self._run_config(profile_name)
 
             self.backend.open_profile(profile_name)
 
+            # A generator: scraping starts as soon as the first batch of URLs is found
             post_elements = self.backend.get_post_elements(num_posts_to_scrape)
-            if not post_elements:
-                logger.warning(f"No new posts to scrape for profile {profile_name}. Skipping.")
-                return results
 
             batch_size = profile_config.main.batch_size
             if profile_config.main.randomize_batch:
@@ -93,6 +115,7 @@ class Pipeline:
         run_name = self.config.main.run_name_for_url_file
         urls_filepath = self.config.data.urls_filepath
         logger.info(f"--- Starting URL file scrape for run: {run_name} ---")
+        metrics.set_profile(run_name)
 
         # Read URLs from the specified file
         try:
@@ -103,23 +126,18 @@ class Pipeline:
             logger.error(f"URL file not found at: {urls_filepath}")
             return {}
 
-        # Create a specific config for this run
-        run_config = copy.deepcopy(self.config)
-        run_config.main.target_profile = run_name # Used for path expansion
-
-        # Update backend config and expand paths
-        self.backend.config = run_config
-        substitutions = {"target_profile": run_name}
-        expand_paths(run_config, substitutions)
+        # Create a specific config for this run with its paths expanded
+        run_config = self._run_config(run_name)
 
-        # Filter out already processed URLs
+        # Filter out already processed URLs and duplicate variants of the same post
         processed = self.backend._load_processed_urls(run_config.data.metadata_path)
-        urls_to_scrape = [u for u in post_urls if u not in processed]
+        urls_to_scrape = filter_new_posts(post_urls, processed)
         logger.info(f"Found {len(urls_to_scrape)} new URLs to scrape after filtering.")
 
         if not urls_to_scrape:
             return {"scraped_posts": [], "skipped_posts": []}
 
+        self.progress.add_total(len(urls_to_scrape))
         batch_size = run_config.main.batch_size
         if run_config.main.randomize_batch:
             batch_size = random.randint(batch_size, batch_size + 4)
@@ -131,16 +149,23 @@ class Pipeline:
         Executes the main scraping pipeline for all configured target profiles.
 
         It starts the browser, iterates through each profile, scrapes it, and
-        then closes the browser session upon completion.
+        then closes the browser session upon completion. If metrics are enabled,
+        the stage timing summary and round-trip report are written at the end.
+        In dry-run mode, only the work plan is computed and logged.
 
         Returns:
-            A dictionary containing the aggregated results for all profiles.
+            A dictionary containing the aggregated results for all profiles, or
+            the plan of each profile in dry-run mode.
         """
+        if self.dry_run:
+            return self.plan()
+
         try:
             self.backend.start()
+            self.progress.start()
 
             # Check which mode to run in
-            if self.config.data.urls_filepath and os.path.exists(self.config.data.urls_filepath):
+            if self._url_file_mode():
                 # Mode 2: Scrape from a URL file
                 run_name = self.config.main.run_name_for_url_file
                 self.all_results[run_name] = self._scrape_from_url_file()
@@ -155,13 +180,87 @@ class Pipeline:
             logger.critical(f"A critical error occurred during pipeline setup or teardown: {e}")
             logger.debug(traceback.format_exc())
         finally:
+            self.progress.stop()
             # Stop the backend once after all profiles are processed
             if self.backend:
                 self.backend.stop()
                 logger.info("Browser has been closed.")
+            self._write_metrics()
 
         return self.all_results
 
+    def plan(self) -> dict:
+        """Computes and logs the work plan of each profile without starting a browser."""
+        from .planner import plan, format_plan
+
+        entries = plan(self.config)
+        logger.info("Dry run; nothing will be scraped.\n%s", format_plan(entries))
+        return {entry["name"]: entry for entry in entries}
+
+    def _post_url_at(self, index: int) -> Optional[str]:
+        """
+        Returns the URL of the post at `index` (0-based): the line of the URL file,
+        or the post in the first target profile's posts cache, or in its grid.
+        """
+        if self._url_file_mode():
+            self._run_config(self.config.main.run_name_for_url_file)
+            with open(self.config.data.urls_filepath, "r", encoding="utf-8") as f:
+                urls = [line.strip() for line in f if line.strip()]
+            return urls[index] if index < len(urls) else None
+
+        if not self.config.main.target_profiles:
+            return None
+        profile_name = self.config.main.target_profiles[0].name
+        run_config = self._run_config(profile_name)
+        urls = self.backend._load_cached_urls(run_config.data.posts_path)
+        if urls is None:
+            self.backend.open_profile(profile_name)
+            urls = self.backend.profile_page.iter_post_urls(index + 1)
+        return next(islice(urls, index, None), None)
+
+    def scrape_post(self, index: int, runner: Optional[Callable] = None) -> Optional[dict]:
+        """
+        Scrapes a single post in isolation, without saving anything.
+
+        Only the extraction is passed through `runner(func, *args)` (e.g. a
+        profiler); browser start, login and tab opening happen outside of it.
+
+        Args:
+            index: The 0-based index of the post (see `_post_url_at`).
+            runner: Optional callable that invokes the extraction.
+
+        Returns:
+            The scraped post data, or None if the post could not be scraped.
+        """
+        runner = runner or (lambda func, *args: func(*args))
+        try:
+            self.backend.start()
+            post_url = self._post_url_at(index)
+            if not post_url:
+                logger.error(f"No post found at index {index}.")
+                return None
+            main_handle = self.backend.driver.current_window_handle
+            tab_handle = self.backend.open_post_tab(post_url)
+            post_data, error_data = runner(
+                self.backend._scrape_and_close_tab, index, post_url, tab_handle, main_handle, False
+            )
+            if error_data:
+                logger.error(f"Scraping post {post_url} failed: {error_data['reason']}")
+            return post_data
+        finally:
+            self.backend.stop()
+
+    def _write_metrics(self) -> None:
+        """Writes the stage timing summary and round-trip report to the log directory, if enabled."""
+        log_dir = resolve_log_dir(self.config.logging.log_dir, self.config.data.output_dir)
+        try:
+            if self.config.metrics.enabled:
+                metrics.write(log_dir, prometheus=self.config.metrics.prometheus)
+            if self.backend.roundtrips:
+                self.backend.roundtrips.write_run_report()
+        except Exception as e:
+            logger.error(f"Failed to write metrics summary: {e}")
+
 def run_pipeline(config_path: str, dry_run: bool = False):
     """Legacy function wrapper to instantiate and run the Pipeline class."""
     pipeline = Pipeline(config_path, dry_run)
@@ -0,0 +1,141 @@
+"""
+Dry-run work plan (`cli.py --dry-run`).
+
+Works out what a run would do from the config and the files on disk, without
+starting a browser: per profile, the cached post URLs, how many of them are
+already in the metadata file, how many posts are left, and estimates of the
+run time and output size.
+
+The time per post comes from the stage timings of earlier runs
+(`metrics_*.json` in the log directory, written when `[metrics] enabled`);
+the output size per post from the existing metadata file. Without either,
+`DEFAULT_POST_SECONDS` and `DEFAULT_POST_BYTES` are used.
+"""
+import json
+import math
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import Config, resolve_log_dir
+from .stats import load_cached_urls, load_processed_urls
+from .urls import filter_new_posts
+
+# Fallbacks when there is no history to estimate from
+DEFAULT_POST_SECONDS = 12.0
+DEFAULT_POST_BYTES = 3000
+
+# Stages that are not timed once per post
+_NON_POST_STAGES = {"flush"}
+
+def historical_post_seconds(log_dir: Path, profile: Optional[str] = None) -> Optional[float]:
+    """
+    Mean scrape time per post from the `metrics_*.json` summaries in `log_dir`.
+
+    The timings of `profile` are used if there are any, otherwise those of all
+    profiles. Returns None if no summary holds per-post timings.
+    """
+    totals = {True: defaultdict(float), False: defaultdict(float)}
+    counts = {True: defaultdict(int), False: defaultdict(int)}
+    for path in Path(log_dir).glob("metrics_*.json"):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        for name, stages in summary.items():
+            for stage, histogram in stages.items():
+                if stage in _NON_POST_STAGES or not histogram.get("count"):
+                    continue
+                for own in {False, name == profile}:
+                    totals[own][stage] += histogram.get("total", 0.0)
+                    counts[own][stage] += histogram["count"]
+
+    for own in (True, False):
+        if counts[own]:
+            return sum(totals[own][stage] / counts[own][stage] for stage in counts[own])
+    return None
+
+def _post_bytes(metadata_path: str, posts: int) -> Optional[float]:
+    if posts and os.path.exists(metadata_path):
+        return os.path.getsize(metadata_path) / posts
+    return None
+
+def plan_run(config: Config, name: str, num_posts: Optional[int] = None, urls: Optional[List[str]] = None) -> Dict:
+    """
+    Plans one profile (or, with `urls`, one URL-file run).
+
+    Returns:
+        A dict with the counts (`cached_urls`, `already_scraped`, `pending`),
+        `batches`, `estimated_seconds` and `estimated_bytes`, and where the
+        estimates came from (`post_seconds_source`, `post_bytes_source`).
+    """
+    data = config.for_profile(name).data
+    processed = load_processed_urls(data.metadata_path)
+
+    cached = None
+    if urls is not None:
+        pending = len(filter_new_posts(urls, processed))
+    else:
+        cached = load_cached_urls(data.posts_path)
+        if cached is not None:
+            pending = len(filter_new_posts(cached, processed))
+        else:
+            # The grid is scrolled for up to `num_posts` posts, some of which may be scraped already
+            pending = max(num_posts - len(processed), 0)
+
+    main = config.main
+    batch_size = main.batch_size + (2 if main.randomize_batch else 0)
+    batches = math.ceil(pending / batch_size) if pending else 0
+    rate_limit = (main.rate_limit_seconds_min + main.rate_limit_seconds_max) / 2
+
+    log_dir = resolve_log_dir(config.logging.log_dir, data.output_dir)
+    post_seconds = historical_post_seconds(log_dir, name)
+    post_bytes = _post_bytes(data.metadata_path, len(processed))
+
+    return {
+        "name": name,
+        "cached_urls": len(cached) if cached is not None else None,
+        "already_scraped": len(processed),
+        "pending": pending,
+        "batches": batches,
+        "estimated_seconds": round(pending * (post_seconds or DEFAULT_POST_SECONDS) + batches * rate_limit, 1),
+        "post_seconds_source": "history" if post_seconds else "default",
+        "estimated_bytes": int(pending * (post_bytes or DEFAULT_POST_BYTES)),
+        "post_bytes_source": "metadata" if post_bytes else "default",
+        "metadata_path": data.metadata_path,
+    }
+
+def plan(config: Config) -> List[Dict]:
+    """Plans every run of the config, in the order the pipeline would scrape them."""
+    if config.data.urls_filepath and os.path.exists(config.data.urls_filepath):
+        with open(config.data.urls_filepath, "r", encoding="utf-8") as f:
+            urls = [line.strip() for line in f if line.strip()]
+        return [plan_run(config, config.main.run_name_for_url_file, urls=urls)]
+    return [plan_run(config, target.name, num_posts=target.num_posts) for target in config.main.target_profiles]
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s"
+
+def format_plan(entries: List[Dict]) -> str:
+    """Renders a plan as text, one block per profile plus a total."""
+    lines = []
+    for entry in entries:
+        cached = "no posts cache" if entry["cached_urls"] is None else f"{entry['cached_urls']} cached URLs"
+        lines.append(
+            f"{entry['name']}: {cached}, {entry['already_scraped']} already scraped, "
+            f"{entry['pending']} to scrape in {entry['batches']} batches"
+        )
+        lines.append(
+            f"    ~{_format_duration(entry['estimated_seconds'])} ({entry['post_seconds_source']} timings), "
+            f"~{entry['estimated_bytes'] / 1024 / 1024:.1f} MiB more in {entry['metadata_path']}"
+        )
+    total_seconds = sum(e["estimated_seconds"] for e in entries)
+    total_bytes = sum(e["estimated_bytes"] for e in entries)
+    lines.append(
+        f"Total: {sum(e['pending'] for e in entries)} posts, ~{_format_duration(total_seconds)}, "
+        f"~{total_bytes / 1024 / 1024:.1f} MiB"
+    )
+    return "\n".join(lines)
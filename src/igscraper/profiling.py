@@ -0,0 +1,97 @@
+"""
+Profiler hooks for the command line (`--profile`, `--profile-post`).
+
+`profile_call` runs a function under one of the supported profilers and writes
+the report next to the logs:
+
+- "cprofile": `<name>.prof` (for snakeviz / pstats) and `<name>.txt`, the top
+  functions by cumulative time.
+- "pyinstrument": `<name>.html` and `<name>.txt` (needs `pip install pyinstrument`).
+- "tracemalloc": `<name>.txt`, the top allocation sites and the peak memory.
+"""
+import io
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILERS = ("cprofile", "pyinstrument", "tracemalloc")
+
+def profile_output_base(log_dir: Path, kind: str, run_name: str) -> Path:
+    """Returns `<log_dir>/profile_<kind>_<run_name>_<timestamp>` (without extension)."""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", run_name)[:80] or "run"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / f"profile_{kind}_{safe_name}_{int(time.time())}"
+
+def profile_call(kind: str, output_base: Path, func: Callable, *args, **kwargs) -> Any:
+    """
+    Calls `func(*args, **kwargs)` under the `kind` profiler and writes its report.
+
+    Args:
+        kind: One of `PROFILERS`.
+        output_base: Path of the report files, without extension.
+
+    Returns:
+        Whatever `func` returns.
+
+    Raises:
+        ValueError: If `kind` is unknown.
+        RuntimeError: If the profiler is not installed.
+    """
+    if kind == "cprofile":
+        return _run_cprofile(output_base, func, *args, **kwargs)
+    if kind == "pyinstrument":
+        return _run_pyinstrument(output_base, func, *args, **kwargs)
+    if kind == "tracemalloc":
+        return _run_tracemalloc(output_base, func, *args, **kwargs)
+    raise ValueError(f"Unknown profiler {kind!r}; choose one of {PROFILERS}")
+
+def _run_cprofile(output_base: Path, func, *args, **kwargs):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(str(output_base.with_suffix(".prof")))
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(50)
+        output_base.with_suffix(".txt").write_text(report.getvalue(), encoding="utf-8")
+        logger.info(f"cProfile report written to {output_base}.prof / .txt")
+
+def _run_pyinstrument(output_base: Path, func, *args, **kwargs):
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise RuntimeError("pyinstrument is not installed; run `pip install pyinstrument`.")
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.stop()
+        output_base.with_suffix(".html").write_text(profiler.output_html(), encoding="utf-8")
+        output_base.with_suffix(".txt").write_text(profiler.output_text(), encoding="utf-8")
+        logger.info(f"pyinstrument report written to {output_base}.html / .txt")
+
+def _run_tracemalloc(output_base: Path, func, *args, **kwargs):
+    import tracemalloc
+
+    tracemalloc.start(25)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lines = [f"current: {current / 1024 / 1024:.1f} MiB, peak: {peak / 1024 / 1024:.1f} MiB", ""]
+        for stat in snapshot.statistics("lineno")[:50]:
+            lines.append(str(stat))
+        output_base.with_suffix(".txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        logger.info(f"tracemalloc report written to {output_base}.txt")
@@ -0,0 +1,190 @@
+"""
+Live progress of a scrape run in the terminal.
+
+`RunProgress` is fed by the batch scraper's own counters (scraped and skipped
+posts, per-post latency, bytes flushed to the output files, current batch) and
+shows posts/min, p50/p95 latency, skips by reason, bytes written and an ETA when
+the number of posts is known. With `rich` installed it is a live panel below the
+log output; otherwise a plain status line is printed every few seconds.
+
+It is switched off when stdout is not a TTY. While off, every method returns
+after a single flag check, and while on the display is redrawn at most once per
+`refresh_seconds`, so the hooks can stay in the scrape loop.
+"""
+import sys
+import time
+from collections import Counter, deque
+from typing import Dict, Optional
+
+# Number of recent per-post latencies the percentiles are computed from
+LATENCY_WINDOW = 500
+# Seconds between two status lines when rich is not installed
+PLAIN_REFRESH_SECONDS = 10.0
+
+def _percentile(sorted_values, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+def skip_reason(reason: str) -> str:
+    """Groups skip reasons by dropping the error details after the first colon."""
+    return (reason or "unknown").split(":", 1)[0].strip()[:40]
+
+class RunProgress:
+    """
+    Counters and live display of a scrape run.
+
+    Args:
+        enabled: Show progress. It is still turned off if `stream` is not a TTY.
+        stream: Where the display is written (default: stdout).
+        refresh_seconds: Minimum time between two redraws.
+    """
+    def __init__(self, enabled: bool = True, stream=None, refresh_seconds: float = 1.0):
+        self.stream = stream or sys.stdout
+        self.enabled = enabled and self.stream.isatty()
+        self.refresh_seconds = refresh_seconds
+        self.total = 0
+        self.scraped = 0
+        self.skipped = Counter()
+        self.bytes_written = 0
+        self.batch = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = None
+        self._next_refresh = 0.0
+        self._live = None
+
+    def start(self) -> None:
+        """Starts the clock and the display."""
+        if not self.enabled:
+            return
+        self.started = time.perf_counter()
+        try:
+            from rich.console import Console
+            from rich.live import Live
+        except ImportError:
+            self.refresh_seconds = max(self.refresh_seconds, PLAIN_REFRESH_SECONDS)
+        else:
+            self._live = Live(console=Console(file=self.stream), auto_refresh=False, redirect_stdout=True)
+            self._live.start()
+        self._next_refresh = self.started + self.refresh_seconds
+
+    def stop(self) -> None:
+        """Draws the final state and stops the display."""
+        if not self.enabled or self.started is None:
+            return
+        self._draw()
+        if self._live:
+            self._live.stop()
+            self._live = None
+        self.started = None
+
+    def add_total(self, posts: int) -> None:
+        """Adds posts to the expected total, used for the ETA."""
+        if self.enabled:
+            self.total += posts
+
+    def set_batch(self, batch: int) -> None:
+        if self.enabled:
+            self.batch = batch
+            self._tick()
+
+    def post_scraped(self, latency: float) -> None:
+        """Records a scraped post and the seconds it took, tab opening included."""
+        if self.enabled:
+            self.scraped += 1
+            self.latencies.append(latency)
+            self._tick()
+
+    def post_skipped(self, reason: str) -> None:
+        if self.enabled:
+            self.skipped[skip_reason(reason)] += 1
+            self._tick()
+
+    def add_bytes(self, size: int) -> None:
+        if self.enabled:
+            self.bytes_written += size
+
+    def snapshot(self) -> Dict:
+        """The current counters and derived rates."""
+        elapsed = time.perf_counter() - self.started if self.started is not None else 0.0
+        done = self.scraped + sum(self.skipped.values())
+        rate = self.scraped / elapsed * 60 if elapsed > 0 else 0.0
+        eta = None
+        if self.total and done and done < self.total:
+            eta = (self.total - done) * elapsed / done
+        latencies = sorted(self.latencies)
+        return {
+            "elapsed": elapsed,
+            "total": self.total,
+            "scraped": self.scraped,
+            "skipped": dict(self.skipped.most_common()),
+            "posts_per_min": rate,
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "bytes_written": self.bytes_written,
+            "batch": self.batch,
+            "eta": eta,
+        }
+
+    def render_line(self) -> str:
+        """The plain-text status line."""
+        s = self.snapshot()
+        done = s["scraped"] + sum(s["skipped"].values())
+        parts = [
+            f"{done}/{s['total']}" if s["total"] else f"{done}",
+            f"batch {s['batch']}",
+            f"{s['posts_per_min']:.1f} posts/min",
+            f"p50 {_format_seconds(s['p50'])} p95 {_format_seconds(s['p95'])}",
+            f"written {_format_bytes(s['bytes_written'])}",
+            f"ETA {_format_seconds(s['eta'])}",
+        ]
+        if s["skipped"]:
+            parts.append("skipped " + ", ".join(f"{r}: {n}" for r, n in s["skipped"].items()))
+        return " | ".join(parts)
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        if self.started is not None and now >= self._next_refresh:
+            self._next_refresh = now + self.refresh_seconds
+            self._draw()
+
+    def _draw(self) -> None:
+        if self._live:
+            self._live.update(self._render_table(), refresh=True)
+        else:
+            self.stream.write(f"[progress] {self.render_line()}\n")
+            self.stream.flush()
+
+    def _render_table(self):
+        from rich.table import Table
+
+        s = self.snapshot()
+        table = Table(title="Scrape progress", show_header=False, box=None)
+        table.add_column(style="bold")
+        table.add_column()
+        done = s["scraped"] + sum(s["skipped"].values())
+        table.add_row("Posts", f"{done}/{s['total']}" if s["total"] else str(done))
+        table.add_row("Scraped", str(s["scraped"]))
+        table.add_row("Batch", str(s["batch"]))
+        table.add_row("Throughput", f"{s['posts_per_min']:.1f} posts/min")
+        table.add_row("Latency", f"p50 {_format_seconds(s['p50'])}, p95 {_format_seconds(s['p95'])}")
+        table.add_row("Written", _format_bytes(s["bytes_written"]))
+        table.add_row("ETA", _format_seconds(s["eta"]))
+        for reason, count in s["skipped"].items():
+            table.add_row("Skipped", f"{reason}: {count}")
+        return table
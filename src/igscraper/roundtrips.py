@@ -0,0 +1,151 @@
+"""
+WebDriver round-trip profiler.
+
+Every Selenium call (`execute_script`, `find_elements`, `get_attribute`,
+`window_handles`, ...) is one HTTP round trip to chromedriver. When enabled,
+`RoundTripProfiler` wraps the command executor of a driver instance and records,
+for every command, its type, its latency and the scraper function that issued
+it (the innermost frame inside this package), e.g. `utils.py:human_scroll`.
+
+Commands are aggregated per post (between `begin_post` and `end_post`) and for
+the whole run.
+"""
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PACKAGE_DIR = str(Path(__file__).resolve().parent)
+THIS_FILE = str(Path(__file__).resolve())
+
+def _call_site() -> str:
+    """Returns `file.py:function` of the innermost scraper frame on the stack."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PACKAGE_DIR) and filename != THIS_FILE:
+            return f"{Path(filename).name}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<external>"
+
+def _command_name(command: str, params: Optional[dict]) -> str:
+    # All CDP calls share one WebDriver command; the CDP method is more telling
+    if command == "executeCdpCommand" and params:
+        return f"cdp:{params.get('cmd')}"
+    return command
+
+class _Tally:
+    """Round-trip counts and latencies for one scope (a post or the run)."""
+    def __init__(self):
+        self.by_command = Counter()
+        self.by_site = Counter()
+        self.latency = defaultdict(float)
+
+    def add(self, command: str, site: str, seconds: float) -> None:
+        self.by_command[command] += 1
+        self.by_site[site] += 1
+        self.latency[command] += seconds
+
+    def report(self, top: int = 20) -> Dict:
+        total = sum(self.by_command.values())
+        return {
+            "round_trips": total,
+            "seconds": round(sum(self.latency.values()), 4),
+            "by_command": {
+                command: {
+                    "count": count,
+                    "seconds": round(self.latency[command], 4),
+                    "avg_ms": round(1000 * self.latency[command] / count, 2),
+                }
+                for command, count in self.by_command.most_common()
+            },
+            "by_call_site": dict(self.by_site.most_common(top)),
+        }
+
+class RoundTripProfiler:
+    """Counts and times the WebDriver commands sent by a driver."""
+    def __init__(self, report_dir: Optional[Path] = None):
+        """
+        Initializes the RoundTripProfiler.
+
+        Args:
+            report_dir: Optional directory for the reports. Per-post reports are
+                        appended to `roundtrips_<ts>_posts.jsonl` as posts finish;
+                        the run report is written to `roundtrips_<ts>.json`.
+        """
+        self.post_report_path = None
+        self.run_report_path = None
+        if report_dir:
+            stamp = int(time.time())
+            self.post_report_path = Path(report_dir) / f"roundtrips_{stamp}_posts.jsonl"
+            self.run_report_path = Path(report_dir) / f"roundtrips_{stamp}.json"
+        self.run = _Tally()
+        self.post: Optional[_Tally] = None
+        self.post_url: Optional[str] = None
+        self.by_site_command = Counter()
+
+    def attach(self, driver) -> None:
+        """
+        Wraps the command executor of `driver` so its commands are recorded.
+
+        Call again after the driver was recreated; the counts so far are kept.
+        """
+        executor = driver.command_executor
+        original_execute = executor.execute
+
+        def execute(command, params=None):
+            started = time.perf_counter()
+            try:
+                return original_execute(command, params)
+            finally:
+                self.record(_command_name(command, params), _call_site(), time.perf_counter() - started)
+
+        executor.execute = execute
+
+    def record(self, command: str, site: str, seconds: float) -> None:
+        self.run.add(command, site, seconds)
+        self.by_site_command[(site, command)] += 1
+        if self.post is not None:
+            self.post.add(command, site, seconds)
+
+    def begin_post(self, post_url: str) -> None:
+        """Starts attributing commands to the post at `post_url`."""
+        self.post = _Tally()
+        self.post_url = post_url
+
+    def end_post(self) -> Optional[Dict]:
+        """Stops attributing commands to the current post and appends its report."""
+        if self.post is None:
+            return None
+        report = {"post_url": self.post_url, **self.post.report(top=10)}
+        self.post = None
+        if self.post_report_path:
+            self.post_report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.post_report_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report) + "\n")
+        return report
+
+    def run_report(self) -> Dict:
+        """Returns the totals for the run, including the top (call site, command) pairs."""
+        report = self.run.report(top=50)
+        report["by_call_site_and_command"] = [
+            {"call_site": site, "command": command, "count": count}
+            for (site, command), count in self.by_site_command.most_common(50)
+        ]
+        return report
+
+    def write_run_report(self, path: Optional[Path] = None) -> Path:
+        """Writes the run report to `path` (default: `run_report_path`) and logs the top call sites."""
+        path = Path(path or self.run_report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.run_report(), indent=2), encoding="utf-8")
+        top: List[str] = [f"{site} ({count})" for site, count in self.run.by_site.most_common(5)]
+        logger.info(f"WebDriver round trips: {sum(self.run.by_command.values())}; top call sites: {', '.join(top)}")
+        logger.info(f"Round-trip report written to {path}")
+        return path
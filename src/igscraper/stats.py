@@ -0,0 +1,69 @@
+"""
+Summary of what has been scraped so far, read from the output files only.
+
+Used by `cli.py stats`, the dry-run planner and the backend's resume logic; it
+never starts a browser or imports selenium.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from .config import Config
+from .urls import ShortcodeSet
+
+def _count_lines(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+    return count
+
+def load_cached_urls(file_path: str) -> Optional[List[str]]:
+    """Returns the post URLs of a posts cache (a JSON list), or None if there is no cache."""
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_processed_urls(file_path: str) -> ShortcodeSet:
+    """Returns the posts recorded in a `metadata_*.jsonl` file, keyed by shortcode."""
+    processed = ShortcodeSet()
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if "post_url" in record:
+                        processed.add(record["post_url"])
+                except json.JSONDecodeError:
+                    continue
+    return processed
+
+def run_names(config: Config) -> List[str]:
+    """The URL-file run name if a URL file is configured, otherwise the target profiles."""
+    if config.data.urls_filepath and os.path.exists(config.data.urls_filepath):
+        return [config.main.run_name_for_url_file]
+    return [target.name for target in config.main.target_profiles]
+
+def output_stats(config: Config) -> List[Dict]:
+    """
+    Counts the cached post URLs, scraped posts and skipped posts of each run.
+
+    Returns:
+        One dict per profile (or URL-file run) with `name`, `cached_urls`,
+        `scraped`, `skipped` and `metadata_bytes`.
+    """
+    stats = []
+    for name in run_names(config):
+        data = config.for_profile(name).data
+        cached = load_cached_urls(data.posts_path)
+        stats.append({
+            "name": name,
+            "cached_urls": len(cached) if cached is not None else 0,
+            "scraped": _count_lines(data.metadata_path),
+            "skipped": _count_lines(data.skipped_path),
+            "metadata_bytes": os.path.getsize(data.metadata_path) if os.path.exists(data.metadata_path) else 0,
+        })
+    return stats
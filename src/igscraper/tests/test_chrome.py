@@ -0,0 +1,126 @@
+import fnmatch
+import json
+import sys
+import types
+
+import pytest
+
+from src.igscraper import chrome
+from src.igscraper.chrome import CdpEventLog, blocked_url_patterns, patch_driver, resolve_chromedriver
+from src.igscraper.utils import navigated_away
+
+class FakeDriver:
+    def __init__(self, events, target_id="tab-1"):
+        self.events = events
+        self.visited = []
+        self.target_id = target_id
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_log(self, log_type):
+        entries = [{"message": json.dumps({"message": e, "webview": e.pop("webview", "tab-1")})} for e in self.events]
+        self.events = []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, args):
+        return {"targetInfo": {"targetId": self.target_id}}
+
+def frame_navigated(url, parent_id=None):
+    frame = {"url": url}
+    if parent_id:
+        frame["parentId"] = parent_id
+    return {"method": "Page.frameNavigated", "params": {"frame": frame}}
+
+def test_navigation_guard_flags_foreign_top_level_navigation(monkeypatch):
+    flagged = []
+    monkeypatch.setattr(chrome, "_check_page", lambda url: flagged.append(url))
+    driver = FakeDriver([
+        frame_navigated("https://www.instagram.com/p/abc/"),
+        frame_navigated("https://ads.example.com/frame", parent_id="top"),
+        frame_navigated("https://www.instagram.com/challenge/"),
+    ])
+    patch_driver(driver).get("https://www.instagram.com/p/abc/")
+    assert driver.visited == ["https://www.instagram.com/p/abc/"]
+    # iframe navigations are ignored, top-level ones are all checked
+    assert flagged == ["https://www.instagram.com/p/abc/", "https://www.instagram.com/challenge/"]
+
+def test_navigation_guard_remembers_suspicious_navigations_per_tab(monkeypatch):
+    monkeypatch.setattr(chrome, "_check_page", lambda url: None)
+    driver = FakeDriver([
+        frame_navigated("https://www.instagram.com/p/abc/"),
+        dict(frame_navigated("https://www.instagram.com/accounts/login/"), webview="tab-2"),
+    ])
+    guard = patch_driver(driver).navigation_guard
+    assert guard.check("tab-1") == []
+    assert guard.check() == ["https://www.instagram.com/accounts/login/"]
+    driver.target_id = "tab-2"
+    assert navigated_away(driver)
+    # kept until the tab is reset, e.g. before its next post
+    guard.reset(guard.current_target())
+    assert not navigated_away(driver)
+    assert navigated_away(object()) is False
+
+def test_cdp_event_log_dispatches_by_method():
+    received = []
+    log = CdpEventLog(FakeDriver([{"method": "Network.responseReceived", "params": {"requestId": "1"}}]))
+    log.subscribe("Network.responseReceived", lambda params, target_id: received.append(params))
+    assert log.poll() == 1
+    assert received == [{"requestId": "1"}]
+
+def test_blocked_url_patterns():
+    patterns = blocked_url_patterns(["media", "font"])
+    assert "*.mp4*" in patterns and "*.woff2*" in patterns
+    assert not any("jpg" in p for p in patterns)
+    with pytest.raises(ValueError):
+        blocked_url_patterns(["video"])
+
+def blocked_by(patterns, url):
+    # Network.setBlockedURLs patterns are plain "*" wildcards over the whole URL
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+def test_blocked_url_patterns_match_instagram_resources():
+    patterns = blocked_url_patterns(["media", "font"])
+    blocked = [
+        "https://scontent.cdninstagram.com/o1/v/t16/f2/m86/AQN.mp4?efg=eyJ2&_nc_ht=scontent.cdninstagram.com",
+        "https://scontent.cdninstagram.com/v/t50.2886-16/4567_n.m4a?_nc_cat=1",
+        "https://static.cdninstagram.com/rsrc.php/v3/yb/l/0,cross/font.woff2",
+    ]
+    allowed = [
+        "https://www.instagram.com/p/Cx1_a-B/",
+        "https://www.instagram.com/graphql/query",
+        "https://www.instagram.com/api/v1/media/123/comments/?can_support_threading=true",
+        "https://scontent.cdninstagram.com/v/t51.29350-15/1234_n.jpg?stp=dst-jpg_e35",
+        "https://static.cdninstagram.com/rsrc.php/v3/yx/r/app.js",
+        "https://static.cdninstagram.com/rsrc.php/v3/ya/l/0,cross/styles.css",
+    ]
+    assert [url for url in blocked if not blocked_by(patterns, url)] == []
+    assert [url for url in allowed if blocked_by(patterns, url)] == []
+    assert blocked_by(blocked_url_patterns(["image"]), allowed[3])
+
+def test_resolve_chromedriver_uses_cache_for_same_chrome_version(monkeypatch, tmp_path):
+    driver_binary = tmp_path / "chromedriver"
+    driver_binary.write_text("")
+    cache_file = tmp_path / "chromedriver_cache.json"
+    cache_file.write_text(json.dumps({"chrome_version": "117.0.5938.150", "driver_path": str(driver_binary)}))
+    monkeypatch.setattr(chrome, "installed_chrome_version", lambda: "117.0.5938.150")
+    assert resolve_chromedriver(str(cache_file)) == str(driver_binary)
+
+def test_resolve_chromedriver_re_resolves_on_chrome_version_change(monkeypatch, tmp_path):
+    old_binary = tmp_path / "chromedriver_116"
+    old_binary.write_text("")
+    new_binary = tmp_path / "chromedriver_117"
+    cache_file = tmp_path / "chromedriver_cache.json"
+    cache_file.write_text(json.dumps({"chrome_version": "116.0.5845.96", "driver_path": str(old_binary)}))
+    monkeypatch.setattr(chrome, "installed_chrome_version", lambda: "117.0.5938.150")
+
+    installs = []
+    class FakeChromeDriverManager:
+        def install(self):
+            installs.append(1)
+            return str(new_binary)
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", types.SimpleNamespace(ChromeDriverManager=FakeChromeDriverManager))
+
+    assert resolve_chromedriver(str(cache_file)) == str(new_binary)
+    assert installs == [1]
+    assert json.loads(cache_file.read_text()) == {"chrome_version": "117.0.5938.150", "driver_path": str(new_binary)}
@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+
+from src.igscraper.config import Config, MainConfig, resolve_path
+
+def make_config(profiles=3000):
+    return Config(
+        main={"target_profiles": [{"name": f"user{i}", "num_posts": 10} for i in range(profiles)]},
+        data={
+            "posts_path": "outputs/{target_profile}/posts_{target_profile}.txt",
+            "metadata_path": "outputs/{target_profile}/metadata_{target_profile}.jsonl",
+            "skipped_path": "outputs/{target_profile}/skipped_{target_profile}.txt",
+            "tmp_path": "outputs/{target_profile}/tmp_{target_profile}.jsonl",
+            "cookie_file": "cookies.json",
+        },
+        logging={"level": "INFO"},
+    )
+
+def test_for_profile_expands_paths_without_copying():
+    config = make_config()
+    view = config.for_profile("natgeo")
+
+    assert view.target_profile == view.main.target_profile == "natgeo"
+    assert view.data.metadata_path == str(resolve_path("outputs/natgeo/metadata_natgeo.jsonl"))
+    assert view.data.cookie_file == "cookies.json"
+    # Untemplated fields are shared with the config, not copied
+    assert view.main.target_profiles is config.main.target_profiles
+    # The shared config keeps its templates
+    assert config.data.metadata_path == "outputs/{target_profile}/metadata_{target_profile}.jsonl"
+    assert config.main.target_profile is None
+
+def test_profile_views_are_read_only():
+    view = make_config(1).for_profile("natgeo")
+    with pytest.raises(AttributeError):
+        view.data.metadata_path = "elsewhere.jsonl"
+    with pytest.raises(AttributeError):
+        view.main = None
+
+def test_tab_ready_mode_is_validated():
+    assert MainConfig(tab_ready_mode="sleep").tab_ready_mode == "sleep"
+    with pytest.raises(ValidationError):
+        MainConfig(tab_ready_mode="fast")
@@ -0,0 +1,44 @@
+import json
+import pickle
+
+import pytest
+
+from src.igscraper.cookies import CookieStoreError, load_cookies, migrate_pickle, save_cookies
+
+NOW = 1_700_000_000
+
+def browser_cookies(session_expiry=NOW + 3600):
+    return [
+        {"name": "sessionid", "value": "abc", "domain": ".instagram.com", "path": "/",
+         "secure": True, "httpOnly": True, "expiry": float(session_expiry), "sameSite": "Lax"},
+        {"name": "csrftoken", "value": "tok", "domain": ".instagram.com", "path": "/",
+         "secure": True, "httpOnly": False, "expiry": NOW - 1, "sameSite": "Lax"},
+    ]
+
+def test_round_trip_drops_expired_cookies_and_converts_to_cdp(tmp_path):
+    path = tmp_path / "cookies.json"
+    save_cookies(browser_cookies(), str(path))
+    cookies = load_cookies(str(path), now=NOW)
+    assert [c.name for c in cookies] == ["sessionid"]
+    assert cookies[0].to_cdp()["expires"] == NOW + 3600
+
+def test_expired_session_fails_fast(tmp_path):
+    path = tmp_path / "cookies.json"
+    save_cookies(browser_cookies(session_expiry=NOW - 60), str(path))
+    with pytest.raises(CookieStoreError, match="expired"):
+        load_cookies(str(path), now=NOW)
+
+def test_invalid_cookie_store_is_rejected(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps({"version": 1, "cookies": [{"name": "sessionid"}]}))
+    with pytest.raises(CookieStoreError, match="invalid cookie"):
+        load_cookies(str(path), now=NOW)
+
+def test_migrate_pickle(tmp_path):
+    pkl_path = tmp_path / "cookies_1.pkl"
+    pkl_path.write_bytes(pickle.dumps(browser_cookies()))
+    with pytest.raises(CookieStoreError, match="migrate"):
+        load_cookies(str(pkl_path), now=NOW)
+    json_path = migrate_pickle(str(pkl_path))
+    assert json_path.endswith("cookies_1.json")
+    assert load_cookies(json_path, now=NOW)[0].value == "abc"
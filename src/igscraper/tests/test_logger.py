@@ -0,0 +1,44 @@
+import json
+import logging
+import queue
+import sys
+
+from src.igscraper.logger import JsonLinesFormatter, _QueueHandler
+
+def make_record(msg, args=(), exc_info=None):
+    return logging.LogRecord("igscraper.test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+def test_json_lines_formatter_merges_args():
+    line = JsonLinesFormatter().format(make_record("scraped %s in %.1fs", ("post_1", 2.345)))
+    entry = json.loads(line)
+    assert "\n" not in line
+    assert entry["message"] == "scraped post_1 in 2.3s"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "igscraper.test"
+
+def test_json_lines_formatter_includes_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("failed", exc_info=sys.exc_info())
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert "ValueError: boom" in entry["exc_info"]
+
+def test_queue_handler_defers_formatting_to_the_listener():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("scraped %s", ("post_1",), exc_info=sys.exc_info())
+    log_queue = queue.SimpleQueue()
+    _QueueHandler(log_queue).handle(record)
+    queued = log_queue.get_nowait()
+
+    # only the message and traceback are rendered; no format string was applied
+    assert queued.msg == "scraped post_1" and queued.args is None
+    assert queued.exc_info is None and "ValueError: boom" in queued.exc_text
+    assert not hasattr(queued, "asctime")
+    assert record.args == ("post_1",)
+
+    text = logging.Formatter("%(levelname)s %(message)s").format(queued)
+    assert text.startswith("INFO scraped post_1\nTraceback")
+    assert "ValueError: boom" in json.loads(JsonLinesFormatter().format(queued))["exc_info"]
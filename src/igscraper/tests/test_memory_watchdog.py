@@ -0,0 +1,59 @@
+import pytest
+
+from src.igscraper.backends import memory_watchdog
+from src.igscraper.backends.memory_watchdog import MemoryWatchdog
+
+class FakeDriver:
+    def __init__(self, heap_mb):
+        self.heap = heap_mb * 1024 * 1024
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Performance.getMetrics":
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": self.heap}]}
+        return {}
+
+def test_watchdog_disabled_by_default():
+    assert not MemoryWatchdog().enabled
+
+def test_watchdog_uses_rss_when_available(monkeypatch):
+    monkeypatch.setattr(memory_watchdog, "browser_rss_mb", lambda driver: 900.0)
+    assert MemoryWatchdog(rss_limit_mb=800).over_limit(FakeDriver(10))
+    assert not MemoryWatchdog(rss_limit_mb=1000, js_heap_limit_mb=1).over_limit(FakeDriver(10))
+
+def test_watchdog_falls_back_to_js_heap(monkeypatch):
+    monkeypatch.setattr(memory_watchdog, "browser_rss_mb", lambda driver: None)
+    watchdog = MemoryWatchdog(rss_limit_mb=800, js_heap_limit_mb=300)
+    assert not watchdog.over_limit(FakeDriver(200))
+    assert watchdog.over_limit(FakeDriver(400))
+
+class BrowserLaunched(Exception):
+    pass
+
+def test_restart_reuses_the_loaded_cookies(monkeypatch, tmp_path):
+    from src.igscraper.backends import selenium_backend
+    from src.igscraper.config import Config
+
+    config = Config(
+        main={"target_profiles": [{"name": "natgeo", "num_posts": 1}]},
+        data={
+            "posts_path": str(tmp_path / "posts.txt"),
+            "metadata_path": str(tmp_path / "metadata.jsonl"),
+            "skipped_path": str(tmp_path / "skipped.txt"),
+            "tmp_path": str(tmp_path / "tmp.jsonl"),
+            # gone since the first start; loading it again would exit
+            "cookie_file": str(tmp_path / "missing_cookies.json"),
+        },
+        logging={"level": "INFO"},
+    )
+    backend = selenium_backend.SeleniumBackend(config)
+    backend.cookies = ["cookie loaded at startup"]
+
+    def launch(*args, **kwargs):
+        raise BrowserLaunched
+    monkeypatch.setattr(selenium_backend, "resolve_chromedriver", launch)
+
+    with pytest.raises(BrowserLaunched):
+        backend.restart()
+    assert backend.cookies == ["cookie loaded at startup"]
+    with pytest.raises(SystemExit):
+        backend.start()
@@ -0,0 +1,34 @@
+import json
+
+from src.igscraper.metrics import Metrics
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics()
+    with m.timer("title"):
+        pass
+    assert not m.timings
+
+def test_timer_as_context_manager_and_decorator(tmp_path):
+    m = Metrics()
+    m.configure(True)
+    m.set_profile("natgeo")
+
+    @m.timer("flush")
+    def flush():
+        return "done"
+
+    with m.timer("title"):
+        pass
+    assert flush() == "done"
+    m.observe("comments", 3.0)
+
+    summary = m.summary()["natgeo"]
+    assert summary["title"]["count"] == 1
+    assert summary["flush"]["count"] == 1
+    assert m.slowest_stage("natgeo") == "comments"
+
+    json_path = m.write(tmp_path, prometheus=True)
+    assert json.loads(json_path.read_text())["natgeo"]["comments"]["max"] == 3.0
+    prom = json_path.with_suffix(".prom").read_text()
+    assert 'igscraper_stage_seconds_bucket{profile="natgeo",stage="comments",le="2"} 0' in prom
+    assert 'igscraper_stage_seconds_count{profile="natgeo",stage="comments"} 1' in prom
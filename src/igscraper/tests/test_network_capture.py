@@ -0,0 +1,168 @@
+import json
+import threading
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.igscraper.chrome import CdpEventLog
+from src.igscraper.network_capture import (
+    NetworkCapture,
+    comments_have_more_pages,
+    parse_comments_from_payloads,
+    parse_media_from_payloads,
+    relative_age,
+)
+from src.igscraper.urls import shortcode_to_media_pk
+
+FIXTURES = Path(__file__).parent / "fixtures" / "network"
+
+def load(name):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+@pytest.fixture
+def payload_server():
+    """Serves the recorded payloads the way Instagram's API endpoints would."""
+    handler = partial(SimpleHTTPRequestHandler, directory=str(FIXTURES))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+class FakeDriver:
+    """Replays response events and answers getResponseBody from the stand-in server."""
+    def __init__(self, target_id, events):
+        self.target_id = target_id
+        self.events = events
+        self.urls = {}
+
+    def get_log(self, log_type):
+        entries = []
+        for webview, params, *method in self.events:
+            if "response" in params:
+                self.urls[params["requestId"]] = params["response"]["url"]
+            message = {"method": method[0] if method else "Network.responseReceived", "params": params}
+            entries.append({"message": json.dumps({"message": message, "webview": webview})})
+        self.events = []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, args):
+        if cmd == "Target.getTargetInfo":
+            return {"targetInfo": {"targetId": self.target_id}}
+        with urllib.request.urlopen(self.urls[args["requestId"]]) as response:
+            return {"body": response.read().decode("utf-8"), "base64Encoded": False}
+
+def response_event(webview, request_id, url):
+    return webview, {
+        "requestId": request_id,
+        "type": "XHR",
+        "response": {"url": url, "mimeType": "application/json"},
+    }
+
+def request_event(webview, request_id, url, body):
+    return webview, {"requestId": request_id, "request": {"url": url, "postData": body}}, "Network.requestWillBeSent"
+
+def test_request_bodies_are_dropped_without_a_response(payload_server):
+    url = f"{payload_server}/comments_graphql.json?path=/graphql/query"
+    driver = FakeDriver("tab-1", [
+        request_event("tab-1", "1", url, "variables=a"),
+        request_event("tab-1", "2", url, "variables=b"),
+        request_event("tab-2", "3", url, "variables=c"),
+        request_event("tab-2", "4", url, "variables=d"),
+        ("tab-1", {"requestId": "1", "errorText": "net::ERR_ABORTED"}, "Network.loadingFailed"),
+    ])
+    capture = NetworkCapture(driver, CdpEventLog(driver))
+    capture.event_log.poll()
+    assert set(capture.request_bodies) == {"2", "3", "4"}
+    # a released tab forgets its requests still in flight, other tabs keep theirs
+    capture.discard()
+    assert set(capture.request_bodies) == {"3", "4"}
+    driver.target_id = "tab-2"
+    assert capture.collect() == []
+    assert not capture.request_bodies
+
+def test_capture_collects_only_current_tab_api_payloads(payload_server):
+    driver = FakeDriver("tab-1", [
+        response_event("tab-1", "1", f"{payload_server}/comments_graphql.json?path=/graphql/query"),
+        response_event("tab-2", "2", f"{payload_server}/media_info.json?path=/api/v1/media/1/info/"),
+        response_event("tab-1", "3", f"{payload_server}/static/app.json"),
+    ])
+    capture = NetworkCapture(driver, CdpEventLog(driver))
+    payloads = capture.collect()
+    assert payloads == [load("comments_graphql.json")]
+    # the other tab's response is kept for when that tab is scraped
+    assert [request_id for request_id, _, _ in capture.pending["tab-2"]] == ["2"]
+
+def test_collect_keeps_only_payloads_of_the_post(payload_server):
+    media_pk = shortcode_to_media_pk("Cx1_a-B")
+    events = [
+        # names the post by media id in its URL
+        response_event("tab-1", "1", f"{payload_server}/comments_graphql.json?path=/api/v1/media/{media_pk}/comments/"),
+        # a late response of the previous post in this tab
+        response_event("tab-1", "2", f"{payload_server}/comments_graphql.json?path=/api/v1/media/42/comments/"),
+        # names the post by shortcode in the payload
+        response_event("tab-1", "3", f"{payload_server}/media_info.json?path=/api/v1/media/info/"),
+    ]
+    driver = FakeDriver("tab-1", list(events))
+    assert NetworkCapture(driver, CdpEventLog(driver)).collect("Cx1_a-B") == [
+        load("comments_graphql.json"), load("media_info.json"),
+    ]
+    driver = FakeDriver("tab-1", list(events))
+    assert NetworkCapture(driver, CdpEventLog(driver)).collect("OtherPost") == []
+
+def test_discard_drops_pending_responses_of_the_tab(payload_server):
+    driver = FakeDriver("tab-1", [
+        response_event("tab-1", "1", f"{payload_server}/comments_graphql.json?path=/graphql/query"),
+        response_event("tab-2", "2", f"{payload_server}/media_info.json?path=/api/v1/media/1/info/"),
+    ])
+    capture = NetworkCapture(driver, CdpEventLog(driver))
+    capture.discard()
+    assert "tab-1" not in capture.pending
+    assert capture.collect() == []
+    capture.discard("tab-2")
+    assert not capture.pending
+
+def test_parse_comments_from_payloads():
+    # 1700000000 is 2023-11-14T22:13:20Z; "now" is three weeks and a day later
+    now = 1700000000 + 22 * 24 * 3600
+    comments = parse_comments_from_payloads([load("comments_graphql.json"), load("media_info.json")], now=now)
+    assert [c["handle"] for c in comments] == ["first_commenter", "replier", "gif_poster"]
+    assert comments[0]["likes"] == "18 likes"
+    # same format as the DOM scraper, plus the exact time
+    assert comments[0]["date"] == "3w"
+    assert comments[0]["date_iso"] == "2023-11-14T22:13:20+00:00"
+    assert comments[2]["commentImgs"] == ["https://media.giphy.example/fixed.gif"]
+
+def test_relative_age():
+    assert relative_age(1000, 1030) == "30s"
+    assert relative_age(1000, 1000 + 5 * 60 + 59) == "5m"
+    assert relative_age(1000, 1000 + 3 * 3600) == "3h"
+    assert relative_age(1000, 1000 + 6 * 24 * 3600) == "6d"
+    assert relative_age(1000, 1000 + 60 * 7 * 24 * 3600) == "60w"
+    assert relative_age(1000, 900) == "0s"
+
+def test_parsers_skip_payloads_of_other_posts():
+    media = load("media_info.json")
+    assert parse_media_from_payloads([media], shortcode="OtherPost") == []
+    assert len(parse_media_from_payloads([media], shortcode="Cx1_a-B")) == 2
+    comments = load("comments_graphql.json")
+    comments["data"]["media_id"] = "42_1"
+    assert parse_comments_from_payloads([comments], shortcode="Cx1_a-B") == []
+
+def test_comments_have_more_pages():
+    comments = load("comments_graphql.json")
+    assert not comments_have_more_pages([comments])
+    comments["data"]["xdt_api__v1__media__media_id__comments__connection"]["page_info"] = {
+        "has_next_page": True, "end_cursor": "abc",
+    }
+    assert comments_have_more_pages([comments])
+    assert comments_have_more_pages([{"comments": [], "next_min_id": "{\"cached_comments_cursor\": \"1\"}"}])
+
+def test_parse_media_from_payloads():
+    images = parse_media_from_payloads([load("media_info.json")])
+    assert images == [
+        {"src": "https://cdn.example/slide1_1080.jpg", "alt": "Photo of a cat"},
+        {"src": "https://cdn.example/slide2_1080.jpg", "alt": "Photo of a dog"},
+    ]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+from src.igscraper import pipeline as pipeline_module
+from src.igscraper.backends.selenium_backend import SeleniumBackend
+from src.igscraper.config import Config
+from src.igscraper.pipeline import Pipeline
+
+POST = "https://www.instagram.com/p/abc/"
+
+class FakePool:
+    def __init__(self):
+        self.opened = []
+        self.released = []
+
+    def open(self, href, tab_open_retries=4):
+        self.opened.append(href)
+        return "pooled_tab"
+
+    def release(self, handle, main_window_handle):
+        self.released.append(handle)
+
+class FakeBackend:
+    """Records how `scrape_post` opens and finishes its tab."""
+    open_post_tab = SeleniumBackend.open_post_tab
+
+    def __init__(self, tab_pool):
+        self.tab_pool = tab_pool
+        self.driver = SimpleNamespace(current_window_handle="main")
+        self.new_tabs = []
+        self.scraped = []
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def _load_cached_urls(self, file_path):
+        return [POST]
+
+    def open_href_in_new_tab(self, href, tab_open_retries):
+        self.new_tabs.append(href)
+        return "new_tab"
+
+    def _scrape_and_close_tab(self, post_index, post_url, tab_handle, main_window_handle, debug):
+        self.scraped.append(tab_handle)
+        if self.tab_pool:
+            self.tab_pool.release(tab_handle, main_window_handle)
+        return {"post_url": post_url}, None
+
+def make_pipeline(monkeypatch, tmp_path, backend):
+    config = Config(
+        main={"target_profiles": [{"name": "natgeo", "num_posts": 1}], "progress": False},
+        data={
+            "posts_path": str(tmp_path / "posts_{target_profile}.txt"),
+            "metadata_path": str(tmp_path / "metadata_{target_profile}.jsonl"),
+            "skipped_path": str(tmp_path / "skipped_{target_profile}.txt"),
+            "tmp_path": str(tmp_path / "tmp_{target_profile}.jsonl"),
+            "cookie_file": str(tmp_path / "cookies.json"),
+        },
+        logging={"level": "INFO"},
+    )
+    monkeypatch.setattr(pipeline_module, "load_config", lambda path: config)
+    pipeline = Pipeline("config.toml", dry_run=True)
+    pipeline.backend = backend
+    return pipeline
+
+def test_scrape_post_uses_the_tab_pool(monkeypatch, tmp_path):
+    pool = FakePool()
+    backend = FakeBackend(pool)
+    assert make_pipeline(monkeypatch, tmp_path, backend).scrape_post(0) == {"post_url": POST}
+    # the pool releases only the tab it opened; no unpooled tab is left behind
+    assert pool.opened == [POST] and pool.released == ["pooled_tab"]
+    assert backend.new_tabs == []
+
+def test_scrape_post_opens_a_new_tab_without_pool(monkeypatch, tmp_path):
+    backend = FakeBackend(None)
+    make_pipeline(monkeypatch, tmp_path, backend).scrape_post(0)
+    assert backend.new_tabs == [POST] and backend.scraped == ["new_tab"]
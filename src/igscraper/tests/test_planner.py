@@ -0,0 +1,57 @@
+import json
+
+from src.igscraper.config import Config
+from src.igscraper.planner import DEFAULT_POST_BYTES, historical_post_seconds, plan, format_plan
+
+def make_config(tmp_path, profiles):
+    return Config(
+        main={"target_profiles": profiles, "batch_size": 2, "rate_limit_seconds_min": 1, "rate_limit_seconds_max": 3},
+        data={
+            "output_dir": str(tmp_path),
+            "posts_path": str(tmp_path / "{target_profile}" / "posts.txt"),
+            "metadata_path": str(tmp_path / "{target_profile}" / "metadata.jsonl"),
+            "skipped_path": str(tmp_path / "{target_profile}" / "skipped.txt"),
+            "tmp_path": str(tmp_path / "{target_profile}" / "tmp.jsonl"),
+            "cookie_file": str(tmp_path / "cookies.json"),
+        },
+        logging={"level": "INFO", "log_dir": str(tmp_path / "logs")},
+    )
+
+def test_plan_uses_cache_metadata_and_history(tmp_path):
+    profile_dir = tmp_path / "natgeo"
+    profile_dir.mkdir()
+    urls = [f"https://www.instagram.com/p/CODE{i}/" for i in range(5)]
+    (profile_dir / "posts.txt").write_text(json.dumps(urls))
+    (profile_dir / "metadata.jsonl").write_text(
+        "".join(json.dumps({"post_url": u, "post_id": "x" * 100}) + "\n" for u in urls[:2])
+    )
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "metrics_1.json").write_text(json.dumps({
+        "natgeo": {
+            "tab_open": {"count": 4, "total": 8.0},
+            "comments": {"count": 4, "total": 12.0},
+            "flush": {"count": 1, "total": 100.0},
+        },
+    }))
+
+    entry, fresh = plan(make_config(tmp_path, [{"name": "natgeo", "num_posts": 5}, {"name": "nasa", "num_posts": 7}]))
+
+    assert entry["cached_urls"] == 5
+    assert entry["already_scraped"] == 2
+    assert entry["pending"] == 3
+    assert entry["batches"] == 2
+    # 3 posts x (2 s + 3 s) plus 2 batches x the mean rate limit of 2 s
+    assert entry["estimated_seconds"] == 19.0
+    assert entry["post_seconds_source"] == "history"
+    assert entry["post_bytes_source"] == "metadata"
+
+    # No cache, no metadata: the whole num_posts is left, with the default size;
+    # timings of other profiles are still used
+    assert fresh["cached_urls"] is None
+    assert fresh["pending"] == 7
+    assert fresh["post_seconds_source"] == "history"
+    assert fresh["estimated_bytes"] == 7 * DEFAULT_POST_BYTES
+    assert "Total: 10 posts" in format_plan([entry, fresh])
+
+def test_historical_post_seconds_without_metrics(tmp_path):
+    assert historical_post_seconds(tmp_path) is None
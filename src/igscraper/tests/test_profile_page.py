@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.igscraper.pages import profile_page
+from src.igscraper.pages.profile_page import GRID_HREFS_JS, ProfilePage
+from src.igscraper.urls import ShortcodeSet
+
+def post(shortcode):
+    return f"https://www.instagram.com/p/{shortcode}/"
+
+class FakeGuard:
+    def __init__(self):
+        self.checks = 0
+
+    def check(self):
+        self.checks += 1
+
+class FakeDriver:
+    """Serves one list of grid hrefs per scroll step; the page grows until the steps run out."""
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.step = 0
+        self.navigation_guard = FakeGuard()
+
+    def execute_script(self, script, *args):
+        if script == GRID_HREFS_JS:
+            return self.steps[min(self.step, len(self.steps) - 1)]
+        return min(self.step, len(self.steps) - 1)  # document.body.scrollHeight
+
+@pytest.fixture
+def make_page(monkeypatch):
+    def build(steps, scroll_retries=1):
+        driver = FakeDriver(steps)
+        monkeypatch.setattr(profile_page, "scroll_with_mouse", lambda page, steps: setattr(driver, "step", driver.step + 1))
+        monkeypatch.setattr(profile_page, "random_delay", lambda a, b: None)
+        config = SimpleNamespace(main=SimpleNamespace(page_scroll_retries=scroll_retries))
+        return ProfilePage(driver, config)
+    return build
+
+def test_navigation_guard_checked_after_every_scroll_step(make_page):
+    page = make_page([[post("A")], [post("A"), post("B")], [post("A"), post("B"), post("C")]])
+    assert page.scroll_and_collect_(10) == [post("A"), post("B"), post("C")]
+    # one check per scroll step, including the last one that loaded nothing new
+    assert page.driver.navigation_guard.checks == 3
+
+def test_pinned_slots_are_the_first_grid_positions_across_scroll_steps(make_page):
+    cached = [post("OLD1"), post("OLD2")]
+    # OLD1 is pinned; after scrolling, the rendered rows start further down the
+    # grid, so OLD2 at the start of the visible list is not in a pinned slot
+    page = make_page([
+        [post("OLD1"), post("N1"), post("N2")],
+        [post("OLD2"), post("N3")],
+    ])
+    urls = list(page.iter_post_urls(10, stop_at=ShortcodeSet(cached)))
+    assert urls == [post("OLD1"), post("N1"), post("N2")]
@@ -0,0 +1,19 @@
+import pytest
+
+from src.igscraper.profiling import profile_call, profile_output_base
+
+def work(n):
+    return sum(i * i for i in range(n))
+
+@pytest.mark.parametrize("kind", ["cprofile", "tracemalloc"])
+def test_profile_call_writes_report(tmp_path, kind):
+    base = profile_output_base(tmp_path, kind, "natgeo+nasa")
+    assert "natgeo_nasa" in base.name
+    assert profile_call(kind, base, work, 1000) == work(1000)
+    assert "work" in base.with_suffix(".txt").read_text() or kind == "tracemalloc"
+    if kind == "cprofile":
+        assert base.with_suffix(".prof").exists()
+
+def test_unknown_profiler(tmp_path):
+    with pytest.raises(ValueError):
+        profile_call("perf", tmp_path / "x", work, 1)
@@ -0,0 +1,85 @@
+import io
+import json
+from types import SimpleNamespace
+
+from src.igscraper.progress import RunProgress, skip_reason
+
+class TtyStream(io.StringIO):
+    def isatty(self):
+        return True
+
+def test_progress_disabled_without_tty():
+    progress = RunProgress(stream=io.StringIO())
+    assert not progress.enabled
+    progress.start()
+    progress.post_scraped(1.0)
+    progress.post_skipped("timeout")
+    progress.stop()
+    assert progress.scraped == 0 and not progress.skipped
+
+def test_progress_counters_and_line():
+    progress = RunProgress(stream=TtyStream(), refresh_seconds=3600)
+    progress.started = 0.0  # counters only; no display
+    progress.add_total(10)
+    progress.set_batch(2)
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        progress.post_scraped(latency)
+    progress.post_skipped("failed to open tab: no such window")
+    progress.post_skipped("TimeoutException")
+    progress.add_bytes(2048)
+
+    snapshot = progress.snapshot()
+    assert snapshot["scraped"] == 4
+    assert snapshot["skipped"] == {"failed to open tab": 1, "TimeoutException": 1}
+    assert snapshot["p50"] == 3.0 and snapshot["p95"] == 4.0
+    assert snapshot["eta"] is not None
+
+    line = progress.render_line()
+    assert line.startswith("6/10 | batch 2")
+    assert "written 2.0 KB" in line
+    assert "failed to open tab: 1" in line
+
+def test_skip_reason_drops_details():
+    assert skip_reason("failed to open tab: Message: no such window") == "failed to open tab"
+    assert skip_reason("") == "unknown"
+
+def make_backend(tmp_path, progress):
+    from src.igscraper.backends.selenium_backend import SeleniumBackend
+    from src.igscraper.config import Config
+
+    config = Config(
+        main={"target_profiles": [{"name": "natgeo", "num_posts": 50}]},
+        data={
+            "posts_path": str(tmp_path / "posts_{target_profile}.txt"),
+            "metadata_path": str(tmp_path / "metadata_{target_profile}.jsonl"),
+            "skipped_path": str(tmp_path / "skipped_{target_profile}.txt"),
+            "tmp_path": str(tmp_path / "tmp_{target_profile}.jsonl"),
+            "cookie_file": str(tmp_path / "cookies.json"),
+        },
+        logging={"level": "INFO"},
+    )
+    backend = SeleniumBackend(config.for_profile("natgeo"))
+    backend.progress = progress
+    return backend
+
+def post(shortcode):
+    return f"https://www.instagram.com/p/{shortcode}/"
+
+def test_total_counts_filtered_urls_not_the_requested_limit(tmp_path):
+    (tmp_path / "posts_natgeo.txt").write_text(json.dumps([post("A"), post("B"), post("C")]))
+    (tmp_path / "metadata_natgeo.jsonl").write_text(json.dumps({"post_url": post("B")}) + "\n")
+    progress = RunProgress(stream=TtyStream())
+    backend = make_backend(tmp_path, progress)
+
+    urls = backend.get_post_elements(50)
+    assert next(urls) == post("A")
+    assert progress.total == 2
+
+def test_total_grows_with_urls_found_while_scrolling(tmp_path):
+    (tmp_path / "metadata_natgeo.jsonl").write_text(json.dumps({"post_url": post("B")}) + "\n")
+    progress = RunProgress(stream=TtyStream())
+    backend = make_backend(tmp_path, progress)
+    backend.profile_page = SimpleNamespace(iter_post_urls=lambda limit, **kwargs: iter([post("A"), post("B"), post("C")]))
+
+    totals = [progress.total for _ in backend.get_post_elements(50)]
+    assert totals == [1, 2]
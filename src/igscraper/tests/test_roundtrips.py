@@ -0,0 +1,37 @@
+import json
+
+from src.igscraper.roundtrips import RoundTripProfiler
+
+class FakeExecutor:
+    def execute(self, command, params=None):
+        return {"value": None}
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+def scroll_grid(driver):
+    # Selenium's own frames are skipped, so the executor is called directly here
+    for _ in range(3):
+        driver.command_executor.execute("executeScript", {"script": "window.scrollBy(0, 400)"})
+
+def test_profiler_counts_by_command_and_call_site(tmp_path):
+    driver = FakeDriver()
+    profiler = RoundTripProfiler(tmp_path)
+    profiler.attach(driver)
+
+    profiler.begin_post("https://www.instagram.com/p/abc/")
+    scroll_grid(driver)
+    driver.command_executor.execute("executeCdpCommand", {"cmd": "Network.getCookies", "params": {}})
+    post = profiler.end_post()
+    driver.command_executor.execute("executeScript", {"script": "return 1"})
+
+    assert post["round_trips"] == 4
+    assert post["by_command"]["cdp:Network.getCookies"]["count"] == 1
+    assert post["by_call_site"]["test_roundtrips.py:scroll_grid"] == 3
+
+    report = json.loads(profiler.write_run_report().read_text())
+    assert report["round_trips"] == 5
+    assert report["by_command"]["executeScript"]["count"] == 4
+    lines = profiler.post_report_path.read_text().splitlines()
+    assert json.loads(lines[0])["post_url"] == "https://www.instagram.com/p/abc/"
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+# Cumulative import time budget (microseconds) of the light entry points
+IMPORT_BUDGET_US = 250_000
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+def cumulative_import_us(module: str) -> int:
+    stderr = run_python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+@pytest.mark.parametrize("module", ["src.igscraper.cli", "src.igscraper.stats", "src.igscraper.planner", "src.igscraper.pipeline"])
+def test_light_modules_do_not_import_selenium(module):
+    out = run_python("-c", f"import sys, {module}; print('selenium' in sys.modules)").stdout
+    assert out.strip() == "False"
+
+def test_cli_import_time_within_budget():
+    assert cumulative_import_us("src.igscraper.cli") < IMPORT_BUDGET_US
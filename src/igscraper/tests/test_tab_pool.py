@@ -0,0 +1,81 @@
+import pytest
+
+from src.igscraper.backends.tab_pool import TabPool
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+class FakeDriver:
+    """Tracks named windows opened with `window.open(url, name)`."""
+    def __init__(self):
+        self.windows = {"main": None}  # handle -> name
+        self.current = "main"
+        self.navigations = []
+        self.opened = 0
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    def execute_script(self, script, *args):
+        if script.startswith("window.open"):
+            url, name = args
+            self.navigations.append((name, url))
+            if name not in self.windows.values():
+                self.opened += 1
+                self.windows[f"handle_{self.opened}"] = name
+        else:
+            self.navigations.append((self.windows[self.current], script))
+
+    def close(self):
+        del self.windows[self.current]
+
+class FakeBackend:
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.discarded = []
+
+    def _discard_captured_responses(self):
+        self.discarded.append(self.driver.current)
+
+    def open_href_in_new_tab(self, href, tab_open_retries, window_name="_blank"):
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], arguments[1]);", href, window_name)
+        return (set(self.driver.window_handles) - before).pop()
+
+def scrape(pool, href):
+    handle = pool.open(href)
+    pool.driver.switch_to.window(handle)
+    pool.release(handle, "main")
+    return handle
+
+def test_pool_reuses_tabs_in_place():
+    pool = TabPool(FakeBackend(), size=2)
+    first = scrape(pool, "https://www.instagram.com/p/a/")
+    second = scrape(pool, "https://www.instagram.com/p/b/")
+    assert first == second
+    assert pool.tabs_created == 1
+    assert pool.driver.current == "main"
+    # the released tab is blanked before its next post is loaded into it
+    assert pool.driver.navigations[1] == ("igscraper_tab_0", "window.location.replace('about:blank');")
+    assert pool.driver.navigations[2] == ("igscraper_tab_0", "https://www.instagram.com/p/b/")
+    # uncollected responses of each post are dropped while its tab is current
+    assert pool.backend.discarded == [first, first]
+
+def test_pool_recycles_tab_after_n_posts():
+    pool = TabPool(FakeBackend(), size=1, recycle_after=2)
+    handles = [scrape(pool, f"https://www.instagram.com/p/{i}/") for i in range(3)]
+    assert handles[0] == handles[1] != handles[2]
+    assert pool.tabs_recycled == 1
+    assert len(pool.driver.window_handles) == 2
+
+def test_pool_is_bounded():
+    pool = TabPool(FakeBackend(), size=1)
+    pool.open("https://www.instagram.com/p/a/")
+    with pytest.raises(RuntimeError):
+        pool.open("https://www.instagram.com/p/b/")
@@ -0,0 +1,45 @@
+from src.igscraper.urls import ShortcodeSet, UrlKind, classify_url, filter_new_posts, post_shortcode, shortcode_to_media_pk
+
+def test_classify_url_kinds():
+    assert classify_url("about:blank").kind == UrlKind.BLANK
+    assert classify_url("https://www.instagram.com/").kind == UrlKind.HOME
+    assert classify_url("https://www.instagram.com/ladbible/").username == "ladbible"
+    assert classify_url("https://www.instagram.com/p/Cx1_a-B/").kind == UrlKind.POST
+    assert classify_url("https://www.instagram.com/ladbible/p/Cx1_a-B/").kind == UrlKind.NESTED_POST
+    assert classify_url("https://www.instagram.com/reel/Cx1_a-B/").kind == UrlKind.OTHER
+    assert classify_url("https://www.instagram.com.evil.com/").kind == UrlKind.FOREIGN
+
+def test_allowed_matches_navigation_allowlist():
+    assert classify_url("https://www.instagram.com/ladbible/p/Cx1_a-B/?img_index=2").allowed
+    assert not classify_url("https://www.instagram.com/accounts/login/two_factor/").allowed
+    assert not classify_url("https://instagram.com/ladbible/").allowed
+
+def test_post_shortcode():
+    assert post_shortcode("https://www.instagram.com/p/Cx1_a-B/") == "Cx1_a-B"
+    assert post_shortcode("https://www.instagram.com/ladbible/p/Cx1_a-B") == "Cx1_a-B"
+    assert post_shortcode("https://www.instagram.com/ladbible/") is None
+
+def test_shortcode_to_media_pk():
+    assert shortcode_to_media_pk("B") == "1"
+    assert shortcode_to_media_pk("BA") == "64"
+    assert shortcode_to_media_pk("Cx1_a-B") == str((((((2 * 64 + 49) * 64 + 53) * 64 + 63) * 64 + 26) * 64 + 62) * 64 + 1)
+    assert shortcode_to_media_pk("A" * 12) is None
+    assert shortcode_to_media_pk("bad!") is None
+
+def test_shortcode_set_treats_url_variants_as_one_post():
+    seen = ShortcodeSet(["https://www.instagram.com/p/Cx1_a-B/"])
+    assert "https://www.instagram.com/ladbible/p/Cx1_a-B" in seen
+    assert "https://www.instagram.com/p/Cx1_a-B/?img_index=1" in seen
+    assert "https://www.instagram.com/p/Other/" not in seen
+    seen.add("https://www.instagram.com/ladbible/p/Cx1_a-B/")
+    assert len(seen) == 1
+
+def test_filter_new_posts_drops_processed_and_duplicate_variants():
+    processed = ShortcodeSet(["https://www.instagram.com/p/Done/"])
+    urls = [
+        "https://www.instagram.com/ladbible/p/Done/",
+        "https://www.instagram.com/p/New/",
+        "https://www.instagram.com/ladbible/p/New/?img_index=1",
+    ]
+    assert filter_new_posts(urls, processed) == ["https://www.instagram.com/p/New/"]
+    assert len(processed) == 1
@@ -1,12 +1,63 @@
-from src.igscraper.utils import normalize_hashtags, criteria_example
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from src.igscraper.utils import normalize_hashtags, criteria_example, timing_histogram, wait_for_post_ready
+
+class PageDriver:
+    """
+    Runs scripts with node against a stub page: `location.href`,
+    `document.readyState` and the CSS selectors `querySelector` finds.
+    """
+    def __init__(self, href, ready_state, elements=()):
+        self.page = {"href": href, "readyState": ready_state, "elements": list(elements)}
+
+    def execute_script(self, script, *args):
+        program = (
+            f"const page = {json.dumps(self.page)};"
+            "const location = {href: page.href};"
+            "const document = {readyState: page.readyState, querySelector: selector =>"
+            " selector.split(',').some(s => page.elements.includes(s.trim())) ? {} : null};"
+            f"console.log(JSON.stringify((function () {{ {script} }})()));"
+        )
+        result = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
 
 def test_normalize_hashtags():
     caption = "This is a #test post with #multiple #hashtags"
     assert normalize_hashtags(caption) == ['#test', '#multiple', '#hashtags']
 
+def test_timing_histogram():
+    summary = timing_histogram([0.05, 0.3, 0.3, 1.5, 12])
+    assert summary["count"] == 5
+    assert summary["p50"] == 0.3
+    assert summary["max"] == 12
+    assert summary["histogram"]["<=0.1s"] == 1
+    assert summary["histogram"]["<=0.5s"] == 2
+    assert summary["histogram"][">10s"] == 1
+
 def test_criteria_example():
     metadata = {'likes': 150}
     assert criteria_example(metadata) == True
     
     metadata = {'likes': 50}
     assert criteria_example(metadata) == False
+
+@needs_node
+def test_wait_for_post_ready_needs_the_rendered_post():
+    post = "https://www.instagram.com/p/abc/"
+    assert wait_for_post_ready(PageDriver(post, "complete", ["article"]), timeout=2, poll_frequency=0.01) is True
+    assert wait_for_post_ready(PageDriver(post, "complete", ["main time"]), timeout=2, poll_frequency=0.01) is True
+
+@needs_node
+def test_wait_for_post_ready_times_out_on_an_unrendered_post():
+    post = "https://www.instagram.com/p/abc/"
+    # the app shell has loaded but the post is not rendered yet
+    assert wait_for_post_ready(PageDriver(post, "complete"), timeout=0.2, poll_frequency=0.05) is False
+    # rendered but still loading, and a blank tab
+    assert wait_for_post_ready(PageDriver(post, "interactive", ["article"]), timeout=0.2, poll_frequency=0.05) is False
+    assert wait_for_post_ready(PageDriver("about:blank", "complete", ["article"]), timeout=0.2, poll_frequency=0.05) is False
@@ -0,0 +1,167 @@
+"""
+Instagram URL classification and post dedupe keys.
+
+Every URL the scraper sees (navigation checks, grid hrefs, cached and processed
+post URLs) goes through `classify_url`, which parses it once with precompiled
+patterns and memoizes the result, so repeated checks of the same URL are a
+dictionary lookup.
+
+Post URLs come in several variants (`/p/X/`, `/user/p/X/`, with or without a
+query string or trailing slash). `post_key` and `ShortcodeSet` reduce all of
+them to the shortcode so every dedupe filter treats them as the same post.
+"""
+import re
+import sys
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+class UrlKind(str, Enum):
+    """The kind of page a URL points to."""
+    HOME = "home"                 # https://www.instagram.com/
+    PROFILE = "profile"           # /{username}/
+    POST = "post"                 # /p/{shortcode}/
+    NESTED_POST = "nested_post"   # /{username}/p/{shortcode}/
+    BLANK = "blank"               # about:blank, data:,
+    FOREIGN = "foreign"           # any other host
+    OTHER = "other"               # any other path on www.instagram.com (reels, stories, ...)
+
+class ClassifiedUrl(NamedTuple):
+    """The result of `classify_url`."""
+    kind: UrlKind
+    username: Optional[str] = None
+    shortcode: Optional[str] = None
+
+    @property
+    def allowed(self) -> bool:
+        """True if the scraper is expected to ever be on this page."""
+        return self.kind not in (UrlKind.FOREIGN, UrlKind.OTHER)
+
+    @property
+    def is_post(self) -> bool:
+        return self.kind in (UrlKind.POST, UrlKind.NESTED_POST)
+
+BLANK_URLS = frozenset(("about:blank", "data:,"))
+
+# scheme://www.instagram.com[/path][?query][#fragment]; the host must match exactly
+_INSTAGRAM_URL_RE = re.compile(
+    r"^[A-Za-z][A-Za-z0-9+.-]*://www\.instagram\.com(?P<path>/[^?#]*)?(?:[?#].*)?$"
+)
+# Empty path segments are ignored, so "//p//abc" is the same as "/p/abc/".
+# A profile literally named "p" (/p/) is still a profile.
+_PATH_RE = re.compile(
+    r"^/*(?:"
+    r"p/+(?P<shortcode>[^/]+)"
+    r"|(?P<username>[^/]+)(?:/+p/+(?P<nested_shortcode>[^/]+))?"
+    r")?/*$"
+)
+
+@lru_cache(maxsize=8192)
+def classify_url(url: str) -> ClassifiedUrl:
+    """
+    Classifies a URL into one of the `UrlKind` page types.
+
+    Args:
+        url: The URL to classify.
+
+    Returns:
+        A `ClassifiedUrl` with the kind and, where applicable, the username
+        and post shortcode.
+    """
+    if url in BLANK_URLS:
+        return ClassifiedUrl(UrlKind.BLANK)
+
+    url_match = _INSTAGRAM_URL_RE.match(url or "")
+    if not url_match:
+        return ClassifiedUrl(UrlKind.FOREIGN)
+
+    path_match = _PATH_RE.match(url_match.group("path") or "/")
+    if not path_match:
+        return ClassifiedUrl(UrlKind.OTHER)
+
+    shortcode, username, nested = path_match.group("shortcode", "username", "nested_shortcode")
+    if shortcode:
+        return ClassifiedUrl(UrlKind.POST, shortcode=shortcode)
+    if nested:
+        return ClassifiedUrl(UrlKind.NESTED_POST, username=username, shortcode=nested)
+    if username:
+        return ClassifiedUrl(UrlKind.PROFILE, username=username)
+    return ClassifiedUrl(UrlKind.HOME)
+
+def post_shortcode(url: str) -> Optional[str]:
+    """
+    Returns the shortcode of a post URL, or None if the URL is not a post.
+
+    Works for both `/p/{shortcode}/` and `/{username}/p/{shortcode}/` forms.
+    """
+    return classify_url(url).shortcode
+
+# Shortcodes are the media id written in base 64 with this alphabet
+_SHORTCODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+def shortcode_to_media_pk(shortcode: str) -> Optional[str]:
+    """
+    Returns the numeric media id (pk) of a post shortcode, as a string.
+
+    Only public shortcodes (up to 11 characters) encode the id; None is
+    returned for longer ones and for invalid characters.
+    """
+    if not shortcode or len(shortcode) > 11:
+        return None
+    pk = 0
+    for char in shortcode:
+        digit = _SHORTCODE_ALPHABET.find(char)
+        if digit < 0:
+            return None
+        pk = pk * 64 + digit
+    return str(pk)
+
+def post_key(url: str) -> str:
+    """
+    Returns the canonical dedupe key for a URL.
+
+    Post URLs map to their interned shortcode, so all variants of the same post
+    share one key and one string object. Any other URL maps to itself, stripped.
+    """
+    shortcode = post_shortcode(url)
+    return sys.intern(shortcode) if shortcode else (url or "").strip()
+
+class ShortcodeSet:
+    """
+    A set of posts keyed by shortcode.
+
+    URLs are accepted in any variant for both `add` and membership tests; only
+    the interned shortcode is stored, which is much smaller than the full URL.
+    """
+    __slots__ = ("_keys",)
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._keys = set()
+        for url in urls:
+            self.add(url)
+
+    def add(self, url: str) -> None:
+        self._keys.add(post_key(url))
+
+    def __contains__(self, url: str) -> bool:
+        return post_key(url) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+def filter_new_posts(urls: Iterable[str], processed: ShortcodeSet) -> List[str]:
+    """
+    Returns the URLs whose post is not in `processed`, keeping only the first
+    URL variant of each post. `processed` itself is not modified.
+    """
+    seen = ShortcodeSet()
+    new_urls = []
+    for url in urls:
+        if url in processed or url in seen:
+            continue
+        seen.add(url)
+        new_urls.append(url)
+    return new_urls
@@ -1,5 +1,4 @@
 import os
-import pdb
 import re
 import json
 import time
@@ -7,10 +6,11 @@ import random
 import traceback
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from selenium.webdriver import ActionChains
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -18,17 +18,10 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     ElementClickInterceptedException,
+    StaleElementReferenceException,
+    WebDriverException,
 )
 
-import random
-import time
-from typing import Optional, Tuple, List, Dict
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.common.by import By
-
 from igscraper.logger import get_logger
 
 logger = get_logger(__name__)
@@ -44,6 +37,72 @@ def random_delay(min_s: float, max_s: float) -> None:
     """
     time.sleep(random.uniform(min_s, max_s))
 
+# A post tab is usable once the post header (<time>) or the post <article> has been
+# rendered and the document has finished loading. Instagram's app shell completes
+# loading before the post is rendered, so readyState alone is not enough.
+# A blank tab (not navigated yet, or a released pooled tab) is never ready
+POST_READY_JS = """
+return location.href !== 'about:blank'
+    && document.querySelector('main time, article') !== null
+    && document.readyState === 'complete';
+"""
+
+def wait_for_post_ready(driver, timeout: float = 10, poll_frequency: float = 0.1) -> bool:
+    """
+    Waits until the post page in the current tab is ready for extraction.
+
+    Readiness is signalled by the page itself (see `POST_READY_JS`) rather than
+    by a fixed sleep, so fast loads are not held back.
+
+    Args:
+        driver: The Selenium WebDriver instance, switched to the post's tab.
+        timeout: The maximum time in seconds to wait.
+        poll_frequency: How often (in seconds) to re-check the page.
+
+    Returns:
+        True if the page became ready, False if the wait timed out.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+            lambda d: d.execute_script(POST_READY_JS)
+        )
+        return True
+    except TimeoutException:
+        logger.warning(f"Post page was not ready after {timeout}s, continuing anyway.")
+        return False
+
+def timing_histogram(values: List[float], buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10)) -> Dict[str, Any]:
+    """
+    Summarizes a list of durations as percentiles plus a bucketed histogram.
+
+    Args:
+        values: Durations in seconds.
+        buckets: Upper bounds (in seconds) of the histogram buckets.
+
+    Returns:
+        A dictionary with `count`, `p50`, `p95`, `max` and a `histogram` mapping
+        each bucket label (e.g. "<=0.5s") to the number of values that fall in it.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0, "p50": None, "p95": None, "max": None, "histogram": {}}
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    histogram = {f"<={b}s": 0 for b in buckets}
+    histogram[f">{buckets[-1]}s"] = 0
+    for v in ordered:
+        label = next((f"<={b}s" for b in buckets if v <= b), f">{buckets[-1]}s")
+        histogram[label] += 1
+    return {
+        "count": len(ordered),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1], 3),
+        "histogram": histogram,
+    }
+
 def normalize_hashtags(caption: str) -> list[str]:
     """
     Extracts all hashtags (e.g., #example) from a given string.
@@ -56,9 +115,9 @@ def normalize_hashtags(caption: str) -> list[str]:
     """
     return re.findall(r"#\w+", caption or '')
 
-# def criteria_example(metadata: dict) -> bool:
-#     """Example criteria function - include posts with more than 100 likes"""
-#     return metadata.get('likes', 0) > 100
+def criteria_example(metadata: dict) -> bool:
+    """Example criteria function - include posts with more than 100 likes"""
+    return metadata.get('likes', 0) > 100
 
 # def safe_write_jsonl(path: Path, data: dict) -> None:
 #     with open(path, 'a', encoding='utf-8') as f:
@@ -66,6 +125,18 @@ def normalize_hashtags(caption: str) -> list[str]:
 
 
 
+def navigated_away(driver) -> bool:
+    """
+    Checks the navigations since the last check with the driver's navigation
+    guard (see `chrome.patch_driver`).
+
+    Returns:
+        True if the current tab went to a page outside the allowlist, e.g. a login or
+        challenge redirect after a click. Drivers without a guard are not checked.
+    """
+    guard = getattr(driver, "navigation_guard", None)
+    return bool(guard and guard.check(guard.current_target()))
+
 def scrape_carousel_images(driver, image_gather_func, min_wait=0.5, max_wait=2.2):
     """
     Scrapes all images from an Instagram carousel by repeatedly clicking the 'Next' button.
@@ -92,7 +163,7 @@ def scrape_carousel_images(driver, image_gather_func, min_wait=0.5, max_wait=2.2
     while True:
         # Grab current visible images
         new_items = image_gather_func(driver)
-        logger.debug(f"Step {steps}: image_gather_func found {len(new_items)} potential images.")
+        logger.debug("Step %s: image_gather_func found %s potential images.", steps, len(new_items))
 
         # Filter for unique images based on 'src'
         added_count = 0
@@ -103,7 +174,7 @@ def scrape_carousel_images(driver, image_gather_func, min_wait=0.5, max_wait=2.2
                 image_data.append(item)
                 added_count += 1
         if added_count > 0:
-            logger.debug(f"Added {added_count} new unique images. Total unique: {len(image_data)}.")
+            logger.debug("Added %s new unique images. Total unique: %s.", added_count, len(image_data))
 
         try:
             # Look for Next button
@@ -112,17 +183,20 @@ def scrape_carousel_images(driver, image_gather_func, min_wait=0.5, max_wait=2.2
             )
             logger.debug("'Next' button found.")
         except (TimeoutException, NoSuchElementException):
-            logger.info(f"Reached end of carousel after {steps} steps. No 'Next' button found.")
+            logger.info("Reached end of carousel after %s steps. No 'Next' button found.", steps)
             break
 
         # Try to click like a human
         if not human_like_click(driver, next_button, actions):
-            logger.warning(f"Could not click 'Next' button at step {steps}, stopping.")
+            logger.warning("Could not click 'Next' button at step %s, stopping.", steps)
+            break
+        if navigated_away(driver):
+            logger.warning("Left the post after clicking 'Next' at step %s, stopping.", steps)
             break
 
         steps += 1
         time.sleep(random.uniform(min_wait, max_wait))
-    logger.info(f"Finished carousel scrape. Found {len(image_data)} total unique images.")
+    logger.info("Finished carousel scrape. Found %s total unique images.", len(image_data))
     return image_data
 
 
@@ -178,7 +252,7 @@ def images_from_post(driver):
         logging.info("Trying to extract single image.")
         # grab the single image if it exists
         return get_first_img_attributes_in_div(driver)
-    logging.info(f"Extracted {len(images)} images from carousel.")
+    logging.info("Extracted %s images from carousel.", len(images))
     return images
 
 
@@ -645,6 +719,78 @@ def cleanup_details(data):
 #     # Execute JS in the browser context
 #     return driver.execute_script(js_code)
 
+# Parses every rendered comment (handle, date, text, likes and GIF/image URLs),
+# deduplicated by handle + text + images.
+COMMENTS_PARSER_JS = """
+    function parseComments() {
+        const results = [];
+        const seen = new Set();
+
+        const topDivs = document.querySelectorAll("div.html-div");
+
+        topDivs.forEach(topDiv => {
+            const profileDiv = topDiv.querySelector("div > div.html-div > div.html-div");
+            const commentDiv = Array.from(topDiv.querySelectorAll("div > div.html-div > div.html-div"))
+                .find(div => !div.querySelector("span a, span time"));
+
+            if (!profileDiv || !commentDiv) return;
+
+            const data = { likes: null, handle: null, date: null, comment: null, commentImgs: [] };
+
+            // --- Likes ---
+            const likeSpan = Array.from(topDiv.querySelectorAll("span"))
+                .map(s => s.innerText && s.innerText.trim())
+                .filter(Boolean)
+                .find(t => /\\b\\d{1,3}(?:,\\d{3})*(?:\\.\\d+)?[kKmM]?\\s+likes?\\b/i.test(t));
+            if (likeSpan) data.likes = likeSpan;
+
+            // --- Handle & date ---
+            const spans = profileDiv.querySelectorAll("span");
+            spans.forEach(span => {
+                const aTag = span.querySelector("a");
+                if (aTag && !data.handle) data.handle = aTag.innerText.trim();
+                const timeTag = span.querySelector("time");
+                if (timeTag && !data.date) data.date = timeTag.innerText.trim();
+            });
+
+            // --- Comment text ---
+            const text = commentDiv.innerText.trim();
+            if (text) data.comment = text;
+
+            // --- Collect all images under topDiv that have exactly "class" and "src" ---
+            const imgTags = topDiv.querySelectorAll("img");
+            if (imgTags.length > 0) {
+                data.commentImgs = Array.from(imgTags)
+                    .filter(img => {
+                        const attrs = Array.from(img.attributes).map(a => a.name);
+                        return attrs.length === 2 && attrs.includes("class") && attrs.includes("src");
+                    })
+                    .map(img => img.src);
+            }
+
+            // Keep if:
+            // 1. commentImgs is present (regardless of comment/date)
+            // OR
+            // 2. commentImgs is NOT present, but both date AND comment exist
+            const hasImages = data.commentImgs.length > 0;
+            const hasCommentAndDate = data.comment && data.date;
+            
+            if (hasImages || hasCommentAndDate) {
+                const key = (data.handle || "") + "::" + (data.comment || "") + "::" + data.commentImgs.join(",");
+                if (!seen.has(key)) {
+                    seen.add(key);
+                    results.push(data);
+                }
+            }
+        });
+
+        return results;
+    }
+
+    // Execute the function and return results
+    return parseComments();
+"""
+
 def scrape_comments_with_gif(driver, config, wait_selector="div.html-div", timeout=10):
     """
     Orchestrates the scraping of comments from a post page.
@@ -666,7 +812,7 @@ def scrape_comments_with_gif(driver, config, wait_selector="div.html-div", timeo
         EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
     )
     container_info = find_comment_container(driver)
-    logger.info(f"Found comment container: {container_info}")
+    logger.info("Found comment container: %s", container_info)
     # steps = 100
     steps = config.main.comment_scroll_steps
     steps = random.randint(int(steps * 0.8), int(steps * 1.2))
@@ -728,79 +874,16 @@ def scrape_comments_with_gif(driver, config, wait_selector="div.html-div", timeo
 
     # return parseComments();
     # """
-    js_code_mod = """
-    function parseComments() {
-        const results = [];
-        const seen = new Set();
-
-        const topDivs = document.querySelectorAll("div.html-div");
-
-        topDivs.forEach(topDiv => {
-            const profileDiv = topDiv.querySelector("div > div.html-div > div.html-div");
-            const commentDiv = Array.from(topDiv.querySelectorAll("div > div.html-div > div.html-div"))
-                .find(div => !div.querySelector("span a, span time"));
+    return parse_visible_comments(driver)
 
-            if (!profileDiv || !commentDiv) return;
-
-            const data = { likes: null, handle: null, date: null, comment: null, commentImgs: [] };
-
-            // --- Likes ---
-            const likeSpan = Array.from(topDiv.querySelectorAll("span"))
-                .map(s => s.innerText && s.innerText.trim())
-                .filter(Boolean)
-                .find(t => /\\b\\d{1,3}(?:,\\d{3})*(?:\\.\\d+)?[kKmM]?\\s+likes?\\b/i.test(t));
-            if (likeSpan) data.likes = likeSpan;
-
-            // --- Handle & date ---
-            const spans = profileDiv.querySelectorAll("span");
-            spans.forEach(span => {
-                const aTag = span.querySelector("a");
-                if (aTag && !data.handle) data.handle = aTag.innerText.trim();
-                const timeTag = span.querySelector("time");
-                if (timeTag && !data.date) data.date = timeTag.innerText.trim();
-            });
-
-            // --- Comment text ---
-            const text = commentDiv.innerText.trim();
-            if (text) data.comment = text;
-
-            // --- Collect all images under topDiv that have exactly "class" and "src" ---
-            const imgTags = topDiv.querySelectorAll("img");
-            if (imgTags.length > 0) {
-                data.commentImgs = Array.from(imgTags)
-                    .filter(img => {
-                        const attrs = Array.from(img.attributes).map(a => a.name);
-                        return attrs.length === 2 && attrs.includes("class") && attrs.includes("src");
-                    })
-                    .map(img => img.src);
-            }
-
-            // Keep if:
-            // 1. commentImgs is present (regardless of comment/date)
-            // OR
-            // 2. commentImgs is NOT present, but both date AND comment exist
-            const hasImages = data.commentImgs.length > 0;
-            const hasCommentAndDate = data.comment && data.date;
-            
-            if (hasImages || hasCommentAndDate) {
-                const key = (data.handle || "") + "::" + (data.comment || "") + "::" + data.commentImgs.join(",");
-                if (!seen.has(key)) {
-                    seen.add(key);
-                    results.push(data);
-                }
-            }
-        });
-
-        return results;
-    }
-
-    // Execute the function and return results
-    return parseComments();
+def parse_visible_comments(driver):
     """
+    Parses the comments currently rendered on a post page, without scrolling.
 
-
-    # Execute JS in the browser context
-    return driver.execute_script(js_code_mod)
+    Returns:
+        A list of comment dicts with `handle`, `date`, `comment`, `likes` and `commentImgs`.
+    """
+    return driver.execute_script(COMMENTS_PARSER_JS)
 
 
 def get_section_with_highest_likes(driver, wait_selector="section", timeout=10):
@@ -1540,32 +1623,37 @@ def save_scrape_results(results: dict, output_dir: str, config: dict):
         results: A dictionary containing 'scraped_posts' and 'skipped_posts' lists.
         output_dir: The base directory for output files (used for mkdir).
         config: The application's configuration object, used to get file paths.
+
+    Returns:
+        The number of bytes appended to the output files.
     """
     metadata_file = config.data.metadata_path
     skipped_file = config.data.skipped_path
+    written = 0
 
     # Save scraped posts
     if results.get("scraped_posts"):
         # Ensure the parent directory exists before writing.
         Path(metadata_file).parent.mkdir(parents=True, exist_ok=True)
         with open(metadata_file, "a", encoding="utf-8") as f:
+            start = f.tell()
             for post in results["scraped_posts"]:
                 f.write(json.dumps(post, ensure_ascii=False) + "\n")
+            written += f.tell() - start
 
     # Save skipped posts
     if results.get("skipped_posts"):
         # Ensure the parent directory exists before writing.
         Path(skipped_file).parent.mkdir(parents=True, exist_ok=True)
         with open(skipped_file, "a", encoding="utf-8") as f:
+            start = f.tell()
             for post in results["skipped_posts"]:
                 f.write(json.dumps(post, ensure_ascii=False) + "\n")
+            written += f.tell() - start
     # Clear results list after saving
     results["scraped_posts"].clear()
     results["skipped_posts"].clear()
-
-import time
-import random
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+    return written
 
 # def human_like_scroll_container(driver,
 #                                 top_div_selector=None,
@@ -1769,12 +1857,6 @@ from selenium.common.exceptions import StaleElementReferenceException, TimeoutEx
 #         'last_height': last_height
 #     }
 
-import time
-import random
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
-from selenium.webdriver.common.by import By
 
 # def human_scroll_and_scrape_comments(driver,
 #                                      top_div_selector=None,
@@ -2020,10 +2102,6 @@ from selenium.webdriver.common.by import By
 #     return comments
 
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-import time
 
 def find_comment_container(driver, min_matches=3):
     """
@@ -2168,10 +2246,6 @@ def find_comment_container(driver, min_matches=3):
     return driver.execute_script(js_code, min_matches)
 
 
-import random
-import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
 
 # def human_scroll_bk(driver, selector, steps=10, min_step=100, max_step=400, min_pause=0.3, max_pause=1.2):
 #     """
@@ -2245,10 +2319,10 @@ def human_scroll(
 
         # Stop if at bottom
         if last_scroll_top + client_height >= max_scroll_height:
-            print(f"Probably reached bottom at step {i+1}. retry count {wait_retry_count}")
+            logger.debug("Probably reached bottom at step %s. retry count %s", i + 1, wait_retry_count)
             wait_retry_count += 1
             if wait_retry_count >= 3:
-                print(f"Waiting too long at step {i+1}, giving up.")
+                logger.info("Waiting too long at step %s, giving up.", i + 1)
                 break
             random_delay(1, 3)
         wait_retry_count = 0
@@ -2259,6 +2333,9 @@ def human_scroll(
             human_mouse_move(driver, selector=selector, duration=random.randrange(1, 3))
 
         driver.execute_script("arguments[0].scrollBy(0, arguments[1]);", el, scroll_by)
+        if navigated_away(driver):
+            logger.warning("Left the page while scrolling at step %s, stopping.", i + 1)
+            break
 
         new_scroll_top = driver.execute_script("return arguments[0].scrollTop;", el)
         new_scroll_height = driver.execute_script("return arguments[0].scrollHeight;", el)
@@ -2266,9 +2343,9 @@ def human_scroll(
         if new_scroll_top == last_scroll_top and new_scroll_height == max_scroll_height:
             retry_count += 1
             random_delay(1, 4)
-            print(f"No height change detected at step {i+1}, retry {retry_count}/{max_retries}")
+            logger.debug("No height change detected at step %s, retry %s/%s", i + 1, retry_count, max_retries)
             if retry_count >= max_retries:
-                print(f"Max retries reached at step {i+1}, exiting scroll.")
+                logger.info("Max retries reached at step %s, exiting scroll.", i + 1)
                 break
         else:
             retry_count = 0  # reset retries if height changed
@@ -2281,7 +2358,7 @@ def human_scroll(
 
         # Random pause
         pause = round(random.uniform(min_pause, max_pause), 2)
-        print(f"Step {i+1}/{steps}: scrolled by {scroll_by}px, sleeping {pause}s")
+        logger.debug("Step %s/%s: scrolled by %spx, sleeping %ss", i + 1, steps, scroll_by, pause)
         time.sleep(pause)
 
 